@@ -0,0 +1,22 @@
+from django.db.models import Q
+
+from chat.search import visible_messages
+from tasks.models import Task
+
+
+def accessible_tasks(user):
+    """Задачи проектов, где пользователь участник, и всех проектов организаций, которыми он управляет"""
+    return Task.tenant.for_user(user).filter(
+        Q(project__members=user) | Q(organization_id__in=user.administered_organization_ids)
+    ).distinct()
+
+
+def can_read(user, attachment):
+    """Вложение видно тому, кто видит его задачу или сообщение"""
+    if attachment.task_id is not None:
+        return accessible_tasks(user).filter(id=attachment.task_id).exists()
+    return visible_messages(user).filter(id=attachment.message_id).exists()
+
+
+def can_delete(user, attachment):
+    return attachment.uploaded_by_id == user.id or attachment.organization_id in user.administered_organization_ids
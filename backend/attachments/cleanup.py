@@ -0,0 +1,61 @@
+"""
+Уборка хранилища вложений (команда prune_attachments).
+
+- Вложения, чьи сообщения исчезли без ORM (удалённые партиции, сырые
+  DELETE), и вложения задач, которых нет ни в рабочей, ни в архивной таблице.
+- Blob без вложений: строка удаляется вместе с файлом под блокировкой строки.
+  Загрузка того же содержимого ждёт на той же блокировке (select_for_update в
+  AttachmentListView.post) и после неё кладёт файл заново.
+- Временные файлы оборванных загрузок.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from chat.models import Message
+from tasks.models import ArchivedTask, Task
+from . import storage
+from .models import Attachment, Blob
+
+ATTACHMENT_PRUNE_BATCH_SIZE = getattr(settings, 'ATTACHMENT_PRUNE_BATCH_SIZE', 500)
+ATTACHMENT_TEMP_MAX_AGE = getattr(settings, 'ATTACHMENT_TEMP_MAX_AGE', 24 * 60 * 60)
+
+
+def delete_orphan_attachments():
+    gone_message = Attachment.objects.filter(message__isnull=False).exclude(
+        Exists(Message.objects.filter(id=OuterRef('message_id')))
+    )
+    # Archived tasks keep their attachments: restoring the project brings them back
+    gone_task = Attachment.objects.filter(task__isnull=False).exclude(
+        Exists(Task.objects.filter(id=OuterRef('task_id')))
+    ).exclude(
+        Exists(ArchivedTask.objects.filter(id=OuterRef('task_id')))
+    )
+    return gone_message.delete()[0] + gone_task.delete()[0]
+
+
+def delete_unreferenced_blobs(batch_size=ATTACHMENT_PRUNE_BATCH_SIZE):
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            # Blobs being attached right now are locked by their upload and skipped
+            sha256s = list(
+                Blob.objects.select_for_update(skip_locked=True)
+                .filter(~Exists(Attachment.objects.filter(blob=OuterRef('pk'))))
+                .values_list('sha256', flat=True)[:batch_size]
+            )
+            if not sha256s:
+                return deleted
+            Blob.objects.filter(sha256__in=sha256s).delete()
+            # Files go while the rows are still locked, so no upload can re-use them in between
+            for sha256 in sha256s:
+                storage.remove(sha256)
+        deleted += len(sha256s)
+
+
+def prune(batch_size=None):
+    return {
+        'attachments': delete_orphan_attachments(),
+        'blobs': delete_unreferenced_blobs(batch_size or ATTACHMENT_PRUNE_BATCH_SIZE),
+        'temp_files': storage.remove_stale_temp(ATTACHMENT_TEMP_MAX_AGE),
+    }
@@ -0,0 +1,129 @@
+"""
+Отдача вложений.
+
+По умолчанию — FileResponse по открытому файлу: WSGI-сервер с
+wsgi.file_wrapper (gunicorn, uWSGI) отправляет его через sendfile(2), минуя
+копирование в Python. Поддерживается один диапазон Range: bytes=a-b (докачка,
+перемотка видео); запрос до конца файла отдаётся тем же файлом со сдвигом,
+а ограниченный диапазон — окном по файлу. Содержимое неизменно (адрес — его
+хеш), поэтому ETag — sha256, и If-None-Match / If-Range проверяются по нему.
+
+ATTACHMENTS_SENDFILE_HEADER = 'X-Accel-Redirect' (nginx) или 'X-Sendfile'
+(Apache, lighttpd) отдаёт файл фронт-серверу целиком, вместе с диапазонами:
+Django возвращает только заголовки.
+"""
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.http import content_disposition_header
+
+from .storage import blob_path
+
+ATTACHMENTS_SENDFILE_HEADER = getattr(settings, 'ATTACHMENTS_SENDFILE_HEADER', None)
+# URL of the internal location that nginx maps onto ATTACHMENTS_ROOT
+ATTACHMENTS_SENDFILE_PREFIX = getattr(settings, 'ATTACHMENTS_SENDFILE_PREFIX', '/protected-attachments/')
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _Window:
+    """Файл, читаемый только в пределах [start, start + length)"""
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    (start, end) включительно для одного диапазона; None — отдать файл целиком
+    (нет заголовка, несколько диапазонов, чужие единицы); ValueError — диапазон
+    вне файла (416).
+    """
+    match = _RANGE_RE.match(header.replace(' ', '')) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _etag(attachment):
+    return f'"{attachment.blob_id}"'
+
+
+def _common_headers(response, attachment, as_attachment):
+    response['ETag'] = _etag(attachment)
+    response['Accept-Ranges'] = 'bytes'
+    # Private: access is checked per user; immutable: the address is the content hash
+    response['Cache-Control'] = 'private, max-age=31536000, immutable'
+    response['Content-Disposition'] = content_disposition_header(as_attachment, attachment.filename)
+    return response
+
+
+def serve(request, attachment, as_attachment=True):
+    etag = _etag(attachment)
+    if etag in request.headers.get('If-None-Match', ''):
+        return _common_headers(HttpResponse(status=304), attachment, as_attachment)
+
+    if ATTACHMENTS_SENDFILE_HEADER:
+        response = HttpResponse(content_type=attachment.content_type)
+        if ATTACHMENTS_SENDFILE_HEADER == 'X-Accel-Redirect':
+            path = blob_path(attachment.blob_id)
+            relative = path.relative_to(path.parents[2]).as_posix()
+            response['X-Accel-Redirect'] = ATTACHMENTS_SENDFILE_PREFIX + relative
+        else:
+            response[ATTACHMENTS_SENDFILE_HEADER] = str(blob_path(attachment.blob_id))
+        return _common_headers(response, attachment, as_attachment)
+
+    size = attachment.blob.size
+    header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if if_range is not None and if_range != etag:
+        # The client's copy is a different file: send the whole thing
+        header = None
+    try:
+        byte_range = parse_range(header, size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return _common_headers(response, attachment, as_attachment)
+
+    file = open(blob_path(attachment.blob_id), 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=attachment.content_type)
+    else:
+        start, end = byte_range
+        if end == size - 1:
+            # Up to the end: still a real file, so sendfile() applies from the offset
+            file.seek(start)
+            response = FileResponse(file, status=206, content_type=attachment.content_type)
+        else:
+            response = FileResponse(_Window(file, start, end - start + 1), status=206,
+                                    content_type=attachment.content_type)
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return _common_headers(response, attachment, as_attachment)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from attachments.cleanup import prune
+
+
+class Command(BaseCommand):
+    help = "Удаляет осиротевшие вложения, файлы без ссылок и брошенные временные файлы загрузок"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        report = prune(options['batch_size'])
+        self.stdout.write(
+            f"Удалено вложений: {report['attachments']}, файлов: {report['blobs']}, "
+            f"временных файлов: {report['temp_files']}"
+        )
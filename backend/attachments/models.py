@@ -0,0 +1,60 @@
+from django.db import models
+from django.db.models import Q
+
+from core.managers import OrganizationScopedManager
+
+
+class Blob(models.Model):
+    """
+    Содержимое файла, адресованное его SHA-256: одинаковые загрузки
+    хранятся на диске один раз (см. attachments.storage).
+    """
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    size = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.size} Б)"
+
+
+class Attachment(models.Model):
+    """
+    Вложение задачи или сообщения: имя и тип файла плюс ссылка на Blob.
+    Связи с задачей и сообщением без ограничений в БД: архивация переносит
+    задачи сырым DELETE (вложения переживают её и возвращаются вместе с
+    задачей), а у секционированной таблицы сообщений нет уникального id.
+    """
+    blob = models.ForeignKey(Blob, on_delete=models.PROTECT, related_name='attachments')
+    organization = models.ForeignKey('core.Organization', on_delete=models.CASCADE, related_name='attachments')
+    task = models.ForeignKey(
+        'tasks.Task', on_delete=models.CASCADE, related_name='attachments', null=True, blank=True,
+        db_constraint=False
+    )
+    message = models.ForeignKey(
+        'chat.Message', on_delete=models.CASCADE, related_name='attachments', null=True, blank=True,
+        db_constraint=False
+    )
+    uploaded_by = models.ForeignKey(
+        'users.CustomUser', on_delete=models.SET_NULL, related_name='attachments', null=True
+    )
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = models.Manager()
+    tenant = OrganizationScopedManager()
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(task__isnull=False, message__isnull=True) | Q(task__isnull=True, message__isnull=False),
+                name='attachment_task_xor_message',
+            ),
+        ]
+
+    @property
+    def size(self):
+        return self.blob.size
+
+    def __str__(self):
+        return self.filename
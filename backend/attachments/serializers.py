@@ -0,0 +1,21 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from .models import Attachment
+
+
+class AttachmentSerializer(serializers.ModelSerializer):
+    size = serializers.IntegerField(source='blob.size', read_only=True)
+    sha256 = serializers.CharField(source='blob_id', read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Attachment
+        fields = [
+            'id', 'filename', 'content_type', 'size', 'sha256', 'task', 'message',
+            'uploaded_by', 'created_at', 'download_url',
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        return reverse('attachment-download', args=[obj.id])
@@ -0,0 +1,90 @@
+"""
+Контентно-адресуемое хранилище вложений на локальном диске.
+
+Файл лежит по пути <ATTACHMENTS_ROOT>/ab/cd/<sha256>. Загрузка пишется во
+временный файл в <ATTACHMENTS_ROOT>/tmp (та же файловая система), по ходу
+считается хеш, затем файл атомарно переименовывается на свой адрес. Если
+такой адрес уже есть, новая копия просто удаляется: одинаковое содержимое
+хранится один раз.
+"""
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+ATTACHMENTS_ROOT = Path(getattr(settings, 'ATTACHMENTS_ROOT', Path(settings.BASE_DIR) / 'var' / 'attachments'))
+
+TEMP_DIR = ATTACHMENTS_ROOT / 'tmp'
+
+
+def blob_path(sha256):
+    return ATTACHMENTS_ROOT / sha256[:2] / sha256[2:4] / sha256
+
+
+class TempBlob:
+    """Временный файл загрузки: пишется кусками, по ходу считается SHA-256 и размер"""
+
+    def __init__(self):
+        TEMP_DIR.mkdir(parents=True, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=TEMP_DIR, prefix='upload-')
+        self.path = Path(path)
+        self.file = os.fdopen(fd, 'wb')
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk):
+        self.file.write(chunk)
+        self.digest.update(chunk)
+        self.size += len(chunk)
+
+    def close(self):
+        if not self.file.closed:
+            self.file.flush()
+            # The rename below must not publish a file whose data is still in the page cache only
+            os.fsync(self.file.fileno())
+            self.file.close()
+
+    @property
+    def sha256(self):
+        return self.digest.hexdigest()
+
+    def discard(self):
+        self.file.close()
+        self.path.unlink(missing_ok=True)
+
+
+def commit(temp, sha256):
+    """
+    Кладёт закрытый временный файл на его адрес. Вызывать под блокировкой
+    строки Blob (см. views), чтобы не разминуться с prune_attachments.
+    """
+    target = blob_path(sha256)
+    if target.exists():
+        temp.discard()
+        return target
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(temp.path, target)
+    return target
+
+
+def remove(sha256):
+    blob_path(sha256).unlink(missing_ok=True)
+
+
+def remove_stale_temp(max_age):
+    """Удаляет брошенные временные файлы старше max_age секунд (оборванные загрузки)"""
+    if not TEMP_DIR.exists():
+        return 0
+    removed = 0
+    deadline = time.time() - max_age
+    for path in TEMP_DIR.iterdir():
+        try:
+            if path.stat().st_mtime < deadline:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile, StopUpload
+
+from .storage import TempBlob
+
+ATTACHMENT_MAX_SIZE = getattr(settings, 'ATTACHMENT_MAX_SIZE', 100 * 1024 * 1024)
+ATTACHMENT_CHUNK_SIZE = getattr(settings, 'ATTACHMENT_CHUNK_SIZE', 256 * 1024)
+
+FILE_FIELD = 'file'
+
+
+class StoredUpload(UploadedFile):
+    """Загруженный файл, уже лежащий во временном файле хранилища вместе с хешем"""
+
+    def __init__(self, temp, name, content_type, charset, content_type_extra):
+        super().__init__(temp.file, name, content_type, temp.size, charset, content_type_extra)
+        self.temp = temp
+        self.sha256 = temp.sha256
+
+    def temporary_file_path(self):
+        return str(self.temp.path)
+
+
+class ContentAddressedUploadHandler(FileUploadHandler):
+    """
+    Принимает поле multipart 'file' кусками по ATTACHMENT_CHUNK_SIZE прямо во
+    временный файл хранилища, считая SHA-256 на лету: весь файл в памяти не
+    держится и после загрузки не перечитывается. Остальные файловые поля
+    пропускаются. Превышение ATTACHMENT_MAX_SIZE обрывает загрузку и
+    выставляет too_large.
+    """
+    chunk_size = ATTACHMENT_CHUNK_SIZE
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.temp = None
+        self.too_large = False
+
+    def new_file(self, field_name, *args, **kwargs):
+        if field_name != FILE_FIELD or self.temp is not None:
+            raise SkipFile()
+        super().new_file(field_name, *args, **kwargs)
+        self.temp = TempBlob()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.temp.size + len(raw_data) > ATTACHMENT_MAX_SIZE:
+            self.too_large = True
+            self.upload_interrupted()
+            raise StopUpload(connection_reset=True)
+        self.temp.write(raw_data)
+
+    def file_complete(self, file_size):
+        self.temp.close()
+        return StoredUpload(self.temp, self.file_name, self.content_type, self.charset, self.content_type_extra)
+
+    def upload_interrupted(self):
+        if self.temp is not None:
+            self.temp.discard()
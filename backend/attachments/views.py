@@ -0,0 +1,144 @@
+from django.db import transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from chat.search import visible_messages
+from . import storage
+from .access import accessible_tasks, can_delete, can_read
+from .download import serve
+from .models import Attachment, Blob
+from .serializers import AttachmentSerializer
+from .uploads import ATTACHMENT_MAX_SIZE, FILE_FIELD, ContentAddressedUploadHandler
+
+# Room for the multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class AttachmentListView(APIView):
+    """
+    GET  /api/attachments/?task=<id> | ?message=<id> — вложения задачи или сообщения
+    POST /api/attachments/?task=<id> | ?message=<id> — загрузка, multipart-поле "file"
+
+    Доступ к задаче или сообщению проверяется до чтения тела запроса, так что
+    чужая загрузка не пишется на диск. Файл идёт кусками прямо в хранилище
+    (ContentAddressedUploadHandler); одинаковое содержимое хранится один раз.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_target(self, request, for_upload=False):
+        """{'task': ...} или {'message': ...}; None — нет цели или нет доступа"""
+        params = request.query_params
+        if request.user.organization_id is None:
+            # Attachments belong to an organization, like everything they hang off
+            return None
+        try:
+            if params.get('task'):
+                task = accessible_tasks(request.user).filter(id=int(params['task'])).first()
+                return {'task': task} if task is not None else None
+            if params.get('message'):
+                messages = visible_messages(request.user)
+                if for_upload:
+                    # Only the author attaches files to a message
+                    messages = messages.filter(sender=request.user)
+                message = messages.filter(id=int(params['message'])).first()
+                return {'message': message} if message is not None else None
+        except ValueError:
+            return None
+        return None
+
+    def get(self, request):
+        target = self.get_target(request)
+        if target is None:
+            return Response({"error": "Укажите доступную задачу (task) или сообщение (message)"},
+                            status=status.HTTP_404_NOT_FOUND)
+        attachments = Attachment.objects.filter(**target).select_related('blob').order_by('id')
+        return Response(AttachmentSerializer(attachments, many=True).data)
+
+    def post(self, request):
+        target = self.get_target(request, for_upload=True)
+        if target is None:
+            return Response({"error": "Укажите доступную задачу (task) или сообщение (message)"},
+                            status=status.HTTP_404_NOT_FOUND)
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        if length > ATTACHMENT_MAX_SIZE + MULTIPART_OVERHEAD:
+            return self._too_large()
+
+        handler = ContentAddressedUploadHandler(request)
+        request.upload_handlers = [handler]
+        upload = request.FILES.get(FILE_FIELD)
+        if handler.too_large:
+            return self._too_large()
+        if upload is None:
+            return Response({"error": "Передайте файл в поле file"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with transaction.atomic():
+                # The row lock orders this upload against prune_attachments removing the same file
+                blob, _ = Blob.objects.select_for_update().get_or_create(
+                    sha256=upload.sha256, defaults={'size': upload.size}
+                )
+                storage.commit(upload.temp, blob.sha256)
+                task = target.get('task')
+                attachment = Attachment.objects.create(
+                    blob=blob,
+                    organization_id=task.organization_id if task else request.user.organization_id,
+                    uploaded_by=request.user,
+                    filename=(upload.name or 'file')[-255:],
+                    content_type=(upload.content_type or 'application/octet-stream')[:255],
+                    **target,
+                )
+        finally:
+            # Already moved into place unless something failed on the way
+            upload.temp.discard()
+        return Response(AttachmentSerializer(attachment).data, status=status.HTTP_201_CREATED)
+
+    def _too_large(self):
+        return Response(
+            {"error": f"Файл больше {ATTACHMENT_MAX_SIZE // (1024 * 1024)} МБ"},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+
+
+class AttachmentDetailMixin:
+    permission_classes = [IsAuthenticated]
+
+    def get_attachment(self, request, pk):
+        attachment = get_object_or_404(Attachment.tenant.for_user(request.user).select_related('blob'), pk=pk)
+        if not can_read(request.user, attachment):
+            # Same answer as for a missing attachment: ids of other people's files stay unknown
+            raise Http404
+        return attachment
+
+
+class AttachmentDetailView(AttachmentDetailMixin, APIView):
+    """GET — описание вложения; DELETE — загрузивший или администратор организации"""
+
+    def get(self, request, pk):
+        attachment = self.get_attachment(request, pk)
+        return Response(AttachmentSerializer(attachment).data)
+
+    def delete(self, request, pk):
+        attachment = self.get_attachment(request, pk)
+        if not can_delete(request.user, attachment):
+            return Response(
+                {"error": "Удалить вложение может загрузивший его или администратор организации"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        # The blob stays until prune_attachments finds it unreferenced
+        attachment.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AttachmentDownloadView(AttachmentDetailMixin, APIView):
+    """GET /api/attachments/<id>/download/ — содержимое, с поддержкой Range"""
+
+    def get(self, request, pk):
+        attachment = self.get_attachment(request, pk)
+        return serve(request, attachment)
@@ -0,0 +1,117 @@
+"""
+Буферизованная запись журнала аудита.
+
+record() кладёт событие в ограниченную очередь процесса (после коммита
+текущей транзакции), а фоновый поток пишет очередь пачками bulk_create — запрос
+не ждёт INSERT. Если очередь заполнена (база не успевает), событие пишется
+синхронно в потоке запроса: аудит не теряется, а нагрузка сама себя
+притормаживает. При выходе процесса остаток очереди дописывается.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from .models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+AUDIT_BUFFERED = getattr(settings, 'AUDIT_BUFFERED', True)
+AUDIT_QUEUE_SIZE = getattr(settings, 'AUDIT_QUEUE_SIZE', 10000)
+AUDIT_BATCH_SIZE = getattr(settings, 'AUDIT_BATCH_SIZE', 500)
+AUDIT_FLUSH_INTERVAL = getattr(settings, 'AUDIT_FLUSH_INTERVAL', 1.0)
+
+
+class AuditBuffer:
+    def __init__(self, max_size, batch_size, flush_interval):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+
+    def _started_queue(self):
+        # Lazily per process: a queue or thread inherited over fork would be dead
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue(maxsize=self.max_size)
+                    threading.Thread(target=self._run, name='audit-flush', daemon=True).start()
+                    self._pid = os.getpid()
+        return self._queue
+
+    def put(self, event):
+        try:
+            self._started_queue().put_nowait(event)
+        except queue.Full:
+            AuditEvent.objects.bulk_create([event])
+
+    def _take_batch(self, block):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                if not batch and block:
+                    batch.append(self._queue.get())
+                else:
+                    remaining = deadline - time.monotonic() if block else 0
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        try:
+            AuditEvent.objects.bulk_create(batch, batch_size=self.batch_size)
+        except DatabaseError:
+            logger.exception("Не удалось записать %s событий аудита", len(batch))
+            # Drop the broken connection; the next batch reconnects
+            connection.close()
+
+    def _run(self):
+        while True:
+            self._write(self._take_batch(block=True))
+
+    def flush(self):
+        """Синхронно дописывает всё, что накопилось (для завершения процесса и тестов)"""
+        if self._pid != os.getpid():
+            return
+        while batch := self._take_batch(block=False):
+            self._write(batch)
+
+
+buffer = AuditBuffer(AUDIT_QUEUE_SIZE, AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL)
+atexit.register(buffer.flush)
+
+
+def record(request, organization_id, action, target_type, target_id=None, actor=None, **details):
+    """
+    Фиксирует действие actor (по умолчанию — текущего пользователя);
+    запись уходит после коммита транзакции.
+    """
+    if organization_id is None:
+        return
+    if actor is None and request.user.is_authenticated:
+        actor = request.user
+    event = AuditEvent(
+        organization_id=organization_id,
+        actor=actor,
+        actor_username=actor.username if actor else '',
+        action=action,
+        target_type=target_type,
+        target_id=target_id,
+        details=details,
+        ip_address=request.META.get('REMOTE_ADDR') or None,
+        created_at=timezone.now(),
+    )
+    if AUDIT_BUFFERED:
+        transaction.on_commit(lambda: buffer.put(event))
+    else:
+        transaction.on_commit(event.save)
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:57
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0009_reminders_deadline_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('actor_username', models.CharField(blank=True, max_length=150)),
+                ('action', models.CharField(choices=[('org_admin_added', 'Назначен администратор'), ('org_admin_removed', 'Снят администратор'), ('project_member_added', 'Добавлен участник проекта'), ('project_member_removed', 'Удалён участник проекта'), ('project_deleted', 'Удалён проект'), ('invitation_created', 'Отправлено приглашение'), ('invitation_accepted', 'Принято приглашение')], max_length=30)),
+                ('target_type', models.CharField(max_length=20)),
+                ('target_id', models.BigIntegerField(blank=True, null=True)),
+                ('details', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audit_events', to='core.organization')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organization', '-id'], name='audit_org_feed_idx'), models.Index(fields=['organization', 'action', '-id'], name='audit_org_action_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class AuditEvent(models.Model):
+    """
+    Запись журнала административных действий. Только добавление: изменить или
+    удалить запись через ORM нельзя. Пишется пачками из audit.log.
+    """
+    ACTION_CHOICES = [
+        ('org_admin_added', 'Назначен администратор'),
+        ('org_admin_removed', 'Снят администратор'),
+        ('project_member_added', 'Добавлен участник проекта'),
+        ('project_member_removed', 'Удалён участник проекта'),
+        ('project_deleted', 'Удалён проект'),
+        ('invitation_created', 'Отправлено приглашение'),
+        ('invitation_accepted', 'Принято приглашение'),
+    ]
+
+    # Без каскада и ограничения в базе: удаление организации не стирает её журнал
+    organization = models.ForeignKey(
+        'core.Organization', on_delete=models.DO_NOTHING, db_constraint=False, related_name='audit_events'
+    )
+    actor = models.ForeignKey('users.CustomUser', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    # Снимок имени: запись остаётся читаемой и после удаления пользователя
+    actor_username = models.CharField(max_length=150, blank=True)
+    action = models.CharField(max_length=30, choices=ACTION_CHOICES)
+    target_type = models.CharField(max_length=20)
+    target_id = models.BigIntegerField(null=True, blank=True)
+    details = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    # Время действия, а не записи в базу: буфер сбрасывается с задержкой
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organization', '-id'], name='audit_org_feed_idx'),
+            models.Index(fields=['organization', 'action', '-id'], name='audit_org_action_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M} {self.actor_username}: {self.action}"
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Записи журнала аудита нельзя изменять")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Записи журнала аудита нельзя удалять")
@@ -0,0 +1,13 @@
+from rest_framework import serializers
+
+from .models import AuditEvent
+
+
+class AuditEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AuditEvent
+        fields = [
+            'id', 'action', 'actor', 'actor_username', 'target_type', 'target_id',
+            'details', 'ip_address', 'created_at'
+        ]
+        read_only_fields = fields
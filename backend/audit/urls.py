@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import OrganizationAuditView
+
+urlpatterns = [
+    path('organizations/<int:org_id>/', OrganizationAuditView.as_view(), name='organization-audit'),
+]
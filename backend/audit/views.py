@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.models import Organization
+from .models import AuditEvent
+from .serializers import AuditEventSerializer
+
+
+class OrganizationAuditView(APIView):
+    """
+    GET /api/audit/organizations/<id>/?before=<id>&limit=<n>&action=<...>&actor=<id>
+
+    Журнал действий организации для её администраторов, новые первыми,
+    keyset-пагинация по id.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, org_id):
+        organization = get_object_or_404(Organization, pk=org_id)
+        if not organization.admins.filter(id=request.user.id).exists():
+            return Response(
+                {"error": "Только администратор организации может просматривать журнал"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        params = request.query_params
+        try:
+            before = int(params['before']) if params.get('before') else None
+            actor = int(params['actor']) if params.get('actor') else None
+            limit = min(int(params.get('limit', settings.AUDIT_PAGE_SIZE)), settings.AUDIT_MAX_PAGE_SIZE)
+        except ValueError:
+            return Response(
+                {"error": "before, actor и limit должны быть целыми числами"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if limit < 1:
+            return Response({"error": "limit должен быть положительным"}, status=status.HTTP_400_BAD_REQUEST)
+
+        events = AuditEvent.objects.filter(organization=organization).order_by('-id')
+        if params.get('action'):
+            events = events.filter(action=params['action'])
+        if actor is not None:
+            events = events.filter(actor_id=actor)
+        if before is not None:
+            events = events.filter(id__lt=before)
+        page = list(events[:limit + 1])
+
+        has_more = len(page) > limit
+        page = page[:limit]
+        return Response({
+            'results': AuditEventSerializer(page, many=True).data,
+            'next_before': page[-1].id if has_more else None,
+        })
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 from decouple import config
 from pathlib import Path
+from urllib.parse import urlsplit
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -44,6 +45,11 @@ INSTALLED_APPS = [
     'users',
     'chat',
     'tasks',
+    'changes',
+    'notifications',
+    'audit',
+    'batch',
+    'attachments',
 ]
 
 from datetime import timedelta
@@ -53,9 +59,11 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
 }
 
-CORS_ALLOWED_ORIGINS = [
-    "http://localhost:3000",  # React по умолчанию
-]
+# Origin фронтенда через запятую; по умолчанию React на localhost:3000.
+# Запросы идут с credentials (cookie закрепления за primary, см. core.db_routing),
+# поэтому нужен явный список, а не любой origin
+CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', default='http://localhost:3000').split(',')
+CORS_ALLOW_CREDENTIALS = True
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
@@ -101,6 +109,26 @@ DATABASES = {
     }
 }
 
+# Реплики для чтения: DB_REPLICAS=host[:port][/name],... (имя и порт по умолчанию как у primary).
+# Для локальной проверки подойдёт вторая база на том же сервере: DB_REPLICAS=localhost/tasktracker_replica
+for _index, _replica in enumerate(filter(None, config('DB_REPLICAS', default='').split(',')), start=1):
+    _parts = urlsplit('//' + _replica.strip())
+    DATABASES[f'replica_{_index}'] = {
+        **DATABASES['default'],
+        'HOST': _parts.hostname,
+        'PORT': _parts.port or DATABASES['default']['PORT'],
+        'NAME': _parts.path.lstrip('/') or DATABASES['default']['NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.db_routing.PrimaryReplicaRouter']
+MIDDLEWARE += ['core.db_routing.ReplicaRoutingMiddleware']
+REPLICA_STICKY_SECONDS = 5  # сколько после записи клиент читает из primary
+REPLICA_PIN_COOKIE = 'replica_pin'  # подписанная cookie с этим закреплением, общая для всех воркеров
+REPLICA_PIN_COOKIE_SAMESITE = 'Lax'  # 'None' (только с HTTPS), если фронтенд и API на разных сайтах
+REPLICA_MAX_LAG = 5  # секунд; более отставшие реплики пропускаются
+REPLICA_LAG_CHECK_INTERVAL = 2
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -138,6 +166,8 @@ USE_I18N = True
 USE_TZ = True
 
 AUTH_USER_MODEL = 'users.CustomUser'
+
+AUTHENTICATION_BACKENDS = ['users.backends.PooledModelBackend']
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
@@ -149,7 +179,6 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MIDDLEWARE += ['corsheaders.middleware.CorsMiddleware']
-CORS_ALLOW_ALL_ORIGINS = True  # Для разработки
 
 # Настройки email
 DEFAULT_FROM_EMAIL = 'noreply@yourdomain.com'
@@ -161,4 +190,108 @@ EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = config('EMAIL_HOST_USER')
-EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
\ No newline at end of file
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
+
+# Хранение сообщений чата
+# Глобальный предел хранения в днях (None — бессрочно); старые месячные партиции удаляются целиком
+CHAT_MESSAGE_RETENTION_DAYS = None
+CHAT_RETENTION_BATCH_SIZE = 5000
+CHAT_PARTITIONS_AHEAD = 3
+
+
+# Журнал изменений (/api/changes/)
+CHANGES_PAGE_SIZE = 200
+CHANGES_MAX_PAGE_SIZE = 1000
+CHANGES_LONG_POLL_TIMEOUT = 25
+CHANGES_POLL_INTERVAL = 1
+
+# Дельта-синхронизация (?updated_since=)
+SYNC_SAFETY_MARGIN = 5  # секунд
+SYNC_TOMBSTONE_RETENTION_DAYS = 90
+
+# Импорт сотрудников из CSV
+USER_IMPORT_CHUNK_SIZE = 500
+USER_IMPORT_WORKERS = None  # None — по числу CPU
+USER_IMPORT_STALE_AFTER = 3600  # секунд; fail_stale_imports помечает зависшие задачи как failed
+
+# Пул хеширования паролей (вход и регистрация); 0 потоков — считать в потоке запроса
+PASSWORD_POOL_WORKERS = config('PASSWORD_POOL_WORKERS', default=2, cast=int)
+PASSWORD_POOL_MAX_PENDING = config('PASSWORD_POOL_MAX_PENDING', default=32, cast=int)
+PASSWORD_POOL_TIMEOUT = 10  # секунд ожидания результата
+
+# Ограничение частоты записей: (токенов в секунду, ёмкость ведра) на пользователя и на организацию.
+# Ведра живут в кеше THROTTLE_CACHE; LocMemCache — своё ведро на процесс
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+THROTTLE_CACHE = 'default'
+THROTTLE_BUCKETS = {
+    'status_update': {'user': (1, 5), 'organization': (20, 100)},
+    'message_create': {'user': (2, 20), 'organization': (50, 300)},
+}
+
+# Присутствие: клиент шлёт heartbeat, sweep_presence переводит пропавших в offline
+PRESENCE_HEARTBEAT_INTERVAL = 60  # секунд
+PRESENCE_TIMEOUT = 180
+PRESENCE_EXPIRING_STATUSES = ('online', 'lunch', 'meeting')
+
+# Запланированные статусы (отпуска, повторяющиеся встречи)
+STATUS_SCHEDULE_BATCH_SIZE = 500  # записей за транзакцию в apply_status_schedules
+
+# Напоминания о дедлайнах: окно — (начало, конец) относительно дедлайна
+REMINDER_WINDOWS = {
+    'due_soon': (timedelta(hours=-24), timedelta(0)),
+    'overdue': (timedelta(0), timedelta(days=7)),
+}
+REMINDER_BACKEND = 'core.reminders.EmailDigestBackend'  # или 'notifications.backends.InAppDigestBackend'
+REMINDER_BATCH_SIZE = 200  # получателей на пачку доставки
+REMINDER_LOG_RETENTION_DAYS = 30
+
+# Уведомления в приложении
+NOTIFICATIONS_PAGE_SIZE = 50
+NOTIFICATIONS_MAX_PAGE_SIZE = 200
+NOTIFICATION_BATCH_SIZE = 1000  # получателей на один bulk_create при рассылке
+
+# Журнал аудита: события копятся в очереди процесса и пишутся пачками фоновым потоком
+AUDIT_BUFFERED = True
+AUDIT_QUEUE_SIZE = 10000  # при переполнении запись идёт синхронно в запросе
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 1.0  # секунд ожидания добора пачки
+AUDIT_PAGE_SIZE = 50
+AUDIT_MAX_PAGE_SIZE = 200
+
+# Счётчики участников и задач проекта: пачка проектов на один проход recount_project_counters
+COUNTER_RECOUNT_BATCH_SIZE = 1000
+
+# Очередь «мои задачи» (/api/tasks/mine/)
+MY_TASKS_PAGE_SIZE = 50
+MY_TASKS_MAX_PAGE_SIZE = 200
+
+# Пакетные запросы (/api/batch/): несколько GET к API за один HTTP-запрос
+BATCH_MAX_REQUESTS = 20
+BATCH_PATH_PREFIX = '/api/'
+
+# Каналы проектов (/api/chat/channels/): страница истории
+CHAT_CHANNEL_PAGE_SIZE = 50
+CHAT_CHANNEL_MAX_PAGE_SIZE = 200
+
+# Поиск по сообщениям (/api/chat/search/)
+CHAT_SEARCH_PAGE_SIZE = 20
+CHAT_SEARCH_MAX_PAGE_SIZE = 100
+
+# Вложения задач и сообщений (/api/attachments/): контентно-адресуемое хранилище на диске
+ATTACHMENTS_ROOT = BASE_DIR / 'var' / 'attachments'
+ATTACHMENT_MAX_SIZE = 100 * 1024 * 1024
+ATTACHMENT_CHUNK_SIZE = 256 * 1024  # кусок, которым загрузка пишется на диск
+# Отдачу может взять фронт-сервер: 'X-Accel-Redirect' (nginx, internal location
+# ATTACHMENTS_SENDFILE_PREFIX с alias на ATTACHMENTS_ROOT) или 'X-Sendfile'
+ATTACHMENTS_SENDFILE_HEADER = None
+ATTACHMENTS_SENDFILE_PREFIX = '/protected-attachments/'
+ATTACHMENT_PRUNE_BATCH_SIZE = 500
+ATTACHMENT_TEMP_MAX_AGE = 24 * 60 * 60  # секунд до удаления файла оборванной загрузки
+
+# Граф зависимостей задач (/api/tasks/graph/): страница задач по id
+TASK_GRAPH_PAGE_SIZE = 500
+TASK_GRAPH_MAX_PAGE_SIZE = 5000
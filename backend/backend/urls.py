@@ -23,4 +23,9 @@ urlpatterns = [
     path('api/core/', include('core.urls')),
     path('api/tasks/', include('tasks.urls')),
     path('api/chat/', include('chat.urls')),
+    path('api/changes/', include('changes.urls')),
+    path('api/notifications/', include('notifications.urls')),
+    path('api/audit/', include('audit.urls')),
+    path('api/batch/', include('batch.urls')),
+    path('api/attachments/', include('attachments.urls')),
 ]
\ No newline at end of file
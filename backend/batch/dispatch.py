@@ -0,0 +1,99 @@
+"""
+Выполнение подзапросов пакета внутри одного HTTP-запроса.
+
+Подзапрос разрешается через URLconf и вызывает view напрямую, минуя
+middleware: JWT уже проверен для внешнего запроса, и DRF получает готового
+пользователя через _force_auth_user (тот же механизм, что у
+APIRequestFactory). Все подзапросы делят один объект пользователя, поэтому
+его кэш связей (organization и т. п.) загружается один раз на пакет, а
+маршрут чтения (реплика или primary) выбран middleware для всего пакета.
+Ответ DRF не рендерится в JSON по отдельности: его data уходит в общий ответ.
+Нативные async-view (их корутина выполняется через async_to_sync) отвечают
+JsonResponse — его тело разбирается обратно в данные.
+"""
+import asyncio
+import json
+import logging
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_REQUESTS = getattr(settings, 'BATCH_MAX_REQUESTS', 20)
+BATCH_PATH_PREFIX = getattr(settings, 'BATCH_PATH_PREFIX', '/api/')
+
+# Body-related headers of the outer POST do not apply to the GET sub-requests
+_DROPPED_META = ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_CONTENT_TYPE', 'HTTP_CONTENT_LENGTH')
+
+
+class BatchError(ValueError):
+    pass
+
+
+def _sub_request(request, path, query):
+    sub = HttpRequest()
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.META = {
+        key: value for key, value in request.META.items() if key not in _DROPPED_META
+    }
+    sub.META.update({'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query})
+    sub.GET = QueryDict(query)
+    sub.COOKIES = request.COOKIES
+    sub.user = request.user
+    # DRF picks these up instead of running the authenticators again
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def run(request, path):
+    """Выполняет один GET-подзапрос; возвращает (статус, тело)"""
+    parts = urlsplit(path)
+    if parts.scheme or parts.netloc or not parts.path.startswith(BATCH_PATH_PREFIX):
+        raise BatchError(f"Путь должен начинаться с {BATCH_PATH_PREFIX}")
+    try:
+        match = resolve(parts.path)
+    except Resolver404:
+        return 404, {"error": "Не найдено"}
+    if match.url_name == 'batch':
+        raise BatchError("Пакет не может содержать пакет")
+
+    sub = _sub_request(request, parts.path, parts.query)
+    sub.resolver_match = match
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+        if asyncio.iscoroutine(response):
+            response = async_to_sync(_await)(response)
+    except Exception:
+        logger.exception("Подзапрос пакета %s завершился ошибкой", path)
+        return 500, {"error": "Внутренняя ошибка"}
+    if isinstance(response, Response):
+        return response.status_code, response.data
+    try:
+        if not response.streaming and response.get('Content-Type', '').startswith('application/json'):
+            return response.status_code, json.loads(response.content)
+        # Other plain Django responses (exports, files) are not JSON data and have their own endpoints
+        return response.status_code, None
+    finally:
+        _release(response)
+
+
+async def _await(coroutine):
+    return await coroutine
+
+
+def _release(response):
+    """
+    Закрывает ресурсы ответа (открытый файл FileResponse). Не через
+    response.close(): тот ещё шлёт request_finished, а его обработчик
+    закрыл бы соединение с базой посреди пакета.
+    """
+    for closer in response._resource_closers:
+        closer()
+    response._resource_closers.clear()
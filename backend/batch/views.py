@@ -0,0 +1,42 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .dispatch import BATCH_MAX_REQUESTS, BatchError, run
+
+
+class BatchView(APIView):
+    """
+    POST /api/batch/ {"requests": [{"id": "profile", "path": "/api/users/profile/"}, ...]}
+
+    Выполняет до BATCH_MAX_REQUESTS GET-запросов к API за один HTTP-запрос с
+    одной проверкой токена. Ответ: {"responses": [{"id", "status", "body"}, ...]}
+    в порядке запросов; ошибка одного подзапроса не прерывает остальные.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        items = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({"error": "Передайте requests непустым списком"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > BATCH_MAX_REQUESTS:
+            return Response(
+                {"error": f"Не больше {BATCH_MAX_REQUESTS} запросов в пакете"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+                return Response({"error": "У каждого запроса должен быть path"}, status=status.HTTP_400_BAD_REQUEST)
+            # Only reads are batched: a failed write in the middle would leave the rest ambiguous
+            if item.get('method', 'GET').upper() != 'GET':
+                return Response({"error": "В пакете допускаются только GET-запросы"}, status=status.HTTP_400_BAD_REQUEST)
+
+        responses = []
+        for index, item in enumerate(items):
+            try:
+                code, body = run(request, item['path'])
+            except BatchError as error:
+                code, body = status.HTTP_400_BAD_REQUEST, {"error": str(error)}
+            responses.append({'id': item.get('id', index), 'status': code, 'body': body})
+        return Response({'responses': responses})
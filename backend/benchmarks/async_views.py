@@ -0,0 +1,64 @@
+"""
+Сравнение синхронных DRF-view и нативных async-view под uvicorn.
+
+Запуск из каталога backend (нужна заполненная БД и существующий пользователь):
+
+    python -m benchmarks.async_views --spawn --username alice --password secret --chat-user 2
+
+Без --spawn скрипт бьёт в уже запущенный сервер по --base-url.
+"""
+import argparse
+
+from .common import Client, hammer, login, print_table, spawn_uvicorn, summarize
+
+ENDPOINTS = [
+    ('team-status', '/api/users/team-status/', '/api/users/team-status/async/'),
+    ('profile', '/api/users/profile/', '/api/users/profile/async/'),
+    ('projects', '/api/core/projects/', '/api/core/projects/async/'),
+    ('messages', '/api/chat/?user_id={chat_user}', '/api/chat/async/?user_id={chat_user}'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--chat-user', type=int, default=0, help="id собеседника для списка сообщений")
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--spawn', action='store_true', help="поднять uvicorn самостоятельно")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if args.spawn:
+        server = spawn_uvicorn(args.port)
+        base_url = f'http://127.0.0.1:{args.port}'
+
+    try:
+        token = login(base_url, args.username, args.password)
+        clients = [Client(base_url, token) for _ in range(args.concurrency)]
+        rows = []
+        for name, sync_path, async_path in ENDPOINTS:
+            for mode, path in (('sync', sync_path), ('async', async_path)):
+                path = path.format(chat_user=args.chat_user)
+
+                def make_request(index, path=path):
+                    status, _, seconds = clients[index].request('GET', path)
+                    return status, seconds
+
+                samples = hammer(make_request, args.concurrency, args.duration)
+                rows.append({'endpoint': name, 'mode': mode, **summarize(samples, args.duration)})
+        for client in clients:
+            client.close()
+        print_table(rows, ['endpoint', 'mode', 'requests', 'rps', 'errors', 'p50_ms', 'p99_ms'])
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
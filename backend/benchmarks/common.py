@@ -0,0 +1,155 @@
+"""Общие утилиты для нагрузочных скриптов: HTTP-клиент, запуск сервера, перцентили"""
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+class Client:
+    """Keep-alive HTTP клиент; один экземпляр на поток"""
+
+    def __init__(self, base_url, token=None, timeout=30):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.token = token
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return self._connection
+
+    def request(self, method, path, body=None):
+        """Возвращает (status, разобранный JSON или None, время в секундах)"""
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        payload = json.dumps(body) if body is not None else None
+
+        started = time.perf_counter()
+        try:
+            connection = self._connect()
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            raw = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.close()
+            return 0, None, time.perf_counter() - started
+        elapsed = time.perf_counter() - started
+
+        try:
+            data = json.loads(raw) if raw else None
+        except ValueError:
+            data = None
+        return status, data, elapsed
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def login(base_url, username, password):
+    status, data, _ = Client(base_url).request(
+        'POST', '/api/users/auth/login/', {'username': username, 'password': password}
+    )
+    if status != 200:
+        raise RuntimeError(f"Не удалось войти как {username}: HTTP {status} {data}")
+    return data['access']
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples, duration):
+    """samples: список (status, seconds)"""
+    latencies = [seconds for _, seconds in samples]
+    errors = sum(1 for status, _ in samples if not 200 <= status < 400)
+    return {
+        'requests': len(samples),
+        'rps': round(len(samples) / duration, 1) if duration else 0.0,
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def hammer(make_request, concurrency, duration):
+    """
+    Крутит make_request(client_index) в concurrency потоках duration секунд.
+    make_request возвращает (status, seconds). Возвращает список всех замеров.
+    """
+    samples = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(index):
+        local = []
+        while time.perf_counter() < deadline:
+            local.append(make_request(index))
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def wait_for_port(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Сервер на {host}:{port} не поднялся за {timeout} с")
+
+
+def _spawn(command, port, env=None):
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env={**os.environ, **(env or {})})
+    wait_for_port('127.0.0.1', port)
+    return process
+
+
+def spawn_uvicorn(port, workers=1, env=None):
+    """Поднимает backend.asgi под uvicorn; вызывающий отвечает за terminate()"""
+    return _spawn([
+        sys.executable, '-m', 'uvicorn', 'backend.asgi:application',
+        '--host', '127.0.0.1', '--port', str(port),
+        '--workers', str(workers), '--log-level', 'warning',
+    ], port, env)
+
+
+def spawn_runserver(port, env=None):
+    """Многопоточный WSGI-сервер Django: по потоку на запрос, как у sync-воркеров"""
+    return _spawn([
+        sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{port}', '--noreload',
+    ], port, env)
+
+
+def print_table(rows, columns):
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print('  '.join(str(row[column]).ljust(widths[column]) for column in columns))
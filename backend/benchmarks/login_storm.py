@@ -0,0 +1,90 @@
+"""
+Задержка дешёвых эндпоинтов во время «утреннего шторма» входов.
+
+Пробы (team-status и update-status) замеряются сначала в тишине, затем
+параллельно с потоком логинов. С ограниченным пулом паролей p99 проб должен
+оставаться почти неизменным, а лишние логины получать 503.
+
+    python -m benchmarks.login_storm --spawn --compare --username alice --password secret
+
+--compare поднимает сервер дважды: с PASSWORD_POOL_WORKERS=0 (хеширование
+в потоке запроса) и с настройками по умолчанию.
+"""
+import argparse
+import threading
+
+from .common import Client, hammer, login, print_table, spawn_runserver, summarize
+
+PROBES = [
+    ('GET', '/api/users/team-status/', None),
+    ('POST', '/api/users/update-status/', {'status': 'online'}),
+]
+
+
+def measure(base_url, args):
+    token = login(base_url, args.username, args.password)
+    probe_clients = [Client(base_url, token) for _ in range(args.probe_concurrency)]
+    storm_clients = [Client(base_url) for _ in range(args.storm_concurrency)]
+    credentials = {'username': args.username, 'password': args.password}
+
+    def probe(index):
+        method, path, body = PROBES[index % len(PROBES)]
+        status, _, seconds = probe_clients[index].request(method, path, body)
+        return status, seconds
+
+    def storm(index):
+        status, _, seconds = storm_clients[index].request('POST', '/api/users/auth/login/', credentials)
+        return status, seconds
+
+    quiet = hammer(probe, args.probe_concurrency, args.duration)
+
+    storm_samples = []
+    storm_thread = threading.Thread(
+        target=lambda: storm_samples.extend(hammer(storm, args.storm_concurrency, args.duration))
+    )
+    storm_thread.start()
+    loud = hammer(probe, args.probe_concurrency, args.duration)
+    storm_thread.join()
+
+    rejected = sum(1 for status, _ in storm_samples if status == 503)
+    return [
+        {'phase': 'probes, quiet', **summarize(quiet, args.duration), 'rejected': '-'},
+        {'phase': 'probes, storm', **summarize(loud, args.duration), 'rejected': '-'},
+        {'phase': 'logins, storm', **summarize(storm_samples, args.duration), 'rejected': rejected},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--probe-concurrency', type=int, default=4)
+    parser.add_argument('--storm-concurrency', type=int, default=48)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--spawn', action='store_true', help="поднять runserver самостоятельно")
+    parser.add_argument('--compare', action='store_true', help="сравнить с хешированием без пула")
+    parser.add_argument('--port', type=int, default=8766)
+    args = parser.parse_args()
+
+    if not args.spawn:
+        rows = measure(args.base_url, args)
+        print_table(rows, ['phase', 'requests', 'rps', 'errors', 'rejected', 'p50_ms', 'p99_ms'])
+        return
+
+    configs = [('pool', {})]
+    if args.compare:
+        configs.insert(0, ('inline', {'PASSWORD_POOL_WORKERS': '0'}))
+    rows = []
+    for name, env in configs:
+        server = spawn_runserver(args.port, env)
+        try:
+            rows += [{'mode': name, **row} for row in measure(f'http://127.0.0.1:{args.port}', args)]
+        finally:
+            server.terminate()
+            server.wait()
+    print_table(rows, ['mode', 'phase', 'requests', 'rps', 'errors', 'rejected', 'p50_ms', 'p99_ms'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""
+Нагрузочный прогон «рабочий день организации».
+
+N виртуальных сотрудников (по потоку на каждого) входят через
+TokenObtainPairView (на 503 от пула паролей — повтор через паузу), затем каждый по своему расписанию со случайным
+разбросом:
+  - шлёт статус через update-status (StatusUpdateView);
+  - опрашивает team-status;
+  - пишет коллеге в чат и перечитывает переписку (MessageListCreateView);
+  - берёт свою очередь задач и время от времени закрывает задачу.
+По каждому эндпоинту считаются пропускная способность, доля ошибок и p50/p99.
+Результат пишется в JSON, и его можно сравнить с прошлым прогоном (--baseline).
+
+    python -m benchmarks.workforce --spawn --seed --employees 200 --duration 120 \\
+        --out benchmarks/results/200.json --baseline benchmarks/results/200-before.json
+
+--seed заполняет базу командой seed_workforce (сотрудники load-00001…),
+--spawn поднимает runserver на --port. Без них скрипт ходит на --base-url
+к уже подготовленному серверу с теми же --prefix и --password.
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .common import BACKEND_DIR, Client, print_table, spawn_runserver, summarize
+
+# Mean seconds between actions of one employee; each wait is jittered by ±50%
+SCHEDULE = {
+    'status': 30,
+    'team': 15,
+    'chat': 45,
+    'tasks': 60,
+}
+STATUSES = ['online', 'online', 'online', 'meeting', 'lunch']
+TASK_COMPLETE_CHANCE = 0.3
+LOGIN_RETRY_DELAY = 1.0
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def add(self, endpoint, status, seconds):
+        with self._lock:
+            self.samples[endpoint].append((status, seconds))
+
+
+class Employee(threading.Thread):
+    def __init__(self, base_url, username, password, recorder, deadline, start_delay, pace, seed):
+        super().__init__(daemon=True)
+        self.client = Client(base_url)
+        self.username = username
+        self.password = password
+        self.recorder = recorder
+        self.deadline = deadline
+        self.start_delay = start_delay
+        self.pace = pace
+        self.rng = random.Random(seed)
+        self.teammates = []
+
+    def call(self, endpoint, method, path, body=None):
+        status, data, seconds = self.client.request(method, path, body)
+        self.recorder.add(endpoint, status, seconds)
+        return status, data
+
+    def wait(self, action):
+        return SCHEDULE[action] / self.pace * self.rng.uniform(0.5, 1.5)
+
+    def run(self):
+        time.sleep(self.start_delay)
+        while True:
+            status, data = self.call('login', 'POST', '/api/users/auth/login/', {
+                'username': self.username, 'password': self.password,
+            })
+            if status == 200:
+                break
+            # 503 is the password pool shedding a login storm: come back later like a real client
+            if status != 503 or time.monotonic() + LOGIN_RETRY_DELAY >= self.deadline:
+                return
+            time.sleep(LOGIN_RETRY_DELAY * self.rng.uniform(0.5, 1.5))
+        self.client.token = data['access']
+        # Spread the first actions over a whole period instead of firing them in lockstep
+        due = {action: time.monotonic() + self.rng.uniform(0, self.wait(action)) for action in SCHEDULE}
+        try:
+            while True:
+                action = min(due, key=due.get)
+                pause = due[action] - time.monotonic()
+                if time.monotonic() + max(pause, 0) >= self.deadline:
+                    return
+                if pause > 0:
+                    time.sleep(pause)
+                getattr(self, f'do_{action}')()
+                due[action] = time.monotonic() + self.wait(action)
+        finally:
+            self.client.close()
+
+    def do_status(self):
+        self.call('update-status', 'POST', '/api/users/update-status/', {'status': self.rng.choice(STATUSES)})
+
+    def do_team(self):
+        status, data = self.call('team-status', 'GET', '/api/users/team-status/')
+        if status == 200 and data:
+            self.teammates = [user['id'] for user in data]
+
+    def do_chat(self):
+        if not self.teammates:
+            return
+        other = self.rng.choice(self.teammates)
+        self.call('chat-send', 'POST', '/api/chat/', {'receiver': other, 'text': 'Есть минутка?'})
+        self.call('chat-read', 'GET', f'/api/chat/?user_id={other}')
+
+    def do_tasks(self):
+        status, data = self.call('my-tasks', 'GET', '/api/tasks/mine/?limit=20')
+        if status != 200 or not data['results'] or self.rng.random() >= TASK_COMPLETE_CHANCE:
+            return
+        task = data['results'][0]
+        self.call(
+            'task-complete', 'PATCH', f"/api/tasks/{task['id']}/?project={task['project']['id']}",
+            {'completed_at': datetime.now(timezone.utc).isoformat()}
+        )
+
+
+def seed(args):
+    subprocess.run([
+        sys.executable, 'manage.py', 'seed_workforce',
+        '--employees', str(args.employees), '--prefix', args.prefix, '--password', args.password,
+    ], cwd=BACKEND_DIR, check=True)
+
+
+def run(base_url, args):
+    recorder = Recorder()
+    started = time.monotonic()
+    deadline = started + args.duration
+    employees = [
+        Employee(
+            base_url, f'{args.prefix}-{number:05d}', args.password, recorder, deadline,
+            start_delay=args.ramp_up * number / args.employees, pace=args.pace, seed=number,
+        )
+        for number in range(1, args.employees + 1)
+    ]
+    for employee in employees:
+        employee.start()
+    for employee in employees:
+        employee.join(timeout=max(0, deadline - time.monotonic()) + 60)
+    elapsed = time.monotonic() - started
+
+    endpoints = {endpoint: summarize(samples, elapsed) for endpoint, samples in sorted(recorder.samples.items())}
+    endpoints['total'] = summarize([sample for samples in recorder.samples.values() for sample in samples], elapsed)
+    return endpoints
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(endpoints, baseline):
+    """Строки таблицы с изменением относительно прошлого прогона"""
+    def delta(new, old):
+        return f"{(new - old) / old * 100:+.0f}%" if old else '-'
+
+    rows = []
+    for endpoint, stats in endpoints.items():
+        old = baseline['endpoints'].get(endpoint)
+        row = {'endpoint': endpoint, **stats}
+        if old:
+            row.update({
+                'Δrps': delta(stats['rps'], old['rps']),
+                'Δp50': delta(stats['p50_ms'], old['p50_ms']),
+                'Δp99': delta(stats['p99_ms'], old['p99_ms']),
+            })
+        else:
+            row.update({'Δrps': 'new', 'Δp50': 'new', 'Δp99': 'new'})
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--employees', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=60.0, help="секунд от старта до конца прогона")
+    parser.add_argument('--ramp-up', type=float, default=10.0, help="за сколько секунд входят все сотрудники")
+    parser.add_argument('--pace', type=float, default=1.0, help="ускорение расписания: 2 — вдвое чаще")
+    parser.add_argument('--prefix', default='load')
+    parser.add_argument('--password', default='load-test-password')
+    parser.add_argument('--seed', action='store_true', help="заполнить базу перед прогоном")
+    parser.add_argument('--spawn', action='store_true', help="поднять runserver самостоятельно")
+    parser.add_argument('--port', type=int, default=8767)
+    parser.add_argument('--out', type=Path, help="файл результатов (JSON)")
+    parser.add_argument('--baseline', type=Path, help="прошлый файл результатов для сравнения")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args)
+    started_at = datetime.now(timezone.utc)
+    if args.spawn:
+        server = spawn_runserver(args.port)
+        try:
+            endpoints = run(f'http://127.0.0.1:{args.port}', args)
+        finally:
+            server.terminate()
+            server.wait()
+    else:
+        endpoints = run(args.base_url, args)
+
+    columns = ['endpoint', 'requests', 'rps', 'errors', 'error_rate', 'p50_ms', 'p99_ms']
+    if args.baseline:
+        print_table(compare(endpoints, json.loads(args.baseline.read_text())), columns + ['Δrps', 'Δp50', 'Δp99'])
+    else:
+        print_table([{'endpoint': endpoint, **stats} for endpoint, stats in endpoints.items()], columns)
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps({
+            'started_at': started_at.isoformat(),
+            'revision': git_revision(),
+            'parameters': {
+                'employees': args.employees, 'duration': args.duration, 'ramp_up': args.ramp_up,
+                'pace': args.pace, 'schedule': SCHEDULE,
+            },
+            'endpoints': endpoints,
+        }, indent=2, ensure_ascii=False))
+        print(f"Результаты: {args.out}")
+
+
+if __name__ == '__main__':
+    main()
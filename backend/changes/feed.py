@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models import Q
+
+from core.models import Organization, Project
+from .models import ChangeEvent
+
+
+def user_payload(user):
+    return {
+        'id': user.id,
+        'username': user.username,
+        'status': user.status,
+        'last_status_change': user.last_status_change,
+    }
+
+
+def project_payload(project):
+    return {
+        'id': project.id,
+        'name': project.name,
+        'description': project.description,
+        'status': project.status,
+        'deadline': project.deadline,
+        'created_at': project.created_at,
+    }
+
+
+def task_payload(task):
+    return {
+        'id': task.id,
+        'project': task.project_id,
+        'title': task.title,
+        'description': task.description,
+        'priority': task.priority,
+        'deadline': task.deadline,
+        'completed_at': task.completed_at,
+        'assigned_to': task.assigned_to_id,
+        'created_at': task.created_at,
+    }
+
+
+def message_payload(message):
+    return {
+        'id': message.id,
+        'sender': message.sender_id,
+        'receiver': message.receiver_id,
+        'project': message.project_id,
+        'text': message.text,
+        'timestamp': message.timestamp,
+        'is_read': message.is_read,
+    }
+
+
+def _append(events):
+    """
+    Вставляет события под блокировкой строк их организаций (FOR NO KEY UPDATE:
+    FK-проверки других вставок она не задерживает). Пока транзакция вставки не
+    закоммичена, следующая для той же организации ждёт и берёт id позже, так
+    что порядок id в организации совпадает с порядком коммитов, и клиент с
+    курсором не перескочит событие, закоммиченное позже большего id.
+    События удалённых организаций отбрасываются.
+    """
+    with transaction.atomic():
+        # Ascending order: two writers never wait on each other crosswise
+        alive = set(
+            Organization.objects.select_for_update(no_key=True)
+            .filter(id__in={event.organization_id for event in events})
+            .order_by('id').values_list('id', flat=True)
+        )
+        ChangeEvent.objects.bulk_create([event for event in events if event.organization_id in alive])
+
+
+def record(organization_id, kind, action, object_id, **fields):
+    """Добавляет событие после коммита текущей транзакции (см. _append)"""
+    if organization_id is None:
+        return
+    event = ChangeEvent(
+        organization_id=organization_id, kind=kind, action=action, object_id=object_id, **fields
+    )
+    transaction.on_commit(lambda: _append([event]))
+
+
+def record_many(events):
+    """Пакетная запись готовых ChangeEvent для массовых UPDATE"""
+    events = [event for event in events if event.organization_id is not None]
+    if events:
+        transaction.on_commit(lambda: _append(events))
+
+
+def visible_events(user, cursor, is_admin):
+    """События после cursor, которые пользователь может видеть"""
+    public = Q(private=False)
+    if not is_admin:
+        member_projects = Project.members.through.objects.filter(customuser_id=user.id).values('project_id')
+        public &= Q(project_id__isnull=True) | Q(project_id__in=member_projects)
+    return ChangeEvent.objects.filter(
+        Q(organization_id=user.organization_id, id__gt=cursor)
+        & (public | Q(actor=user) | Q(recipient=user))
+    ).order_by('id')
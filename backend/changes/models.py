@@ -0,0 +1,40 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class ChangeEvent(models.Model):
+    """Запись журнала изменений организации; id служит курсором для клиентов"""
+    KIND_CHOICES = [
+        ('status', 'Статус пользователя'),
+        ('project', 'Проект'),
+        ('member', 'Участник проекта'),
+        ('task', 'Задача'),
+        ('message', 'Сообщение'),
+    ]
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    ]
+
+    organization = models.ForeignKey('core.Organization', on_delete=models.CASCADE, related_name='change_events')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    object_id = models.BigIntegerField()
+    # Без FK: событие об удалении проекта должно пережить сам проект
+    project_id = models.BigIntegerField(null=True, blank=True)
+    actor = models.ForeignKey('users.CustomUser', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    recipient = models.ForeignKey('users.CustomUser', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    # Приватные события видят только actor и recipient (личные сообщения)
+    private = models.BooleanField(default=False)
+    payload = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['organization', 'id'], name='change_event_org_cursor_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.kind}.{self.action} {self.object_id}"
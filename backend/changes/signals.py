@@ -0,0 +1,95 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from chat.models import Message
+from core.models import Project
+from tasks.models import Task
+from users.models import CustomUser
+from .feed import message_payload, project_payload, record, task_payload, user_payload
+
+
+@receiver(post_save, sender=CustomUser)
+def user_status_changed(sender, instance, created, **kwargs):
+    if not created and instance.status == getattr(instance, 'loaded_status', None):
+        return
+    instance.loaded_status = instance.status
+    record(
+        instance.organization_id, 'status', 'created' if created else 'updated', instance.id,
+        actor=instance, payload=user_payload(instance)
+    )
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, created, **kwargs):
+    record(
+        instance.organization_id, 'project', 'created' if created else 'updated', instance.id,
+        project_id=instance.id, payload=project_payload(instance)
+    )
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    record(
+        instance.organization_id, 'project', 'deleted', instance.id,
+        project_id=instance.id, payload={'id': instance.id}
+    )
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def project_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+    change = 'created' if action == 'post_add' else 'deleted'
+    # reverse=True means user.projects.add(...): instance is the user
+    pairs = (
+        [(project_id, instance.id) for project_id in pk_set] if reverse
+        else [(instance.id, user_id) for user_id in pk_set]
+    )
+    organizations = dict(
+        Project.objects.filter(pk__in={project_id for project_id, _ in pairs})
+        .values_list('id', 'organization_id')
+    )
+    for project_id, user_id in pairs:
+        record(
+            organizations.get(project_id), 'member', change, user_id,
+            project_id=project_id, recipient_id=user_id,
+            payload={'project': project_id, 'user': user_id}
+        )
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    record(
+        instance.project.organization_id, 'task', 'created' if created else 'updated', instance.id,
+        project_id=instance.project_id, payload=task_payload(instance)
+    )
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    # Cascade from a project delete is already covered by the project event
+    if isinstance(origin, Project):
+        return
+    record(
+        instance.project.organization_id, 'task', 'deleted', instance.id,
+        project_id=instance.project_id, payload={'id': instance.id, 'project': instance.project_id}
+    )
+
+
+@receiver(post_save, sender=Message)
+def message_created(sender, instance, created, **kwargs):
+    if not created:
+        return
+    if instance.project_id is not None:
+        # Channel post: visible_events shows it to the project's members and the org admins
+        record(
+            instance.project.organization_id, 'message', 'created', instance.id,
+            actor_id=instance.sender_id, project_id=instance.project_id,
+            payload=message_payload(instance)
+        )
+        return
+    record(
+        instance.sender.organization_id, 'message', 'created', instance.id,
+        actor_id=instance.sender_id, recipient_id=instance.receiver_id, private=True,
+        payload=message_payload(instance)
+    )
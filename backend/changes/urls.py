@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import change_feed
+
+urlpatterns = [
+    path('', change_feed, name='change-feed'),
+]
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from users.authentication import async_jwt_required
+from .models import ChangeEvent
+from .feed import visible_events
+
+
+def _int_param(request, name, default):
+    value = request.GET.get(name)
+    if value in (None, ''):
+        return default
+    return int(value)
+
+
+def _serialize(event):
+    return {
+        'cursor': event.id,
+        'kind': event.kind,
+        'action': event.action,
+        'object_id': event.object_id,
+        'project': event.project_id,
+        'payload': event.payload,
+        'created_at': event.created_at,
+    }
+
+
+@require_GET
+@async_jwt_required
+async def change_feed(request):
+    """
+    GET /api/changes/?cursor=<id>&wait=<сек>&limit=<n>
+
+    Возвращает упорядоченные события после cursor. Без cursor отдаёт текущую
+    голову журнала — клиент загружает полные списки и дальше тянет только дельты.
+    При wait > 0 запрос держится (long-poll), пока не появятся события.
+    Ожидание асинхронное и не занимает поток воркера.
+    """
+    user = request.user
+    if user.organization_id is None:
+        return JsonResponse({"error": "Пользователь не принадлежит к организации"}, status=400)
+
+    try:
+        cursor = _int_param(request, 'cursor', None)
+        wait = min(_int_param(request, 'wait', 0), settings.CHANGES_LONG_POLL_TIMEOUT)
+        limit = min(_int_param(request, 'limit', settings.CHANGES_PAGE_SIZE), settings.CHANGES_MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({"error": "cursor, wait и limit должны быть целыми числами"}, status=400)
+    if limit < 1:
+        return JsonResponse({"error": "limit должен быть положительным"}, status=400)
+
+    if cursor is None:
+        head = await ChangeEvent.objects.filter(
+            organization_id=user.organization_id
+        ).order_by('-id').values_list('id', flat=True).afirst()
+        return JsonResponse({'events': [], 'cursor': head or 0, 'has_more': False})
+
+    is_admin = await user.organization.admins.filter(id=user.id).aexists()
+    events = visible_events(user, cursor, is_admin)
+    deadline = time.monotonic() + max(wait, 0)
+    while True:
+        page = [event async for event in events[:limit + 1]]
+        if page or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(settings.CHANGES_POLL_INTERVAL)
+
+    has_more = len(page) > limit
+    page = page[:limit]
+    return JsonResponse({
+        'events': [_serialize(event) for event in page],
+        'cursor': page[-1].id if page else cursor,
+        'has_more': has_more,
+    })
@@ -0,0 +1,109 @@
+"""
+Каналы проектов: общий чат участников проекта.
+
+Сообщение канала — одна строка chat_message с project вместо receiver,
+сколько бы участников ни было в проекте. Прочитанность — курсор
+ChannelReadCursor (project, user, last_read_message_id): одна строка на
+участника, которая только сдвигается вперёд. Запись сообщения стоит
+O(1) строк, хранение — O(сообщений + участников), а не O(сообщений × участников).
+
+Непрочитанные — сообщения канала с id больше курсора: диапазон частичного
+индекса chat_msg_channel_idx (project, id). История листается по id
+(новые первыми) через before=next_before.
+"""
+from django.conf import settings
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.shortcuts import get_object_or_404
+
+from core.models import Project
+from .models import ChannelReadCursor, Message
+from .retention import retention_cutoff
+
+CHAT_CHANNEL_PAGE_SIZE = getattr(settings, 'CHAT_CHANNEL_PAGE_SIZE', 50)
+CHAT_CHANNEL_MAX_PAGE_SIZE = getattr(settings, 'CHAT_CHANNEL_MAX_PAGE_SIZE', 200)
+
+
+def accessible_projects(user):
+    """Каналы пользователя: проекты, где он участник, и все проекты организаций, которыми он управляет"""
+    if user.organization_id is None:
+        return Project.objects.none()
+    return Project.objects.filter(
+        Q(members=user) | Q(organization_id__in=user.administered_organization_ids),
+        organization_id=user.organization_id,
+    ).distinct()
+
+
+def get_channel(user, project_id):
+    return get_object_or_404(accessible_projects(user), pk=project_id)
+
+
+def channel_messages(project):
+    messages = Message.objects.filter(project=project)
+    cutoff = retention_cutoff(project.organization)
+    # Besides hiding expired messages, the bound lets Postgres skip old partitions
+    return messages.filter(timestamp__gte=cutoff) if cutoff is not None else messages
+
+
+def history(project, before=None, limit=CHAT_CHANNEL_PAGE_SIZE):
+    """Страница истории канала, новые первыми: (сообщения, next_before или None)"""
+    messages = channel_messages(project).select_related('sender').order_by('-id')
+    if before is not None:
+        messages = messages.filter(id__lt=before)
+    page = list(messages[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+    return page, page[-1].id if has_more else None
+
+
+def last_message_id(project):
+    return channel_messages(project).order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def advance_cursor(project, user, message_id):
+    """
+    Сдвигает курсор участника вперёд до message_id; назад не двигает.
+    Возвращает итоговое значение курсора.
+    """
+    cursors = ChannelReadCursor.objects.filter(project=project, user=user)
+    if not cursors.filter(last_read_message_id__lt=message_id).update(last_read_message_id=message_id):
+        # No row yet, or it is already further ahead: insert if missing, then
+        # move forward once more in case a concurrent insert won with a smaller id
+        ChannelReadCursor.objects.bulk_create(
+            [ChannelReadCursor(project=project, user=user, last_read_message_id=message_id)],
+            ignore_conflicts=True,
+        )
+        cursors.filter(last_read_message_id__lt=message_id).update(last_read_message_id=message_id)
+    return cursors.values_list('last_read_message_id', flat=True).get()
+
+
+def mark_read(project, user, message_id=None):
+    """Отмечает канал прочитанным до message_id (по умолчанию — до последнего сообщения)"""
+    last = last_message_id(project)
+    # Ids beyond the last message would silently mark future messages as read
+    return advance_cursor(project, user, last if message_id is None else min(message_id, last))
+
+
+def post(project, sender, text):
+    message = Message.objects.create(project=project, sender=sender, text=text)
+    # The author has read their own message; everybody else's cursor stays put
+    advance_cursor(project, sender, message.id)
+    return message
+
+
+def channels_with_unread(user):
+    """Каналы пользователя со счётчиками непрочитанного — один запрос на все каналы"""
+    last_read = ChannelReadCursor.objects.filter(
+        project=OuterRef('pk'), user=user
+    ).values('last_read_message_id')[:1]
+    unread = Message.objects.filter(project=OuterRef('pk'), id__gt=OuterRef('last_read_message_id'))
+    # All channels are in the user's organization: one retention bound, as in channel_messages()
+    cutoff = retention_cutoff(user.organization)
+    if cutoff is not None:
+        unread = unread.filter(timestamp__gte=cutoff)
+    unread = unread.order_by().values('project').annotate(count=Count('*')).values('count')
+    return accessible_projects(user).annotate(
+        last_read_message_id=Coalesce(Subquery(last_read), Value(0)),
+    ).annotate(
+        unread_count=Coalesce(Subquery(unread, output_field=IntegerField()), Value(0)),
+    ).order_by('name')
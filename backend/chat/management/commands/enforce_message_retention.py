@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from chat.retention import enforce_retention
+
+
+class Command(BaseCommand):
+    help = "Создаёт будущие партиции сообщений и удаляет сообщения старше срока хранения"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        report = enforce_retention(options['batch_size'])
+        for name in report['created_partitions']:
+            self.stdout.write(f"Создана партиция {name}")
+        for name in report['dropped_partitions']:
+            self.stdout.write(f"Удалена партиция {name}")
+        self.stdout.write(f"Удалено сообщений: {report['deleted']}")
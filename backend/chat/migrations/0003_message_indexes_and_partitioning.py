@@ -0,0 +1,88 @@
+from datetime import date
+
+from django.db import migrations, models
+from django.utils import timezone
+
+PARTITIONS_AHEAD = 3
+
+
+def _next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_messages(apps, schema_editor):
+    """
+    Превращает chat_message в таблицу, секционированную по месяцам "timestamp".
+    Первичный ключ становится (id, timestamp) — этого требует Postgres;
+    для Django id по-прежнему уникален, так как выдаётся одной последовательностью.
+    На других СУБД таблица остаётся обычной.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    Message = apps.get_model('chat', 'Message')
+    execute = schema_editor.execute
+
+    execute('ALTER TABLE chat_message RENAME TO chat_message_legacy')
+    execute('ALTER TABLE chat_message_legacy RENAME CONSTRAINT chat_message_pkey TO chat_message_legacy_pkey')
+    execute(
+        'CREATE TABLE chat_message (LIKE chat_message_legacy INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE ("timestamp")'
+    )
+    execute('ALTER TABLE chat_message ADD CONSTRAINT chat_message_pkey PRIMARY KEY (id, "timestamp")')
+    execute('CREATE TABLE chat_message_default PARTITION OF chat_message DEFAULT')
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('SELECT MIN("timestamp") FROM chat_message_legacy')
+        oldest = cursor.fetchone()[0]
+    now = timezone.now()
+    start = oldest or now
+    month = date(start.year, start.month, 1)
+    last = date(now.year, now.month, 1)
+    for _ in range(PARTITIONS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        upper = _next_month(month)
+        execute(
+            f'CREATE TABLE chat_message_y{month.year}m{month.month:02d} PARTITION OF chat_message '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+
+    execute('INSERT INTO chat_message SELECT * FROM chat_message_legacy')
+    execute('DROP TABLE chat_message_legacy')
+
+    execute('CREATE SEQUENCE chat_message_id_seq OWNED BY chat_message.id')
+    execute("ALTER TABLE chat_message ALTER COLUMN id SET DEFAULT nextval('chat_message_id_seq')")
+    execute("SELECT setval('chat_message_id_seq', COALESCE((SELECT MAX(id) FROM chat_message), 0) + 1, false)")
+
+    # Restore the foreign keys and indexes Django expects, under the same names
+    for field in Message._meta.local_fields:
+        if field.remote_field and field.db_constraint:
+            execute(schema_editor._create_fk_sql(Message, field, '_fk_%(to_table)s_%(to_column)s'))
+    for sql in schema_editor._model_indexes_sql(Message):
+        execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_initial'),
+        ('users', '0005_alter_invitation_expires_at_alter_invitation_token'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['sender', 'receiver', 'timestamp'], name='chat_msg_conversation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['receiver', 'is_read'], name='chat_msg_receiver_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['timestamp'], name='chat_msg_timestamp_idx'),
+        ),
+        migrations.RunPython(partition_messages, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.4 on 2026-10-19 13:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_message_indexes_and_partitioning'),
+        ('core', '0010_project_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChannelReadCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_message_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='project',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='channel_messages', to='core.project'),
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='receiver',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='received_messages', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(condition=models.Q(('project__isnull', False)), fields=['project', 'id'], name='chat_msg_channel_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='message',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('project__isnull', True), ('receiver__isnull', False)), models.Q(('project__isnull', False), ('receiver__isnull', True)), _connector='OR'), name='chat_msg_receiver_xor_project'),
+        ),
+        migrations.AddField(
+            model_name='channelreadcursor',
+            name='project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chat_cursors', to='core.project'),
+        ),
+        migrations.AddField(
+            model_name='channelreadcursor',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chat_cursors', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='channelreadcursor',
+            constraint=models.UniqueConstraint(fields=('project', 'user'), name='chat_cursor_project_user_uniq'),
+        ),
+    ]
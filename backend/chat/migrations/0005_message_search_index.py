@@ -0,0 +1,35 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# Must stay identical to the expression chat.search builds, or the planner will not use the index
+SEARCH_INDEX = GinIndex(SearchVector('text', config='russian'), name='chat_msg_text_search_idx')
+
+
+def create_search_index(apps, schema_editor):
+    """
+    GIN-индекс по to_tsvector('russian', text) для поиска по сообщениям.
+    Только Postgres: на других СУБД поиск идёт без индекса (см. chat.search).
+    На секционированной таблице индекс создаётся на каждой партиции и
+    появляется на новых при ATTACH PARTITION.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.add_index(apps.get_model('chat', 'Message'), SEARCH_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_index(apps.get_model('chat', 'Message'), SEARCH_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0004_project_channels'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,14 +1,59 @@
 from django.db import models
+from django.db.models import Q
 
 class Message(models.Model):
+    """
+    Личное сообщение (receiver) или сообщение канала проекта (project).
+    Сообщение канала хранится один раз, сколько бы участников ни было в проекте;
+    прочитанность считается по ChannelReadCursor, а не флагом на сообщении.
+    """
     sender = models.ForeignKey('users.CustomUser', on_delete=models.CASCADE, related_name='sent_messages')
-    receiver = models.ForeignKey('users.CustomUser', on_delete=models.CASCADE, related_name='received_messages')
+    receiver = models.ForeignKey(
+        'users.CustomUser', on_delete=models.CASCADE, related_name='received_messages', null=True, blank=True
+    )
+    project = models.ForeignKey(
+        'core.Project', on_delete=models.CASCADE, related_name='channel_messages', null=True, blank=True,
+        db_index=False,  # chat_msg_channel_idx below leads with project
+    )
     text = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['sender', 'receiver', 'timestamp'], name='chat_msg_conversation_idx'),
+            models.Index(fields=['receiver', 'is_read'], name='chat_msg_receiver_unread_idx'),
+            models.Index(fields=['timestamp'], name='chat_msg_timestamp_idx'),
+            # Channel history and unread counts: a range of ids within one project
+            models.Index(fields=['project', 'id'], name='chat_msg_channel_idx', condition=Q(project__isnull=False)),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(receiver__isnull=False, project__isnull=True) | Q(receiver__isnull=True, project__isnull=False),
+                name='chat_msg_receiver_xor_project',
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.sender} → {self.receiver}: {self.text[:20]}..."
\ No newline at end of file
+        return f"{self.sender} → {self.receiver or self.project}: {self.text[:20]}..."
+
+
+class ChannelReadCursor(models.Model):
+    """
+    Докуда участник прочитал канал проекта: одна строка на участника и канал.
+    Непрочитанные — сообщения канала с id больше last_read_message_id.
+    """
+    project = models.ForeignKey('core.Project', on_delete=models.CASCADE, related_name='chat_cursors')
+    user = models.ForeignKey('users.CustomUser', on_delete=models.CASCADE, related_name='chat_cursors')
+    # Not a foreign key: the partitioned message table has no unique constraint on id alone
+    last_read_message_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'user'], name='chat_cursor_project_user_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} @ {self.project}: {self.last_read_message_id}"
@@ -0,0 +1,95 @@
+import re
+from datetime import date, datetime, time, timezone as dt_timezone
+
+from django.db import connection, transaction
+
+PARENT_TABLE = 'chat_message'
+DEFAULT_PARTITION = 'chat_message_default'
+
+_PARTITION_RE = re.compile(r'^chat_message_y(\d{4})m(\d{2})$')
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{PARENT_TABLE}_y{month.year}m{month.month:02d}'
+
+
+def is_partitioned():
+    """На других СУБД таблица сообщений остаётся обычной"""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+            [PARENT_TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def create_partition(cursor, month):
+    name = partition_name(month)
+    cursor.execute("SELECT to_regclass(%s)", [name])
+    if cursor.fetchone()[0] is not None:
+        return False
+    upper = next_month(month)
+    # Rows that fell into the default partition for this month have to move
+    # into the new partition before it can be attached.
+    cursor.execute(f'CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} '
+        f'WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *) '
+        f'INSERT INTO {name} SELECT * FROM moved',
+        [month, upper]
+    )
+    cursor.execute(
+        f'ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)',
+        [month.isoformat(), upper.isoformat()]
+    )
+    return True
+
+
+def ensure_partitions(months_ahead, today=None):
+    """Создаёт партиции на текущий месяц и months_ahead месяцев вперёд"""
+    if not is_partitioned():
+        return []
+    month = month_start(today or date.today())
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for _ in range(months_ahead + 1):
+            if create_partition(cursor, month):
+                created.append(partition_name(month))
+            month = next_month(month)
+    return created
+
+
+def drop_partitions_before(cutoff):
+    """Удаляет месячные партиции, целиком лежащие раньше cutoff"""
+    if not is_partitioned():
+        return []
+    dropped = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = %s",
+            [PARENT_TABLE]
+        )
+        for (name,) in cursor.fetchall():
+            match = _PARTITION_RE.match(name)
+            if not match:
+                continue
+            upper = next_month(date(int(match.group(1)), int(match.group(2)), 1))
+            if datetime.combine(upper, time.min, tzinfo=dt_timezone.utc) > cutoff:
+                continue
+            cursor.execute(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}')
+            cursor.execute(f'DROP TABLE {name}')
+            dropped.append(name)
+    return sorted(dropped)
@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import Organization
+from .models import Message
+from .partitions import drop_partitions_before, ensure_partitions
+
+
+def global_cutoff(now=None):
+    days = getattr(settings, 'CHAT_MESSAGE_RETENTION_DAYS', None)
+    if not days:
+        return None
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def retention_cutoff(organization, now=None):
+    """Самая ранняя метка времени, которую ещё нужно хранить для организации"""
+    now = now or timezone.now()
+    cutoffs = [global_cutoff(now)]
+    if organization is not None and organization.message_retention_days:
+        cutoffs.append(now - timedelta(days=organization.message_retention_days))
+    cutoffs = [cutoff for cutoff in cutoffs if cutoff is not None]
+    return max(cutoffs) if cutoffs else None
+
+
+def delete_before(queryset, cutoff, batch_size):
+    """Удаляет сообщения старше cutoff ограниченными пачками"""
+    queryset = queryset.filter(timestamp__lt=cutoff).order_by('timestamp')
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        # The timestamp bound keeps the delete pruned to the old partitions
+        deleted += Message.objects.filter(pk__in=ids, timestamp__lt=cutoff).delete()[0]
+
+
+def enforce_retention(batch_size=None):
+    batch_size = batch_size or settings.CHAT_RETENTION_BATCH_SIZE
+    now = timezone.now()
+    report = {
+        'created_partitions': ensure_partitions(settings.CHAT_PARTITIONS_AHEAD, now.date()),
+        'dropped_partitions': [],
+        'deleted': 0,
+    }
+
+    cutoff = global_cutoff(now)
+    if cutoff is not None:
+        report['dropped_partitions'] = drop_partitions_before(cutoff)
+        # Whatever was not covered by a dropped partition (default partition,
+        # partial months, other backends) goes in batches.
+        report['deleted'] += delete_before(Message.objects.all(), cutoff, batch_size)
+
+    for organization in Organization.objects.filter(message_retention_days__gt=0):
+        report['deleted'] += delete_before(
+            Message.objects.filter(sender__organization=organization),
+            retention_cutoff(organization, now),
+            batch_size
+        )
+    return report
@@ -0,0 +1,80 @@
+"""
+Полнотекстовый поиск по сообщениям пользователя.
+
+Ищется только то, что пользователь и так может прочитать: его личные
+переписки (он отправитель или получатель) и каналы доступных ему проектов.
+На Postgres совпадение — to_tsvector('russian', text) @@ websearch_to_tsquery(),
+выражение в точности как у GIN-индекса chat_msg_text_search_idx (миграция
+chat 0005), поэтому кандидаты берутся из индекса, а не перебором таблицы.
+Нижняя граница по сроку хранения отсекает старые партиции.
+
+Порядок — ts_rank по убыванию, при равенстве новые первыми. Курсор
+страницы — последняя выданная строка: "<ранг>,<id>". Ранг приводится к
+double precision: float4 из ts_rank не переживает круговой путь через
+Python без потери точности, и сравнение с курсором бы промахивалось.
+
+На других СУБД — icontains без ранжирования (ранг 0), для разработки.
+"""
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Cast
+
+from .channels import accessible_projects
+from .models import Message
+from .retention import retention_cutoff
+
+CHAT_SEARCH_PAGE_SIZE = getattr(settings, 'CHAT_SEARCH_PAGE_SIZE', 20)
+CHAT_SEARCH_MAX_PAGE_SIZE = getattr(settings, 'CHAT_SEARCH_MAX_PAGE_SIZE', 100)
+
+# The GIN index is built for this configuration; changing it needs a new index
+SEARCH_CONFIG = 'russian'
+
+FIELDS = ['id', 'text', 'timestamp', 'sender_id', 'sender__username', 'receiver_id', 'project_id', 'rank']
+
+
+def encode_cursor(row):
+    return f"{row['rank']!r},{row['id']}"
+
+
+def decode_cursor(value):
+    """(ранг, id); ValueError на испорченном курсоре"""
+    rank, message_id = value.split(',')
+    return float(rank), int(message_id)
+
+
+def visible_messages(user):
+    """Сообщения, которые пользователь может прочитать"""
+    personal = Q(project__isnull=True) & (Q(sender=user) | Q(receiver=user))
+    channels = Q(project_id__in=list(accessible_projects(user).values_list('id', flat=True)))
+    messages = Message.objects.filter(personal | channels)
+    cutoff = retention_cutoff(user.organization)
+    return messages.filter(timestamp__gte=cutoff) if cutoff is not None else messages
+
+
+def _matching(messages, query):
+    if connection.vendor != 'postgresql':
+        return messages.filter(text__icontains=query).annotate(rank=Value(0.0, output_field=FloatField()))
+
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+    vector = SearchVector('text', config=SEARCH_CONFIG)
+    tsquery = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    return messages.annotate(document=vector).filter(document=tsquery).annotate(
+        rank=Cast(SearchRank(F('document'), tsquery), FloatField())
+    )
+
+
+def search(user, query, after=None, limit=CHAT_SEARCH_PAGE_SIZE):
+    """
+    Страница результатов: (строки, курсор следующей страницы или None).
+    after — результат decode_cursor() для продолжения.
+    """
+    messages = _matching(visible_messages(user), query)
+    if after is not None:
+        after_rank, after_id = after
+        messages = messages.filter(Q(rank__lt=after_rank) | Q(rank=after_rank, id__lt=after_id))
+    rows = list(messages.order_by('-rank', '-id').values(*FIELDS)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1]) if has_more else None
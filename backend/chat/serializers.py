@@ -5,4 +5,15 @@ class MessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Message
         fields = '__all__'
-        read_only_fields = ['sender', 'timestamp']
\ No newline at end of file
+        read_only_fields = ['sender', 'timestamp', 'project']
+        # Nullable only for channel messages; a personal message always has a receiver
+        extra_kwargs = {'receiver': {'required': True, 'allow_null': False}}
+
+
+class ChannelMessageSerializer(serializers.ModelSerializer):
+    sender_username = serializers.CharField(source='sender.username', read_only=True)
+
+    class Meta:
+        model = Message
+        fields = ['id', 'project', 'sender', 'sender_username', 'text', 'timestamp']
+        read_only_fields = ['project', 'sender', 'timestamp']
@@ -1,3 +1,63 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from core.models import Organization, Project
+from users.models import CustomUser
+from .models import Message
+
+
+class MessageSearchTests(TestCase):
+    """Поиск по сообщениям: постраничный обход по курсору совпадает с одной большой страницей"""
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Org')
+        self.user, self.peer, self.stranger = [
+            CustomUser.objects.create_user(name, f'{name}@example.com', 'pw', organization=organization)
+            for name in ('user', 'peer', 'stranger')
+        ]
+        own = Project.objects.create(name='Own', organization=organization, created_by=self.user)
+        own.members.add(self.user, self.peer)
+        foreign = Project.objects.create(name='Foreign', organization=organization, created_by=self.stranger)
+        foreign.members.add(self.stranger)
+
+        # Several ranks with ties, so pages split both between and inside equal ranks
+        texts = [
+            'отчёт готов', 'отчёт отчёт и ещё раз отчёт', 'где отчёт?', 'отчёт отчёт',
+            'длинное сообщение, в самом конце которого упомянут отчёт', 'отчёт готов', 'отчёт',
+        ]
+        self.visible = set()
+        for i, text in enumerate(texts):
+            self.visible.add(Message.objects.create(sender=self.user, receiver=self.peer, text=text).id)
+            self.visible.add(Message.objects.create(sender=self.peer, project=own, text=f'{text} {i}').id)
+        Message.objects.create(sender=self.user, receiver=self.peer, text='без совпадений')
+        # Not readable by the user
+        Message.objects.create(sender=self.peer, receiver=self.stranger, text='отчёт')
+        Message.objects.create(sender=self.stranger, project=foreign, text='отчёт')
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_cursor_round_trip(self):
+        response = self.client.get('/api/chat/search/', {'q': 'отчёт', 'limit': 100})
+        self.assertEqual(response.status_code, 200)
+        everything = [row['id'] for row in response.data['results']]
+        self.assertEqual(set(everything), self.visible)
+        self.assertIsNone(response.data['next_after'])
+        ranks = [row['rank'] for row in response.data['results']]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+        seen, after = [], None
+        while True:
+            params = {'q': 'отчёт', 'limit': 3, **({'after': after} if after else {})}
+            response = self.client.get('/api/chat/search/', params)
+            self.assertEqual(response.status_code, 200)
+            seen += [row['id'] for row in response.data['results']]
+            after = response.data['next_after']
+            if after is None:
+                break
+        self.assertEqual(seen, everything)
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get('/api/chat/search/').status_code, 400)
+        self.assertEqual(self.client.get('/api/chat/search/', {'q': 'отчёт', 'after': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/chat/search/', {'q': 'отчёт', 'limit': 0}).status_code, 400)
@@ -1,7 +1,15 @@
 from django.urls import path
-from .views import MessageListCreateView, UnreadMessagesView
+from .views import (
+    ChannelListView, ChannelMessagesView, ChannelReadView, MessageListCreateView, MessageSearchView,
+    UnreadMessagesView, message_list_async,
+)
 
 urlpatterns = [
     path('', MessageListCreateView.as_view(), name='message-list'),
     path('unread/', UnreadMessagesView.as_view(), name='unread-messages'),
-]
\ No newline at end of file
+    path('async/', message_list_async, name='message-list-async'),
+    path('search/', MessageSearchView.as_view(), name='message-search'),
+    path('channels/', ChannelListView.as_view(), name='channel-list'),
+    path('channels/<int:project_id>/messages/', ChannelMessagesView.as_view(), name='channel-messages'),
+    path('channels/<int:project_id>/read/', ChannelReadView.as_view(), name='channel-read'),
+]
@@ -1,27 +1,204 @@
-from rest_framework import generics, permissions
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from . import channels, search
 from .models import Message
-from .serializers import MessageSerializer
+from .retention import retention_cutoff
+from .serializers import ChannelMessageSerializer, MessageSerializer
+from core.exports import parse_bound
+from core.throttling import TokenBucketThrottle
+from users.authentication import async_jwt_required
 from django.db.models import Q
 
+
+def bounded_by_time(queryset, params, organization):
+    """
+    Ограничивает выборку по timestamp: ?since= / ?before= и срок хранения
+    организации. Нижняя граница позволяет Postgres отсечь старые партиции.
+    """
+    try:
+        since = parse_bound(params.get('since'))
+        before = parse_bound(params.get('before'))
+    except ValueError:
+        raise ValidationError({"error": "Некорректная дата в параметрах since/before"})
+
+    cutoff = retention_cutoff(organization)
+    if cutoff is not None and (since is None or since < cutoff):
+        since = cutoff
+    if since is not None:
+        queryset = queryset.filter(timestamp__gte=since)
+    if before is not None:
+        queryset = queryset.filter(timestamp__lt=before)
+    return queryset
+
+
 class MessageListCreateView(generics.ListCreateAPIView):
     queryset = Message.objects.none()
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'message_create'
 
     def get_queryset(self):
         other_user_id = self.request.query_params.get('user_id')
-        return Message.objects.filter(
+        # project__isnull: without user_id, receiver_id=None would match the caller's channel posts
+        messages = Message.objects.filter(
             Q(sender=self.request.user, receiver_id=other_user_id) |
-            Q(sender_id=other_user_id, receiver=self.request.user)
+            Q(sender_id=other_user_id, receiver=self.request.user),
+            project__isnull=True,
+        )
+        return bounded_by_time(
+            messages, self.request.query_params, self.request.user.organization
         ).order_by('timestamp')
 
+    def perform_create(self, serializer):
+        serializer.save(sender=self.request.user)
+
 class UnreadMessagesView(generics.ListAPIView):
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         # Непрочитанные сообщения для текущего пользователя
-        return Message.objects.filter(
-            receiver=self.request.user,
-            is_read=False
-        )
\ No newline at end of file
+        return bounded_by_time(
+            Message.objects.filter(receiver=self.request.user, is_read=False),
+            self.request.query_params,
+            self.request.user.organization
+        )
+
+
+@require_GET
+@async_jwt_required
+async def message_list_async(request):
+    """Асинхронная версия списка сообщений MessageListCreateView (только чтение)"""
+    other_user_id = request.GET.get('user_id')
+    messages = Message.objects.filter(
+        Q(sender=request.user, receiver_id=other_user_id) |
+        Q(sender_id=other_user_id, receiver=request.user),
+        project__isnull=True,
+    )
+    try:
+        messages = bounded_by_time(messages, request.GET, request.user.organization)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+
+    data = [
+        message async for message in messages.order_by('timestamp').values(
+            'id', 'text', 'timestamp', 'is_read', 'sender', 'receiver'
+        )
+    ]
+    return JsonResponse(data, safe=False)
+
+
+class ChannelListView(APIView):
+    """GET /api/chat/channels/ — каналы пользователя с числом непрочитанных"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response([
+            {
+                'project': {'id': project.id, 'name': project.name},
+                'last_read_message_id': project.last_read_message_id,
+                'unread_count': project.unread_count,
+            }
+            for project in channels.channels_with_unread(request.user)
+        ])
+
+
+class ChannelMessagesView(APIView):
+    """
+    GET  /api/chat/channels/<project_id>/messages/?before=<id>&limit=<n>
+    POST /api/chat/channels/<project_id>/messages/ {"text": "..."}
+
+    История — keyset-пагинация по id (новые первыми): следующая страница —
+    before=next_before. Ответ содержит курсор прочтения пользователя.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'message_create'
+
+    def get(self, request, project_id):
+        project = channels.get_channel(request.user, project_id)
+        try:
+            before = int(request.query_params['before']) if request.query_params.get('before') else None
+            limit = min(
+                int(request.query_params.get('limit', channels.CHAT_CHANNEL_PAGE_SIZE)),
+                channels.CHAT_CHANNEL_MAX_PAGE_SIZE
+            )
+        except ValueError:
+            return Response({"error": "before и limit должны быть целыми числами"}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({"error": "limit должен быть положительным"}, status=status.HTTP_400_BAD_REQUEST)
+
+        page, next_before = channels.history(project, before=before, limit=limit)
+        cursor = project.chat_cursors.filter(user=request.user).values_list('last_read_message_id', flat=True).first()
+        return Response({
+            'results': ChannelMessageSerializer(page, many=True).data,
+            'next_before': next_before,
+            'last_read_message_id': cursor or 0,
+        })
+
+    def post(self, request, project_id):
+        project = channels.get_channel(request.user, project_id)
+        serializer = ChannelMessageSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        message = channels.post(project, request.user, serializer.validated_data['text'])
+        return Response(ChannelMessageSerializer(message).data, status=status.HTTP_201_CREATED)
+
+
+class ChannelReadView(APIView):
+    """POST /api/chat/channels/<project_id>/read/ {"message_id": n} — курсор только вперёд; без id — до конца"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, project_id):
+        project = channels.get_channel(request.user, project_id)
+        message_id = request.data.get('message_id')
+        if message_id is not None and (not isinstance(message_id, int) or isinstance(message_id, bool)):
+            return Response({"error": "message_id должен быть целым числом"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'last_read_message_id': channels.mark_read(project, request.user, message_id)})
+
+
+class MessageSearchView(APIView):
+    """
+    GET /api/chat/search/?q=<запрос>&after=<курсор>&limit=<n>
+
+    Поиск по личным перепискам и каналам пользователя, самые релевантные
+    первыми. Запрос в синтаксисе websearch: "точная фраза", -исключить, or.
+    Следующая страница — after=next_after.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "Укажите поисковый запрос q"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            after = search.decode_cursor(request.query_params['after']) if request.query_params.get('after') else None
+            limit = min(
+                int(request.query_params.get('limit', search.CHAT_SEARCH_PAGE_SIZE)),
+                search.CHAT_SEARCH_MAX_PAGE_SIZE
+            )
+        except ValueError:
+            return Response({"error": "Некорректные after или limit"}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({"error": "limit должен быть положительным"}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows, next_after = search.search(request.user, query, after=after, limit=limit)
+        return Response({
+            'results': [
+                {
+                    'id': row['id'],
+                    'text': row['text'],
+                    'timestamp': row['timestamp'],
+                    'sender': {'id': row['sender_id'], 'username': row['sender__username']},
+                    'receiver': row['receiver_id'],
+                    'project': row['project_id'],
+                    'rank': row['rank'],
+                }
+                for row in rows
+            ],
+            'next_after': next_after,
+        })
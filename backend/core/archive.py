@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+
+from tasks.models import ArchivedTask, Task
+from .models import ArchivedProjectMember, Project, Tombstone
+from .sync import access_gained, access_lost
+
+ARCHIVE_BATCH_SIZE = getattr(settings, 'ARCHIVE_BATCH_SIZE', 1000)
+
+MEMBERS_TABLE = Project.members.through._meta.db_table
+
+
+def _columns(model):
+    return [field.column for field in model._meta.concrete_fields]
+
+
+def _task_columns():
+    archived = set(_columns(ArchivedTask))
+    return [column for column in _columns(Task) if column in archived]
+
+
+def _move_batches(source_table, target_table, source_columns, target_columns, project_id, batch_size,
+                  on_batch=None):
+    """
+    Переносит строки проекта пачками INSERT ... SELECT + DELETE.
+    Каждая пачка в своей транзакции, чтобы не держать долгие блокировки.
+    on_batch(ids) вызывается внутри той же транзакции.
+    """
+    source_list = ', '.join(source_columns)
+    target_list = ', '.join(target_columns)
+    moved = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id FROM {source_table} WHERE project_id = %s ORDER BY id LIMIT %s",
+                [project_id, batch_size]
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                return moved
+            placeholders = ', '.join(['%s'] * len(ids))
+            cursor.execute(
+                f"INSERT INTO {target_table} ({target_list}) "
+                f"SELECT {source_list} FROM {source_table} WHERE id IN ({placeholders})",
+                ids
+            )
+            cursor.execute(f"DELETE FROM {source_table} WHERE id IN ({placeholders})", ids)
+            if on_batch is not None:
+                on_batch(ids)
+        moved += len(ids)
+
+
+def archive_project(project, batch_size=ARCHIVE_BATCH_SIZE):
+    """Выносит задачи и участников архивного проекта в архивные таблицы"""
+    def leave_tombstones(ids):
+        # For delta-sync clients the moved tasks are gone from the hot API
+        Tombstone.objects.bulk_create([
+            Tombstone(kind='task', object_id=task_id, organization_id=project.organization_id, project_id=project.id)
+            for task_id in ids
+        ])
+
+    columns = _task_columns()
+    tasks = _move_batches(
+        Task._meta.db_table, ArchivedTask._meta.db_table,
+        columns, columns, project.id, batch_size, on_batch=leave_tombstones
+    )
+    members = _move_batches(
+        MEMBERS_TABLE, ArchivedProjectMember._meta.db_table,
+        ['project_id', 'customuser_id'], ['project_id', 'customuser_id'],
+        project.id, batch_size
+    )
+    if members:
+        # Members lose the project from their lists; after a resumed run this covers earlier batches too
+        access_lost([project.id], list(project.archived_members.values_list('customuser_id', flat=True)))
+    return tasks, members
+
+
+def restore_project(project, batch_size=ARCHIVE_BATCH_SIZE):
+    """Возвращает задачи и участников проекта из архива в рабочие таблицы"""
+    def clear_tombstones(ids):
+        Tombstone.objects.filter(kind='task', object_id__in=ids).delete()
+
+    # updated_at is not archived: restored rows get db_default now() and reach delta clients again
+    columns = _task_columns()
+    tasks = _move_batches(
+        ArchivedTask._meta.db_table, Task._meta.db_table,
+        columns, columns, project.id, batch_size, on_batch=clear_tombstones
+    )
+    members = _move_batches(
+        ArchivedProjectMember._meta.db_table, MEMBERS_TABLE,
+        ['project_id', 'customuser_id'], ['project_id', 'customuser_id'],
+        project.id, batch_size
+    )
+    if members:
+        access_gained([project.id], list(project.members.values_list('id', flat=True)))
+    return tasks, members
+
+
+def projects_pending_archive():
+    """Архивные проекты, у которых в рабочих таблицах ещё остались строки"""
+    return Project.objects.filter(status='archived').filter(
+        Exists(Task.objects.filter(project=OuterRef('pk')))
+        | Exists(Project.members.through.objects.filter(project=OuterRef('pk')))
+    )
@@ -0,0 +1,75 @@
+"""
+Счётчики участников и задач проекта.
+
+members_count, tasks_count и open_tasks_count меняются одним UPDATE с
+F-выражением на каждое изменение состава или задачи (сигналы в core.signals),
+поэтому конкурентные запросы не теряют приращения, а список проектов читает
+готовые числа без агрегатов. Архивация переносит строки, а не удаляет их, и
+счётчики не трогает. Записи в обход сигналов (bulk-операции, сырой SQL,
+каскад при удалении пользователя) чинит recount().
+"""
+from django.conf import settings
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from tasks.models import ArchivedTask, Task
+from .models import ArchivedProjectMember, Project
+
+COUNTER_RECOUNT_BATCH_SIZE = getattr(settings, 'COUNTER_RECOUNT_BATCH_SIZE', 1000)
+
+COUNTERS = Project.COUNTER_FIELDS
+
+
+def adjust(project_ids, members=0, tasks=0, open_tasks=0):
+    """Сдвигает счётчики проектов на заданные величины одним UPDATE"""
+    deltas = {'members_count': members, 'tasks_count': tasks, 'open_tasks_count': open_tasks}
+    # Drift must not break the write that triggered the update: clamp at zero instead of failing the CHECK
+    values = {
+        field: Greatest(F(field) + delta, Value(0)) if delta < 0 else F(field) + delta
+        for field, delta in deltas.items() if delta
+    }
+    if not values or not project_ids:
+        return 0
+    return Project.objects.filter(pk__in=project_ids).update(**values)
+
+
+def _count(model, **filters):
+    counts = (
+        model.objects.filter(project=OuterRef('pk'), **filters)
+        .order_by().values('project').annotate(count=Count('*')).values('count')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def _expected():
+    return {
+        'expected_members_count': _count(Project.members.through) + _count(ArchivedProjectMember),
+        'expected_tasks_count': _count(Task) + _count(ArchivedTask),
+        'expected_open_tasks_count': (
+            _count(Task, completed_at__isnull=True) + _count(ArchivedTask, completed_at__isnull=True)
+        ),
+    }
+
+
+def recount(projects=None, batch_size=COUNTER_RECOUNT_BATCH_SIZE):
+    """
+    Пересчитывает счётчики по таблицам пачками по id и записывает только
+    разошедшиеся. Возвращает число исправленных проектов.
+    """
+    projects = Project.objects.all() if projects is None else projects
+    fixed = 0
+    last_id = 0
+    while True:
+        ids = list(projects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return fixed
+        last_id = ids[-1]
+        drifted = Project.objects.filter(pk__in=ids).annotate(**_expected()).filter(
+            ~Q(members_count=F('expected_members_count'))
+            | ~Q(tasks_count=F('expected_tasks_count'))
+            | ~Q(open_tasks_count=F('expected_open_tasks_count'))
+        )
+        # The counts are recomputed inside the UPDATE itself, so writes between the check and the fix are kept
+        fixed += Project.objects.filter(pk__in=drifted.values('pk')).update(
+            **{field: expression for field, expression in zip(COUNTERS, _expected().values())}
+        )
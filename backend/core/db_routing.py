@@ -0,0 +1,134 @@
+"""
+Чтение с реплик, запись в primary.
+
+ReplicaRoutingMiddleware разрешает реплики только безопасным запросам
+(GET/HEAD/OPTIONS). После успешного изменяющего запроса клиент на
+REPLICA_STICKY_SECONDS закрепляется за primary, чтобы сразу видеть свои
+записи: ответ ставит подписанную cookie REPLICA_PIN_COOKIE со сроком в
+подписи. Её видит любой воркер, в какой бы процесс ни попал следующий запрос.
+Фронтенд шлёт запросы с withCredentials, а CORS разрешает credentials для
+CORS_ALLOWED_ORIGINS — иначе браузер не сохранит и не отправит cookie.
+Реплика, отставшая больше чем на REPLICA_MAX_LAG секунд или недоступная,
+пропускается; если подходящих нет, чтение идёт в primary.
+"""
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+PRIMARY = 'default'
+REPLICA_STICKY_SECONDS = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+REPLICA_MAX_LAG = getattr(settings, 'REPLICA_MAX_LAG', 5)
+REPLICA_LAG_CHECK_INTERVAL = getattr(settings, 'REPLICA_LAG_CHECK_INTERVAL', 2)
+REPLICA_PIN_COOKIE = getattr(settings, 'REPLICA_PIN_COOKIE', 'replica_pin')
+REPLICA_PIN_COOKIE_SAMESITE = getattr(settings, 'REPLICA_PIN_COOKIE_SAMESITE', 'Lax')
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+_PIN_SALT = 'core.db_routing.pin'
+
+# Per-request slot in [0, 1) picking one of the healthy replicas; None means primary only
+_read_slot = ContextVar('read_slot', default=None)
+_lag_checked = {}  # alias -> (lag or None, monotonic time of the check)
+
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != PRIMARY]
+
+
+def replica_lag(alias):
+    """Отставание реплики в секундах или None, если она недоступна. Кешируется на процесс"""
+    lag, checked = _lag_checked.get(alias, (None, None))
+    if checked is not None and time.monotonic() - checked < REPLICA_LAG_CHECK_INTERVAL:
+        return lag
+    try:
+        if connections[alias].vendor == 'postgresql':
+            with connections[alias].cursor() as cursor:
+                cursor.execute(LAG_SQL)
+                lag = float(cursor.fetchone()[0] or 0)
+        else:
+            connections[alias].ensure_connection()
+            lag = 0.0
+    except DatabaseError:
+        lag = None
+    _lag_checked[alias] = (lag, time.monotonic())
+    return lag
+
+
+def healthy_replicas():
+    return [
+        alias for alias in replica_aliases()
+        if (lag := replica_lag(alias)) is not None and lag <= REPLICA_MAX_LAG
+    ]
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        slot = _read_slot.get()
+        if slot is None or connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        replicas = healthy_replicas()
+        if not replicas:
+            return PRIMARY
+        return replicas[int(slot * len(replicas))]
+
+    def db_for_write(self, model, **hints):
+        # Reads later in the same request must see this write
+        _read_slot.set(None)
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Real replicas get the schema through replication; migrate touches only the alias it is given
+        return True
+
+
+def _pinned(request):
+    # max_age is checked against the timestamp inside the signature, not the cookie's own expiry
+    return request.get_signed_cookie(
+        REPLICA_PIN_COOKIE, default=None, salt=_PIN_SALT, max_age=REPLICA_STICKY_SECONDS
+    ) is not None
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _before(self, request):
+        use_replica = request.method in SAFE_METHODS and replica_aliases() and not _pinned(request)
+        return _read_slot.set(random.random() if use_replica else None)
+
+    def _after(self, request, response, token):
+        _read_slot.reset(token)
+        if request.method not in SAFE_METHODS and response.status_code < 400 and replica_aliases():
+            response.set_signed_cookie(
+                REPLICA_PIN_COOKIE, '1', salt=_PIN_SALT, max_age=REPLICA_STICKY_SECONDS,
+                httponly=True, samesite=REPLICA_PIN_COOKIE_SAMESITE, secure=request.is_secure(),
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self._before(request)
+        return self._after(request, self.get_response(request), token)
+
+    async def __acall__(self, request):
+        token = self._before(request)
+        return self._after(request, await self.get_response(request), token)
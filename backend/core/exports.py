@@ -0,0 +1,116 @@
+import csv
+import json
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from chat.models import Message
+from tasks.models import Task
+from users.models import CustomUser
+from .models import Project
+
+# Rows fetched from the server-side cursor per round trip
+EXPORT_CHUNK_SIZE = 2000
+# Rows joined into a single chunk of the HTTP response
+EXPORT_FLUSH_ROWS = 500
+
+EXPORT_DATASETS = {
+    'projects': {
+        'queryset': lambda org: Project.objects.filter(organization=org),
+        'date_field': 'created_at',
+        'columns': [
+            'id', 'name', 'description', 'status', 'deadline',
+            'created_by__username', 'created_at', 'updated_at',
+        ],
+    },
+    'tasks': {
+        'queryset': lambda org: Task.tenant.for_organization(org),
+        'date_field': 'created_at',
+        'columns': [
+            'id', 'project_id', 'project__name', 'title', 'description',
+            'priority', 'deadline', 'assigned_to__username', 'created_at',
+        ],
+    },
+    'members': {
+        'queryset': lambda org: CustomUser.objects.filter(organization=org),
+        'date_field': 'date_joined',
+        'columns': [
+            'id', 'username', 'email', 'status', 'last_status_change', 'date_joined',
+        ],
+    },
+    'messages': {
+        'queryset': lambda org: Message.objects.filter(sender__organization=org),
+        'date_field': 'timestamp',
+        'columns': [
+            'id', 'sender__username', 'receiver__username', 'text', 'timestamp', 'is_read',
+        ],
+    },
+}
+
+
+class Echo:
+    """Псевдо-буфер для csv.writer: возвращает строку вместо записи"""
+
+    def write(self, value):
+        return value
+
+
+def parse_bound(value):
+    """Accepts an ISO date or datetime and returns an aware datetime (or None)."""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def export_rows(dataset, organization, since=None, until=None):
+    spec = EXPORT_DATASETS[dataset]
+    queryset = spec['queryset'](organization)
+    if since:
+        queryset = queryset.filter(**{f"{spec['date_field']}__gte": since})
+    if until:
+        queryset = queryset.filter(**{f"{spec['date_field']}__lt": until})
+    # Ordering by pk walks the primary key index instead of sorting the whole set
+    rows = queryset.order_by('pk').values_list(*spec['columns']).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+    return spec['columns'], rows
+
+
+def _buffered(lines):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= EXPORT_FLUSH_ROWS:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_csv(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    yield from _buffered(writer.writerow(row) for row in rows)
+
+
+def stream_ndjson(columns, rows):
+    yield from _buffered(
+        json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+        for row in rows
+    )
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson; charset=utf-8'),
+}
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.archive import ARCHIVE_BATCH_SIZE, archive_project, projects_pending_archive, restore_project
+from core.models import Project
+
+
+class Command(BaseCommand):
+    help = "Переносит задачи и участников архивных проектов в холодные таблицы"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--restore', type=int, metavar='PROJECT_ID',
+                            help="Вернуть данные проекта из архива")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if options['restore']:
+            try:
+                project = Project.objects.get(pk=options['restore'])
+            except Project.DoesNotExist:
+                raise CommandError(f"Проект {options['restore']} не найден")
+            tasks, members = restore_project(project, batch_size)
+            project.status = 'active'
+            project.save(update_fields=['status', 'updated_at'])
+            self.stdout.write(f"{project.name}: восстановлено задач {tasks}, участников {members}")
+            return
+
+        for project in projects_pending_archive().iterator():
+            tasks, members = archive_project(project, batch_size)
+            self.stdout.write(f"{project.name}: перенесено задач {tasks}, участников {members}")
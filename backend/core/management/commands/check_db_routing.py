@@ -0,0 +1,63 @@
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from core.db_routing import PRIMARY, ReplicaRoutingMiddleware, replica_aliases, replica_lag
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Проверяет маршрутизацию запросов между primary и репликами: безопасные "
+        "запросы читают с реплики, запись и чтение сразу после неё идут в primary. "
+        "Реплике нужна схема (для локальной второй базы: migrate --database=replica_1)"
+    )
+
+    def handle(self, *args, **options):
+        replicas = replica_aliases()
+        if not replicas:
+            raise CommandError("Реплики не настроены (DB_REPLICAS)")
+
+        for alias in replicas:
+            lag = replica_lag(alias)
+            self.stdout.write(f"{alias}: " + ("недоступна" if lag is None else f"отставание {lag:.1f} с"))
+
+        def view(request):
+            if request.method == 'POST':
+                # Routing a write is enough to pin the client; nothing is stored
+                router.db_for_write(CustomUser)
+            CustomUser.objects.exists()
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(view)
+        factory = RequestFactory()
+        scenarios = [
+            ("чтение", factory.get('/', HTTP_AUTHORIZATION='Bearer check-a'), 'replica'),
+            ("запись", factory.post('/', HTTP_AUTHORIZATION='Bearer check-a'), PRIMARY),
+            ("чтение после записи", factory.get('/', HTTP_AUTHORIZATION='Bearer check-a'), PRIMARY),
+            ("чтение другим клиентом", factory.get('/', HTTP_AUTHORIZATION='Bearer check-b'), 'replica'),
+        ]
+
+        failed = False
+        for name, request, expected in scenarios:
+            with ExitStack() as stack:
+                captured = {
+                    alias: stack.enter_context(CaptureQueriesContext(connections[alias]))
+                    for alias in [PRIMARY, *replicas]
+                }
+                middleware(request)
+            # The lag probe also runs on replicas: look only at the users query
+            used = sorted(
+                alias for alias, context in captured.items()
+                if any(CustomUser._meta.db_table in query['sql'] for query in context.captured_queries)
+            )
+            ok = len(used) == 1 and (used[0] == expected or expected == 'replica' and used[0] in replicas)
+            failed |= not ok
+            self.stdout.write(f"{'OK  ' if ok else 'FAIL'} {name}: {', '.join(used) or '-'} (ожидалось {expected})")
+
+        if failed:
+            raise CommandError("Маршрутизация работает не так, как ожидалось")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Project
+from tasks import schedule
+
+
+class Command(BaseCommand):
+    help = "Полностью пересчитывает расписание задач по графу зависимостей (например, после bulk_create)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, help="Только этот проект")
+
+    def handle(self, *args, **options):
+        projects = Project.objects.filter(tasks__isnull=False).distinct().order_by('id')
+        if options['project']:
+            projects = Project.objects.filter(id=options['project'])
+        changed = 0
+        for project_id in projects.values_list('id', flat=True).iterator():
+            try:
+                changed += schedule.rebuild(project_id)
+            except schedule.CycleError:
+                self.stderr.write(f"Проект {project_id}: граф зависимостей содержит цикл, пропущен")
+        self.stdout.write(f"Обновлено расписаний задач: {changed}")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.counters import COUNTER_RECOUNT_BATCH_SIZE, recount
+from core.models import Project
+
+
+class Command(BaseCommand):
+    help = "Сверяет счётчики участников и задач проектов с таблицами и исправляет расхождения"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organization', type=int, help="Только проекты этой организации")
+        parser.add_argument('--batch-size', type=int, default=COUNTER_RECOUNT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        projects = Project.objects.all()
+        if options['organization']:
+            projects = projects.filter(organization_id=options['organization'])
+        fixed = recount(projects, batch_size=options['batch_size'])
+        self.stdout.write(f"Исправлено проектов: {fixed}")
@@ -0,0 +1,80 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.counters import recount
+from core.models import Organization, Project
+from tasks.models import Task
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет базу организацией для нагрузочного теста: сотрудники <prefix>-00001…, "
+        "команды-проекты и задачи (см. benchmarks/workforce.py)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=100)
+        parser.add_argument('--team-size', type=int, default=8)
+        parser.add_argument('--tasks-per-employee', type=int, default=10)
+        parser.add_argument('--prefix', default='load')
+        parser.add_argument('--password', default='load-test-password')
+        parser.add_argument('--seed', type=int, default=1, help="зерно генератора, чтобы прогоны совпадали")
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        count = options['employees']
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+
+        with transaction.atomic():
+            # Start from a clean slate so runs with the same parameters see the same data
+            CustomUser.objects.filter(username__startswith=f'{prefix}-').delete()
+            Organization.objects.filter(name=prefix).delete()
+
+            organization = Organization.objects.create(name=prefix)
+            # One hash for everyone: seeding must not spend minutes in the password hasher
+            password = make_password(options['password'])
+            CustomUser.objects.bulk_create([
+                CustomUser(
+                    username=f'{prefix}-{number:05d}', email=f'{prefix}-{number:05d}@example.com',
+                    password=password, organization=organization, status='offline',
+                )
+                for number in range(1, count + 1)
+            ], batch_size=1000)
+            employees = list(CustomUser.objects.filter(organization=organization).order_by('username'))
+            organization.admins.add(employees[0])
+
+            teams = [employees[i:i + options['team_size']] for i in range(0, len(employees), options['team_size'])]
+            projects = Project.objects.bulk_create([
+                Project(name=f'{prefix} team {number}', organization=organization, created_by=team[0])
+                for number, team in enumerate(teams, 1)
+            ])
+            Membership = Project.members.through
+            Membership.objects.bulk_create([
+                Membership(project_id=project.id, customuser_id=employee.id)
+                for project, team in zip(projects, teams) for employee in team
+            ], batch_size=1000)
+
+            priorities = [value for value, _ in Task.PRIORITY_CHOICES]
+            Task.objects.bulk_create([
+                Task(
+                    title=f'Задача {number} для {employee.username}', project=project,
+                    organization=organization, assigned_to=employee, priority=rng.choice(priorities),
+                    deadline=now + timedelta(hours=rng.randint(-48, 24 * 14)) if rng.random() < 0.8 else None,
+                )
+                for project, team in zip(projects, teams) for employee in team
+                for number in range(options['tasks_per_employee'])
+            ], batch_size=1000)
+
+        # bulk_create bypasses the counter signals
+        recount(Project.objects.filter(organization=organization))
+        self.stdout.write(
+            f"Организация {prefix}: сотрудников {len(employees)}, проектов {len(projects)}, "
+            f"задач {len(employees) * options['tasks_per_employee']}"
+        )
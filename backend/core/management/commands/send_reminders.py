@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.reminders import REMINDER_BATCH_SIZE, send_reminders
+
+
+class Command(BaseCommand):
+    help = "Рассылает дайджесты о приближающихся и просроченных дедлайнах (запускать раз в несколько минут)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=REMINDER_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        recipients, reminders = send_reminders(batch_size=options['batch_size'])
+        self.stdout.write(f"Отправлено напоминаний: {reminders}, получателей: {recipients}")
@@ -0,0 +1,23 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+
+
+class OrganizationScopedManager(models.Manager):
+    """
+    Менеджер с обязательным фильтром по организации: Model.tenant.all() —
+    ошибка, выборка начинается только с for_organization() / for_user().
+    Модели нужно поле organization, лучше первым в составных индексах.
+    """
+
+    def get_queryset(self):
+        raise ImproperlyConfigured(
+            f"{self.model.__name__}.{self.name}: используйте for_organization() или for_user()"
+        )
+
+    def for_organization(self, organization):
+        return super().get_queryset().filter(organization=organization)
+
+    def for_user(self, user):
+        if user.organization_id is None:
+            return super().get_queryset().none()
+        return self.for_organization(user.organization_id)
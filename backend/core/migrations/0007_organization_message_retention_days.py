@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_archivedprojectmember'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='message_retention_days',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:54
+
+import django.db.models.deletion
+import django.db.models.functions.datetime
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_tombstone_project_org_updated_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(max_length=20, unique=True)),
+                ('checked_until', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReminderLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('project', 'Project'), ('task', 'Task')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('window', models.CharField(max_length=20)),
+                ('deadline', models.DateTimeField()),
+                ('sent_at', models.DateTimeField(db_default=django.db.models.functions.datetime.Now())),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('deadline__isnull', False)), fields=['deadline'], name='project_deadline_idx'),
+        ),
+        migrations.AddField(
+            model_name='reminderlog',
+            name='recipient',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='reminderlog',
+            index=models.Index(fields=['sent_at'], name='reminder_sent_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='reminderlog',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id', 'window', 'recipient', 'deadline'), name='unique_reminder_per_deadline'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.4 on 2026-10-19 13:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+COUNT = "(SELECT COUNT(*) FROM {table} WHERE {table}.project_id = core_project.id{condition})"
+
+BACKFILL = (
+    "UPDATE core_project SET "
+    "members_count = " + COUNT.format(table='core_project_members', condition='')
+    + " + " + COUNT.format(table='core_archivedprojectmember', condition='') + ", "
+    "tasks_count = " + COUNT.format(table='tasks_task', condition='')
+    + " + " + COUNT.format(table='tasks_archivedtask', condition='') + ", "
+    "open_tasks_count = " + COUNT.format(table='tasks_task', condition=' AND completed_at IS NULL')
+    + " + " + COUNT.format(table='tasks_archivedtask', condition=' AND completed_at IS NULL')
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_reminders_deadline_idx'),
+        ('tasks', '0007_task_completed_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='members_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='open_tasks_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='tasks_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_project_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tombstone',
+            name='user_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
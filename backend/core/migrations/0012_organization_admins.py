@@ -0,0 +1,58 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_admins(apps, schema_editor):
+    """Единственный admin организации становится первым из admins"""
+    Organization = apps.get_model('core', 'Organization')
+    Organization.admins.through.objects.bulk_create([
+        Organization.admins.through(organization_id=organization_id, customuser_id=admin_id)
+        for organization_id, admin_id in Organization.objects.values_list('id', 'admin_id')
+    ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    """
+    Догоняет модели: Organization.admin (FK) стал admins (M2M), а уникальность
+    имени проекта задаётся UniqueConstraint вместо unique_together. Без неё
+    свежая база (в том числе тестовая) не даёт создать организацию.
+    """
+
+    dependencies = [
+        ('core', '0011_tombstone_user_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='project',
+            options={},
+        ),
+        migrations.AlterUniqueTogether(
+            name='project',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='project',
+            constraint=models.UniqueConstraint(fields=('organization', 'name'), name='unique_project_name_per_org'),
+        ),
+        # Free the reverse accessor for the new field while the old one still holds the data
+        migrations.AlterField(
+            model_name='organization',
+            name='admin',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='organization',
+            name='admins',
+            field=models.ManyToManyField(related_name='admin_of_organizations', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(copy_admins, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='organization',
+            name='admin',
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Now
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -10,6 +11,8 @@ class Organization(models.Model):
         related_name='admin_of_organizations'
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Срок хранения сообщений чата в днях (None — хранить бессрочно)
+    message_retention_days = models.PositiveIntegerField(null=True, blank=True)
 
     def __str__(self):
         admin_usernames = ", ".join([admin.username for admin in self.admins.all()])
@@ -32,6 +35,12 @@ class Project(models.Model):
     deadline = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Счётчики для карточек проектов (core.counters); архивные строки тоже считаются.
+    # Сверяются с таблицами командой recount_project_counters
+    members_count = models.PositiveIntegerField(default=0, editable=False)
+    tasks_count = models.PositiveIntegerField(default=0, editable=False)
+    open_tasks_count = models.PositiveIntegerField(default=0, editable=False)
+    COUNTER_FIELDS = ('members_count', 'tasks_count', 'open_tasks_count')
 
     class Meta:
         constraints = [
@@ -39,4 +48,88 @@ class Project(models.Model):
                 fields=['organization', 'name'],
                 name='unique_project_name_per_org'
             ),
-        ]
\ No newline at end of file
+        ]
+        indexes = [
+            models.Index(fields=['organization', 'updated_at'], name='project_org_updated_idx'),
+            models.Index(fields=['deadline'], name='project_deadline_idx', condition=models.Q(deadline__isnull=False)),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Counters move only through F() updates (core.counters): a full-row save
+        # would write back the values loaded with the instance and lose increments
+        if not self._state.adding:
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                deferred = self.get_deferred_fields()
+                update_fields = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and field.attname not in deferred
+                ]
+            kwargs['update_fields'] = [name for name in update_fields if name not in self.COUNTER_FIELDS]
+        super().save(*args, **kwargs)
+
+class ArchivedProjectMember(models.Model):
+    """Участие в архивном проекте, вынесенное из core_project_members"""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='archived_members')
+    customuser = models.ForeignKey('users.CustomUser', on_delete=models.CASCADE, related_name='archived_projects')
+    archived_at = models.DateTimeField(db_default=Now())
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'customuser'],
+                name='unique_archived_project_member'
+            ),
+        ]
+
+
+
+class Tombstone(models.Model):
+    """След удалённой записи, чтобы клиенты с updated_since узнали об удалении"""
+    KIND_CHOICES = [
+        ('project', 'Project'),
+        ('task', 'Task'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    organization_id = models.BigIntegerField()
+    project_id = models.BigIntegerField(null=True, blank=True)
+    # Задан — запись не удалена, а стала не видна этому пользователю (он больше не участник)
+    user_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(db_default=Now())
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organization_id', 'kind', 'deleted_at'], name='tombstone_org_kind_idx'),
+            models.Index(fields=['project_id', 'kind', 'deleted_at'], name='tombstone_project_kind_idx'),
+        ]
+
+
+class ReminderCursor(models.Model):
+    """До какого момента окно напоминаний уже обработано"""
+    window = models.CharField(max_length=20, unique=True)
+    checked_until = models.DateTimeField()
+
+
+class ReminderLog(models.Model):
+    """Отправленное напоминание; перенос дедлайна даёт новую запись и новое напоминание"""
+    KIND_CHOICES = Tombstone.KIND_CHOICES
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    window = models.CharField(max_length=20)
+    recipient = models.ForeignKey('users.CustomUser', on_delete=models.CASCADE, related_name='+')
+    deadline = models.DateTimeField()
+    sent_at = models.DateTimeField(db_default=Now())
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'object_id', 'window', 'recipient', 'deadline'],
+                name='unique_reminder_per_deadline'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['sent_at'], name='reminder_sent_idx'),
+        ]
@@ -0,0 +1,164 @@
+"""
+Напоминания о дедлайнах задач и проектов.
+
+Окно задаётся смещениями от дедлайна в REMINDER_WINDOWS: элемент попадает в
+окно, когда deadline + start <= now < deadline + end. Каждый прогон читает
+только диапазон дедлайнов текущего окна по частичным индексам и из него —
+то, что вошло в окно после прошлого прогона (ReminderCursor) или изменилось
+с тех пор. Уже отправленное отсекается по ReminderLog. Напоминания
+группируются в дайджест на получателя и уходят пачками через
+REMINDER_BACKEND.
+"""
+from collections import defaultdict, namedtuple
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from tasks.models import Task
+from users.models import CustomUser
+from .models import Project, ReminderCursor, ReminderLog
+
+REMINDER_WINDOWS = getattr(settings, 'REMINDER_WINDOWS', {
+    'due_soon': (timedelta(hours=-24), timedelta(0)),
+    'overdue': (timedelta(0), timedelta(days=7)),
+})
+REMINDER_BATCH_SIZE = getattr(settings, 'REMINDER_BATCH_SIZE', 200)
+REMINDER_LOG_RETENTION_DAYS = getattr(settings, 'REMINDER_LOG_RETENTION_DAYS', 30)
+
+Reminder = namedtuple('Reminder', 'kind object_id recipient_id window deadline title project')
+
+
+class ReminderBackend:
+    """Доставка дайджестов: digests — список (получатель CustomUser, [Reminder, ...])"""
+
+    def send_digests(self, digests):
+        raise NotImplementedError
+
+
+class EmailDigestBackend(ReminderBackend):
+    SUBJECTS = {
+        'due_soon': "Скоро дедлайн",
+        'overdue': "Просрочено",
+    }
+
+    def send_digests(self, digests):
+        messages = []
+        for recipient, reminders in digests:
+            if not recipient.email:
+                continue
+            lines = []
+            for window in REMINDER_WINDOWS:
+                items = [reminder for reminder in reminders if reminder.window == window]
+                if not items:
+                    continue
+                lines.append(f"{self.SUBJECTS.get(window, window)}:")
+                for item in sorted(items, key=lambda reminder: reminder.deadline):
+                    deadline = timezone.localtime(item.deadline).strftime('%d.%m.%Y %H:%M')
+                    where = f" ({item.project})" if item.kind == 'task' else " (проект)"
+                    lines.append(f"  • {item.title}{where} — до {deadline}")
+                lines.append('')
+            messages.append(EmailMessage(
+                subject=f"Дедлайны: {len(reminders)}",
+                body='\n'.join(lines),
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[recipient.email],
+            ))
+        # One SMTP connection for the whole batch
+        get_connection().send_messages(messages)
+
+
+def get_backend():
+    return import_string(getattr(settings, 'REMINDER_BACKEND', 'core.reminders.EmailDigestBackend'))()
+
+
+def _project_deadline(day):
+    """Дедлайн проекта — дата; считаем, что он наступает в конце этого дня"""
+    return datetime.combine(day + timedelta(days=1), time.min, tzinfo=timezone.get_current_timezone())
+
+
+def _task_reminders(window, lower, upper, crossed_after, since):
+    tasks = Task.objects.filter(
+        Q(deadline__gt=crossed_after) | Q(updated_at__gt=since),
+        deadline__gt=lower, deadline__lte=upper,
+        # A finished task owes nothing, neither "due soon" nor "overdue"
+        completed_at__isnull=True,
+    ).values_list('id', 'title', 'deadline', 'assigned_to_id', 'project__name')
+    for task_id, title, deadline, assignee_id, project_name in tasks.iterator():
+        yield Reminder('task', task_id, assignee_id, window, deadline, title, project_name)
+
+
+def _project_reminders(window, lower, upper, crossed_after, since):
+    # The end of day d is in (a, b] exactly when localdate(a) <= d <= localdate(b) - 1
+    projects = Project.objects.filter(
+        Q(deadline__gte=timezone.localdate(crossed_after)) | Q(updated_at__gt=since),
+        deadline__gte=timezone.localdate(lower), deadline__lte=timezone.localdate(upper) - timedelta(days=1),
+        status='active', members__isnull=False,
+    ).values_list('id', 'name', 'deadline', 'members__id')
+    for project_id, name, deadline, member_id in projects.iterator():
+        yield Reminder('project', project_id, member_id, window, _project_deadline(deadline), name, name)
+
+
+def collect(now, since):
+    """Напоминания, вошедшие в окна за (since, now], за вычетом уже отправленных"""
+    reminders = []
+    for window, (start, end) in REMINDER_WINDOWS.items():
+        # On the first run the whole current window counts as new; it is bounded, so this is cheap
+        window_since = since.get(window) or now - (end - start)
+        bounds = (now - end, now - start, window_since - start, window_since)
+        reminders += _task_reminders(window, *bounds)
+        reminders += _project_reminders(window, *bounds)
+
+    if not reminders:
+        return []
+    sent = set(
+        ReminderLog.objects.filter(
+            object_id__in={reminder.object_id for reminder in reminders},
+            window__in={reminder.window for reminder in reminders},
+        ).values_list('kind', 'object_id', 'window', 'recipient_id', 'deadline')
+    )
+    return [
+        reminder for reminder in reminders
+        if (reminder.kind, reminder.object_id, reminder.window, reminder.recipient_id, reminder.deadline) not in sent
+    ]
+
+
+def send_reminders(now=None, backend=None, batch_size=REMINDER_BATCH_SIZE):
+    """
+    Один прогон движка. Журнал пишется после доставки каждой пачки: при сбое
+    отправленное не повторится, а неотправленное уйдёт в следующий прогон.
+    Возвращает (число получателей, число напоминаний).
+    """
+    now = now or timezone.now()
+    backend = backend or get_backend()
+    cursors = {cursor.window: cursor for cursor in ReminderCursor.objects.filter(window__in=REMINDER_WINDOWS)}
+    reminders = collect(now, {window: cursor.checked_until for window, cursor in cursors.items()})
+
+    by_recipient = defaultdict(list)
+    for reminder in reminders:
+        by_recipient[reminder.recipient_id].append(reminder)
+    recipient_ids = list(by_recipient)
+
+    for i in range(0, len(recipient_ids), batch_size):
+        batch = recipient_ids[i:i + batch_size]
+        recipients = CustomUser.objects.in_bulk(batch)
+        backend.send_digests([
+            (recipients[recipient_id], by_recipient[recipient_id])
+            for recipient_id in batch if recipient_id in recipients
+        ])
+        ReminderLog.objects.bulk_create([
+            ReminderLog(
+                kind=reminder.kind, object_id=reminder.object_id, window=reminder.window,
+                recipient_id=reminder.recipient_id, deadline=reminder.deadline
+            )
+            for recipient_id in batch if recipient_id in recipients
+            for reminder in by_recipient[recipient_id]
+        ], ignore_conflicts=True)
+
+    for window in REMINDER_WINDOWS:
+        ReminderCursor.objects.update_or_create(window=window, defaults={'checked_until': now})
+    ReminderLog.objects.filter(sent_at__lt=now - timedelta(days=REMINDER_LOG_RETENTION_DAYS)).delete()
+    return len(recipient_ids), len(reminders)
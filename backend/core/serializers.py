@@ -3,42 +3,37 @@ from rest_framework import serializers
 from .models import Organization, Project
 from users.models import CustomUser
 from tasks.models import Task
-from users.serializers import UserSerializer
+from users.serializers import CurrentUserSerializer, UserSerializer
+from .sparse import SparseFieldsMixin
 
 
-class OrganizationSerializer(serializers.ModelSerializer):
-    admins = serializers.SerializerMethodField()
-    current_user = serializers.SerializerMethodField()
+class OrganizationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    admins = UserSerializer(many=True, read_only=True)
+    current_user = CurrentUserSerializer(read_only=True)
 
     class Meta:
         model = Organization
-        fields = ['id', 'name', 'admins', 'current_user']
+        fields = ['id', 'name', 'message_retention_days', 'admins', 'current_user']
         extra_kwargs = {
             'name': {'required': True, 'allow_blank': False}
         }
 
-    def get_admins(self, obj):
-        return UserSerializer(obj.admins.all(), many=True).data
 
-    def get_current_user(self, obj):
-        request = self.context.get('request')
-        return UserSerializer(request.user).data if request else None
-
-
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     is_admin = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
         fields = [
             'id', 'name', 'description', 'status',
-            'deadline', 'created_at', 'is_admin'
+            'deadline', 'created_at', 'is_admin',
+            'members_count', 'tasks_count', 'open_tasks_count'
         ]
-        read_only_fields = ['created_at']
+        read_only_fields = ['created_at', 'members_count', 'tasks_count', 'open_tasks_count']
 
     def get_is_admin(self, obj):
         request = self.context.get('request')
-        return request.user in obj.organization.admins.all() if request and obj.organization else False
+        return obj.organization_id in request.user.administered_organization_ids if request else False
 
     def validate_deadline(self, value):
         if value and value < timezone.now().date():
@@ -46,7 +41,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         return value
 
 
-class ProjectMemberSerializer(serializers.ModelSerializer):
+class ProjectMemberSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CustomUser
         fields = ['id', 'email', 'username', 'status']
@@ -55,15 +50,11 @@ class ProjectMemberSerializer(serializers.ModelSerializer):
 class ProjectDetailSerializer(ProjectSerializer):
     organization = OrganizationSerializer(read_only=True)
     members = ProjectMemberSerializer(many=True, read_only=True)
-    current_user = serializers.SerializerMethodField()
+    current_user = CurrentUserSerializer(read_only=True)
 
     class Meta(ProjectSerializer.Meta):
         fields = ProjectSerializer.Meta.fields + ['organization', 'members', 'current_user']
 
-    def get_current_user(self, obj):
-        request = self.context.get('request')
-        return UserSerializer(request.user).data if request else None
-
 
 class ProjectTaskSerializer(serializers.ModelSerializer):
     assigned_to = serializers.StringRelatedField()
@@ -73,18 +64,16 @@ class ProjectTaskSerializer(serializers.ModelSerializer):
         model = Task
         fields = [
             'id', 'title', 'description', 'priority',
-            'deadline', 'status', 'assigned_to', 'can_edit'
+            'deadline', 'completed_at', 'assigned_to', 'can_edit'
         ]
 
     def get_can_edit(self, obj):
         request = self.context.get('request')
-        return (
-            request
-            and (
-                request.user == obj.assigned_to
-                or (obj.project and obj.project.organization and request.user in obj.project.organization.admins.all())
-            )
-        ) or False
+        if request is None:
+            return False
+        if request.user.id == obj.assigned_to_id:
+            return True
+        return obj.organization_id in request.user.administered_organization_ids
 
 
 class ProjectTaskCreateSerializer(serializers.ModelSerializer):
@@ -92,7 +81,7 @@ class ProjectTaskCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = ['id', 'title', 'description', 'priority', 'deadline', 'status', 'assigned_to']
+        fields = ['id', 'title', 'description', 'priority', 'deadline', 'completed_at', 'assigned_to']
         read_only_fields = ['id']
 
     def __init__(self, *args, **kwargs):
@@ -0,0 +1,140 @@
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from tasks import schedule
+from tasks.models import Task, TaskDependency
+from users.models import CustomUser
+from . import counters, sync
+from .models import Organization, Project, Tombstone
+
+
+@receiver(post_delete, sender=Project)
+def project_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(
+        kind='project',
+        object_id=instance.id,
+        organization_id=instance.organization_id,
+        project_id=instance.id
+    )
+
+
+@receiver(post_delete, sender=Task)
+def task_tombstone(sender, instance, origin=None, **kwargs):
+    # Tasks removed together with their project are covered by the project tombstone
+    if isinstance(origin, Project):
+        return
+    Tombstone.objects.create(
+        kind='task',
+        object_id=instance.id,
+        organization_id=instance.project.organization_id,
+        project_id=instance.project_id
+    )
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def project_members_counted(sender, instance, action, reverse, pk_set, **kwargs):
+    # reverse=True means user.projects.add(...): instance is the user, pk_set holds projects
+    Membership = Project.members.through
+    if action == 'post_add' and pk_set:
+        # Django reports only the rows it actually inserted
+        if reverse:
+            counters.adjust(pk_set, members=1)
+            sync.access_gained(pk_set, [instance.pk])
+        else:
+            counters.adjust([instance.pk], members=len(pk_set))
+            sync.access_gained([instance.pk], pk_set)
+    elif action in ('pre_remove', 'pre_clear'):
+        # pk_set on remove is what was asked for, not what existed: find the real rows first
+        if reverse:
+            rows = Membership.objects.filter(customuser=instance)
+            if action == 'pre_remove':
+                rows = rows.filter(project_id__in=pk_set or ())
+            instance._removed_projects = list(rows.values_list('project_id', flat=True))
+        else:
+            rows = Membership.objects.filter(project=instance)
+            if action == 'pre_remove':
+                rows = rows.filter(customuser_id__in=pk_set or ())
+            instance._removed_members = list(rows.values_list('customuser_id', flat=True))
+    elif action in ('post_remove', 'post_clear'):
+        if reverse:
+            removed = instance.__dict__.pop('_removed_projects', [])
+            counters.adjust(removed, members=-1)
+            if removed:
+                sync.access_lost(removed, [instance.pk])
+        else:
+            removed = instance.__dict__.pop('_removed_members', [])
+            counters.adjust([instance.pk], members=-len(removed))
+            if removed:
+                sync.access_lost([instance.pk], removed)
+
+
+@receiver(pre_delete, sender=CustomUser)
+def member_deleted(sender, instance, **kwargs):
+    # Membership rows go with the user by cascade, which sends no m2m_changed
+    counters.adjust(
+        list(Project.members.through.objects.filter(customuser=instance).values_list('project_id', flat=True))
+        + list(instance.archived_projects.values_list('project_id', flat=True)),
+        members=-1
+    )
+
+
+@receiver(post_save, sender=Task)
+def task_counted(sender, instance, created, **kwargs):
+    counted = (instance.project_id, instance.is_open)
+    previous = None if created else getattr(instance, 'loaded_counted', None)
+    instance.loaded_counted = counted
+    if created:
+        counters.adjust([instance.project_id], tasks=1, open_tasks=int(counted[1]))
+    elif previous is None or previous == counted:
+        # Unknown previous state (a deferred load) is left for recount
+        return
+    elif previous[0] == counted[0]:
+        counters.adjust([instance.project_id], open_tasks=int(counted[1]) - int(previous[1]))
+    else:
+        counters.adjust([previous[0]], tasks=-1, open_tasks=-int(previous[1]))
+        counters.adjust([instance.project_id], tasks=1, open_tasks=int(counted[1]))
+
+
+@receiver(post_delete, sender=Task)
+def task_uncounted(sender, instance, origin=None, **kwargs):
+    # The counters of a deleted project are gone with it
+    if isinstance(origin, Project):
+        return
+    project_id, is_open = getattr(instance, 'loaded_counted', (instance.project_id, instance.is_open))
+    counters.adjust([project_id], tasks=-1, open_tasks=-int(is_open))
+
+
+@receiver(post_save, sender=Task)
+def task_scheduled(sender, instance, created, **kwargs):
+    # A deferred duration was not saved either: nothing to compare, no extra query
+    current = instance.__dict__.get('duration_days')
+    previous = getattr(instance, 'loaded_duration', None)
+    instance.loaded_duration = current
+    if created:
+        schedule.task_added(instance)
+    elif previous is not None and current is not None and previous != current:
+        schedule.duration_changed(instance)
+
+
+@receiver(pre_delete, sender=Task)
+def task_unlinking(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, (Project, Organization)):
+        # The whole project goes, schedule included
+        return
+    # The edges go in the same cascade; remember who loses a neighbour
+    links = list(
+        TaskDependency.objects.filter(Q(predecessor=instance) | Q(successor=instance))
+        .values_list('predecessor_id', 'successor_id')
+    )
+    instance._schedule_neighbours = (
+        [successor for predecessor, successor in links if predecessor == instance.id],
+        [predecessor for predecessor, successor in links if successor == instance.id],
+    )
+
+
+@receiver(post_delete, sender=Task)
+def task_unscheduled(sender, instance, origin=None, **kwargs):
+    neighbours = instance.__dict__.pop('_schedule_neighbours', None)
+    if neighbours and (neighbours[0] or neighbours[1]):
+        schedule.neighbours_removed(instance.project_id, *neighbours)
@@ -0,0 +1,158 @@
+"""
+Разреженные наборы полей: ?fields= и ?expand=.
+
+?fields=id,name,organization.name — в ответе только перечисленные поля,
+вложенные выбираются через точку. Без ?fields= ответ полный, как раньше.
+С ?fields= вложенный объект, названный без подполей, сворачивается до id
+(списка id), если его нет в ?expand=: fields=id,organization&expand=organization
+вернёт организацию целиком.
+
+Запрос сужается под выбранные поля: only() по нужным колонкам, select_related
+и prefetch — только для оставшихся вложенных объектов. Снятое поле убирает и
+SQL за ним, а не только байты JSON.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_paths(value):
+    """'id,organization.name' -> {'id': {}, 'organization': {'name': {}}}"""
+    tree = {}
+    for path in filter(None, (part.strip() for part in value.split(','))):
+        node = tree
+        for name in path.split('.'):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def _unwrap(field):
+    return field.child if isinstance(field, serializers.ListSerializer) else field
+
+
+class SparseFieldsMixin:
+    """
+    Сериализатор с аргументами fields= и expand= (деревья из parse_paths).
+    Вложенный сериализатор с detached = True берёт данные не из объекта
+    (например, текущий пользователь) и в план запроса не входит.
+    """
+    detached = False
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fields = fields
+        self.sparse_expand = expand or {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.sparse_fields is None:
+            return fields
+        selected = {}
+        for name, field in fields.items():
+            if name not in self.sparse_fields:
+                continue
+            subtree = self.sparse_fields[name]
+            nested = _unwrap(field)
+            if isinstance(nested, SparseFieldsMixin):
+                expand = self.sparse_expand.get(name)
+                if subtree or expand is not None:
+                    nested.sparse_fields = subtree or None
+                    nested.sparse_expand = expand or {}
+                elif not nested.detached:
+                    field = serializers.PrimaryKeyRelatedField(
+                        read_only=True, many=field is not nested,
+                        **({'source': field.source} if field.source else {})
+                    )
+            selected[name] = field
+        return selected
+
+
+def query_plan(serializer, prefix=''):
+    """
+    Что нужно из базы полям serializer: (only, select_related, prefetch).
+    Первичный ключ и внешние ключи берутся всегда — на них опираются
+    SerializerMethodField и свёрнутые связи.
+    """
+    opts = serializer.Meta.model._meta
+    only = {prefix + opts.pk.attname} | {
+        prefix + field.attname for field in opts.concrete_fields if field.is_relation
+    }
+    select, prefetch = set(), []
+    for field in serializer.fields.values():
+        nested = _unwrap(field)
+        if field.write_only or field.source == '*' or getattr(nested, 'detached', False):
+            continue
+        try:
+            model_field = opts.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            # Method fields and properties: covered by the keys above or computed
+            continue
+        path = prefix + field.source_attrs[0]
+        if not model_field.is_relation:
+            only.add(path)
+        elif model_field.many_to_one or model_field.one_to_one:
+            if isinstance(nested, serializers.ModelSerializer):
+                select.add(path)
+                nested_only, nested_select, nested_prefetch = query_plan(nested, path + '__')
+                only |= nested_only
+                select |= nested_select
+                prefetch += nested_prefetch
+            elif len(field.source_attrs) > 1:
+                select.add(path)
+                only |= {
+                    path + '__' + model_field.related_model._meta.pk.attname,
+                    prefix + '__'.join(field.source_attrs),
+                }
+        else:
+            related = model_field.related_model
+            if isinstance(nested, serializers.ModelSerializer):
+                nested_only, nested_select, nested_prefetch = query_plan(nested)
+                queryset = _apply_plan(related.objects.all(), nested_only, nested_select, nested_prefetch)
+            else:
+                queryset = related.objects.only(related._meta.pk.attname)
+            prefetch.append(Prefetch(path, queryset=queryset))
+    return only, select, prefetch
+
+
+def _apply_plan(queryset, only, select, prefetch):
+    queryset = queryset.only(*only).prefetch_related(*prefetch)
+    # select_related() without arguments would follow every foreign key
+    return queryset.select_related(*select) if select else queryset
+
+
+class SparseFieldsetMixin:
+    """
+    Для view: разбирает ?fields= / ?expand= в действиях sparse_actions,
+    передаёт их сериализатору и сужает queryset в filter_queryset().
+    Сериализатор должен наследовать SparseFieldsMixin.
+    """
+    sparse_actions = ('list', 'retrieve')
+
+    def get_sparse(self):
+        params = self.request.query_params
+        if (
+            self.request.method not in SAFE_METHODS
+            or self.action not in self.sparse_actions
+            or not params.get('fields')
+        ):
+            return None
+        return parse_paths(params['fields']), parse_paths(params.get('expand', ''))
+
+    def get_serializer(self, *args, **kwargs):
+        sparse = self.get_sparse()
+        if sparse is not None:
+            kwargs['fields'], kwargs['expand'] = sparse
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        return self.shrink_queryset(super().filter_queryset(queryset))
+
+    def shrink_queryset(self, queryset):
+        sparse = self.get_sparse()
+        if sparse is None:
+            return queryset
+        fields, expand = sparse
+        serializer = self.get_serializer_class()(fields=fields, expand=expand, context=self.get_serializer_context())
+        # The plan replaces the view's own prefetches, which assume the full representation
+        return _apply_plan(queryset.prefetch_related(None), *query_plan(serializer))
@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.functions import Now
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .exports import parse_bound
+from .models import Organization, Project, Tombstone
+
+
+def access_lost(project_ids, user_ids):
+    """
+    Пользователи user_ids больше не участники проектов project_ids: каждому —
+    личный tombstone проекта, иначе клиент с updated_since так и держал бы
+    проект у себя. Администраторы организации видят проект и без участия.
+    Одна из сторон — одна запись (remove на проекте или на пользователе).
+    """
+    organizations = dict(Project.objects.filter(id__in=project_ids).values_list('id', 'organization_id'))
+    admins = set(
+        Organization.admins.through.objects.filter(
+            organization_id__in=set(organizations.values()), customuser_id__in=user_ids
+        ).values_list('organization_id', 'customuser_id')
+    )
+    Tombstone.objects.bulk_create([
+        Tombstone(
+            kind='project', object_id=project_id, organization_id=organization_id,
+            project_id=project_id, user_id=user_id
+        )
+        for project_id, organization_id in organizations.items()
+        for user_id in user_ids
+        if (organization_id, user_id) not in admins
+    ])
+
+
+def access_gained(project_ids, user_ids):
+    """Новые участники: проект снова попадает в их дельту, личные tombstone снимаются"""
+    Tombstone.objects.filter(kind='project', object_id__in=project_ids, user_id__in=user_ids).delete()
+    # The project itself did not change; bumping it is what puts it into updated_since results
+    Project.objects.filter(id__in=project_ids).update(updated_at=Now())
+
+
+def project_tombstones(user):
+    """Tombstone проектов, видимые пользователю: общие организации и его личные"""
+    return Tombstone.objects.filter(
+        Q(user_id__isnull=True) | Q(user_id=user.id), kind='project', organization_id=user.organization_id
+    )
+
+
+class DeltaSyncMixin:
+    """
+    ?updated_since=<ISO> для list: вместо полного списка отдаёт
+    {"results": изменённые с момента, "deleted": id удалённых, "synced_at": ...}.
+    synced_at сдвинут назад на SYNC_SAFETY_MARGIN, чтобы не потерять записи
+    из транзакций, закоммиченных сразу после запроса; повторы безопасны.
+    """
+
+    def get_tombstones(self):
+        """Tombstone удалённых записей этого списка; по умолчанию удалений не отслеживается"""
+        return Tombstone.objects.none()
+
+    def list(self, request, *args, **kwargs):
+        raw_since = request.query_params.get('updated_since')
+        if not raw_since:
+            return super().list(request, *args, **kwargs)
+
+        try:
+            since = parse_bound(raw_since)
+        except ValueError:
+            return Response(
+                {"error": "Некорректная дата в параметре updated_since"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        now = timezone.now()
+        if since < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+            return Response(
+                {"error": "Слишком старая точка синхронизации, загрузите данные полностью"},
+                status=status.HTTP_410_GONE
+            )
+
+        synced_at = now - timedelta(seconds=settings.SYNC_SAFETY_MARGIN)
+        queryset = self.filter_queryset(self.get_queryset()).filter(updated_at__gte=since)
+        deleted = self.get_tombstones().filter(deleted_at__gte=since).values_list('object_id', flat=True)
+        return Response({
+            'results': self.get_serializer(queryset, many=True).data,
+            'deleted': list(deleted),
+            'synced_at': synced_at,
+        })
@@ -1,3 +1,95 @@
 from django.test import TestCase
+from django.utils import timezone
 
-# Create your tests here.
+from tasks.models import Task
+from users.models import CustomUser
+from . import counters
+from .models import Organization, Project
+
+
+class ProjectCountersTests(TestCase):
+    """Счётчики, которые ведут сигналы, должны совпадать с пересчётом по таблицам (counters.recount)"""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Org')
+        self.users = [
+            CustomUser.objects.create_user(f'user{i}', f'user{i}@example.com', 'pw', organization=self.organization)
+            for i in range(4)
+        ]
+        self.first = Project.objects.create(name='First', organization=self.organization, created_by=self.users[0])
+        self.second = Project.objects.create(name='Second', organization=self.organization, created_by=self.users[0])
+
+    def assertCounters(self, project, members, tasks, open_tasks):
+        project.refresh_from_db()
+        self.assertEqual(
+            (project.members_count, project.tasks_count, project.open_tasks_count),
+            (members, tasks, open_tasks)
+        )
+
+    def assertMatchesRecount(self):
+        self.assertEqual(counters.recount(), 0)
+
+    def test_members(self):
+        self.first.members.add(*self.users[:3])
+        self.first.members.add(self.users[0])  # already a member: no change
+        self.users[3].projects.add(self.first, self.second)
+        self.assertCounters(self.first, 4, 0, 0)
+        self.assertCounters(self.second, 1, 0, 0)
+        self.assertMatchesRecount()
+
+        self.first.members.remove(self.users[1], self.users[2])
+        self.users[3].projects.remove(self.second)
+        self.assertCounters(self.first, 2, 0, 0)
+        self.assertCounters(self.second, 0, 0, 0)
+        self.assertMatchesRecount()
+
+        self.first.members.clear()
+        self.second.members.add(self.users[0])
+        self.users[0].projects.clear()
+        self.assertCounters(self.first, 0, 0, 0)
+        self.assertCounters(self.second, 0, 0, 0)
+        self.assertMatchesRecount()
+
+    def test_tasks(self):
+        tasks = [
+            Task.objects.create(title=f'Task {i}', project=self.first, assigned_to=self.users[0])
+            for i in range(3)
+        ]
+        self.assertCounters(self.first, 0, 3, 3)
+
+        tasks[0].completed_at = timezone.now()
+        tasks[0].save()
+        self.assertCounters(self.first, 0, 3, 2)
+        self.assertMatchesRecount()
+
+        # Move one open and one completed task to the other project
+        for task in tasks[:2]:
+            task.project = self.second
+            task.save()
+        self.assertCounters(self.first, 0, 1, 1)
+        self.assertCounters(self.second, 0, 2, 1)
+        self.assertMatchesRecount()
+
+        tasks[0].completed_at = None
+        tasks[0].save()
+        tasks[1].delete()
+        tasks[2].delete()
+        self.assertCounters(self.first, 0, 0, 0)
+        self.assertCounters(self.second, 0, 1, 1)
+        self.assertMatchesRecount()
+
+    def test_stale_save_keeps_counters(self):
+        stale = Project.objects.get(pk=self.first.pk)
+        self.first.members.add(self.users[0])
+        Task.objects.create(title='Task', project=self.first, assigned_to=self.users[0])
+        stale.description = 'Updated'
+        stale.save()
+        self.assertCounters(self.first, 1, 1, 1)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.description, 'Updated')
+
+    def test_recount_fixes_drift(self):
+        self.first.members.add(self.users[0])
+        Project.objects.filter(pk=self.first.pk).update(members_count=5, tasks_count=7)
+        self.assertEqual(counters.recount(), 1)
+        self.assertCounters(self.first, 1, 0, 0)
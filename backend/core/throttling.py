@@ -0,0 +1,74 @@
+"""
+Token bucket на пользователя и на организацию.
+
+Состояние ведер хранится в кеше (по умолчанию LocMemCache процесса), так что
+проверка не трогает базу: единственный запрос до неё — загрузка пользователя
+при аутентификации, а organization_id уже есть в его строке. Настройки на
+эндпоинт задаются в THROTTLE_BUCKETS:
+
+    THROTTLE_BUCKETS = {
+        'message_create': {'user': (2, 20), 'organization': (50, 300)},
+    }
+
+где пара — (токенов в секунду, ёмкость ведра).
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+THROTTLE_CACHE = getattr(settings, 'THROTTLE_CACHE', 'default')
+THROTTLE_BUCKETS = getattr(settings, 'THROTTLE_BUCKETS', {})
+
+
+def _owners(user, levels):
+    owners = {'user': user.id, 'organization': user.organization_id}
+    return [(level, owners[level]) for level in levels if owners.get(level) is not None]
+
+
+def acquire(user, scope, now=None):
+    """
+    Берёт по токену из всех ведер scope. Возвращает 0, если запрос пропущен,
+    иначе сколько секунд ждать до следующего токена. Токены списываются только
+    когда хватает во всех ведрах, чтобы отказ по организации не съедал
+    пользовательский лимит.
+    """
+    config = THROTTLE_BUCKETS.get(scope)
+    if not config or not user.is_authenticated:
+        return 0
+
+    cache = caches[THROTTLE_CACHE]
+    now = time.time() if now is None else now
+    buckets = []
+    for level, owner in _owners(user, config):
+        rate, burst = config[level]
+        key = f'throttle:{scope}:{level}:{owner}'
+        # Без CAS в кеше возможен небольшой перерасход при гонке — для защиты от флуда это допустимо
+        tokens, updated = cache.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        buckets.append((key, tokens, rate, burst))
+
+    wait = max(((1 - tokens) / rate for _, tokens, rate, _ in buckets if tokens < 1), default=0)
+    spend = 0 if wait else 1
+    for key, tokens, rate, burst in buckets:
+        # Ключ живёт, пока ведро не наполнится снова: полное ведро равно отсутствующему
+        cache.set(key, (tokens - spend, now), timeout=int((burst - tokens + spend) / rate) + 1)
+    return wait
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle для DRF: ограничивает изменяющие запросы view с throttle_scope.
+    Чтение не ограничивается.
+    """
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+        self._wait = acquire(request.user, getattr(view, 'throttle_scope', None))
+        return not self._wait
+
+    def wait(self):
+        return self._wait
@@ -1,11 +1,20 @@
 from django.urls import path, include
-from .views import OrganizationViewSet, ProjectViewSet
+from .views import (
+    OrganizationViewSet,
+    ProjectViewSet,
+    ArchivedProjectViewSet,
+    ExportView,
+    project_list_async,
+)
 from rest_framework.routers import DefaultRouter
 
 router = DefaultRouter()
 router.register(r'organizations', OrganizationViewSet, basename='organization')
 router.register(r'projects', ProjectViewSet, basename='project')
+router.register(r'archive/projects', ArchivedProjectViewSet, basename='archived-project')
 
 urlpatterns = [
+    path('projects/async/', project_list_async, name='project-list-async'),
+    path('export/<str:dataset>/<str:file_format>/', ExportView.as_view(), name='export'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
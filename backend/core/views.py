@@ -1,11 +1,17 @@
 from django.db import models
 from django.db.models import Q, Case, When, Value, BooleanField
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 from rest_framework import filters, viewsets, permissions, status, serializers
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
+from .archive import restore_project
 from .models import Organization, Project
+from .sparse import SparseFieldsetMixin
+from .sync import DeltaSyncMixin, project_tombstones
 from .serializers import (
     OrganizationSerializer,
     ProjectSerializer,
@@ -13,10 +19,15 @@ from .serializers import (
     ProjectTaskSerializer,
     ProjectTaskCreateSerializer,
 )
+from .exports import EXPORT_DATASETS, EXPORT_FORMATS, export_rows, parse_bound
+from audit import log as audit
+from notifications.notify import notify, notify_organization
+from users.authentication import async_jwt_required
 from users.models import CustomUser
-from tasks.models import Task
+from tasks.models import Task, ArchivedTask
+from tasks.serializers import ArchivedTaskSerializer
 
-class OrganizationViewSet(viewsets.ModelViewSet):
+class OrganizationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = OrganizationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -24,16 +35,26 @@ class OrganizationViewSet(viewsets.ModelViewSet):
         # Return the user's organization (if set) or organizations where they are an admin
         user = self.request.user
         if hasattr(user, 'organization') and user.organization:
-            return Organization.objects.filter(
+            organizations = Organization.objects.filter(
                 Q(id=user.organization.id) | Q(admins=user)
             ).distinct()
-        return Organization.objects.filter(admins=user)
+        else:
+            organizations = Organization.objects.filter(admins=user)
+        return organizations.prefetch_related(
+            models.Prefetch('admins', queryset=CustomUser.objects.select_related('organization'))
+        )
 
     def perform_create(self, serializer):
         organization = serializer.save()
         organization.admins.add(self.request.user)
         self.request.user.organization = organization
-        self.request.user.save()
+        self.request.user.save(update_fields=['organization'])
+
+    def update(self, request, *args, **kwargs):
+        # Retention hides and then deletes the whole organization's chat history
+        if 'message_retention_days' in request.data and not self._check_admin_access(self.get_object()):
+            return self._permission_denied()
+        return super().update(request, *args, **kwargs)
 
     @action(detail=True, methods=['post', 'delete'])
     def admins(self, request, pk=None):
@@ -57,6 +78,16 @@ class OrganizationViewSet(viewsets.ModelViewSet):
                 organization=organization
             )
             organization.admins.add(user)
+            audit.record(self.request, organization.id, 'org_admin_added', 'user', user.id, email=user.email)
+            notify(
+                [user.id], 'org_admin', f"Вы назначены администратором {organization.name}",
+                payload={'organization': organization.id}, actor=self.request.user
+            )
+            notify_organization(
+                organization.id, 'org_admin', f"{user.username} теперь администратор {organization.name}",
+                payload={'organization': organization.id, 'user': user.id},
+                actor=self.request.user, exclude=[user.id]
+            )
             return Response(
                 {"status": f"{user.email} добавлен как администратор"},
                 status=status.HTTP_200_OK
@@ -82,6 +113,7 @@ class OrganizationViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             organization.admins.remove(user)
+            audit.record(self.request, organization.id, 'org_admin_removed', 'user', user.id, email=user.email)
             return Response(
                 {"status": f"{user.email} удалён из администраторов"},
                 status=status.HTTP_200_OK
@@ -93,7 +125,7 @@ class OrganizationViewSet(viewsets.ModelViewSet):
             )
 
     def _check_admin_access(self, organization):
-        return self.request.user in organization.admins.all()
+        return organization.id in self.request.user.administered_organization_ids
 
     def _permission_denied(self):
         return Response(
@@ -102,7 +134,7 @@ class OrganizationViewSet(viewsets.ModelViewSet):
         )
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(SparseFieldsetMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -121,20 +153,26 @@ class ProjectViewSet(viewsets.ModelViewSet):
             return Project.objects.none()
 
         # Include projects where the user is a member or the organization admin
-        return (
+        projects = (
             Project.objects.filter(
                 Q(organization=user.organization) &
                 (Q(members=user) | Q(organization__admins=user))
             )
-            .prefetch_related(
-                models.Prefetch('members', queryset=user.__class__.objects.distinct())
-            )
             .distinct()
             .order_by('-created_at')
         )
+        # Lists show members_count; only the detail view needs the members themselves
+        if self.action == 'retrieve':
+            projects = projects.prefetch_related(
+                models.Prefetch('members', queryset=user.__class__.objects.distinct())
+            )
+        return projects
+
+    def get_tombstones(self):
+        return project_tombstones(self.request.user)
 
     def get_object(self):
-        queryset = self.get_queryset()
+        queryset = self.shrink_queryset(self.get_queryset())
         pk = self.kwargs.get('pk')
         obj = get_object_or_404(queryset, pk=pk)
         self.check_object_permissions(self.request, obj)
@@ -153,10 +191,17 @@ class ProjectViewSet(viewsets.ModelViewSet):
             created_by=self.request.user
         )
 
+    def perform_update(self, serializer):
+        was_archived = serializer.instance.status == 'archived'
+        project = serializer.save()
+        if was_archived and project.status != 'archived':
+            restore_project(project)
+
     def destroy(self, request, *args, **kwargs):
         project = self.get_object()
         if not self._check_admin_access(project):
             return self._permission_denied()
+        audit.record(request, project.organization_id, 'project_deleted', 'project', project.id, name=project.name)
         return super().destroy(request, *args, **kwargs)
 
     @action(detail=True, methods=['post', 'delete'])
@@ -171,10 +216,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def tasks(self, request, pk=None):
         project = self.get_object()
-        tasks = Task.objects.filter(
+        tasks = Task.tenant.for_organization(project.organization_id).filter(
             project=project,
             project__members=request.user
-        ).select_related('assigned_to')
+        ).select_related('assigned_to__organization').prefetch_related('assigned_to__organization__admins')
 
         status_filter = request.query_params.get('status')
         if status_filter:
@@ -198,9 +243,26 @@ class ProjectViewSet(viewsets.ModelViewSet):
         )
         write_serializer.is_valid(raise_exception=True)
         task = write_serializer.save(project=project)
+        notify(
+            [task.assigned_to_id], 'task_assigned', f"Вам назначена задача «{task.title}»",
+            payload={'task': task.id, 'project': project.id}, actor=request.user
+        )
         read_serializer = ProjectTaskSerializer(task, context={'request': request})
         return Response(read_serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=True, methods=['post'])
+    def restore(self, request, pk=None):
+        project = self.get_object()
+        if not self._check_admin_access(project):
+            return self._permission_denied()
+        tasks, members = restore_project(project)
+        project.status = 'active'
+        project.save(update_fields=['status', 'updated_at'])
+        return Response(
+            {"status": "Проект восстановлен из архива", "tasks": tasks, "members": members},
+            status=status.HTTP_200_OK
+        )
+
     def _add_member(self, project, data):
         email = data.get('email')
         if not email:
@@ -214,6 +276,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 organization=project.organization
             )
             project.members.add(user)
+            audit.record(
+                self.request, project.organization_id, 'project_member_added', 'user', user.id,
+                email=user.email, project=project.id, project_name=project.name
+            )
+            notify(
+                [user.id], 'project_member', f"Вас добавили в проект «{project.name}»",
+                payload={'project': project.id}, actor=self.request.user
+            )
             return Response(
                 {"status": f"{user.email} добавлен в проект"},
                 status=status.HTTP_200_OK
@@ -234,6 +304,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
         try:
             user = project.members.get(id=user_id)
             project.members.remove(user)
+            audit.record(
+                self.request, project.organization_id, 'project_member_removed', 'user', user.id,
+                email=user.email, project=project.id, project_name=project.name
+            )
             return Response(
                 {"status": f"{user.email} удалён из проекта"},
                 status=status.HTTP_200_OK
@@ -245,10 +319,108 @@ class ProjectViewSet(viewsets.ModelViewSet):
             )
 
     def _check_admin_access(self, project):
-        return self.request.user in project.organization.admins.all()
+        return project.organization_id in self.request.user.administered_organization_ids
 
     def _permission_denied(self):
         return Response(
             {"error": "Только администратор организации может выполнять это действие"},
             status=status.HTTP_403_FORBIDDEN
-        )
\ No newline at end of file
+        )
+
+
+class ArchivedProjectViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = ProjectSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        if not hasattr(user, 'organization') or not user.organization:
+            return Project.objects.none()
+
+        # Archived projects keep their members only in the archive table
+        return (
+            Project.objects.filter(
+                Q(organization=user.organization, status='archived') &
+                (Q(archived_members__customuser=user) | Q(organization__admins=user))
+            )
+            .distinct()
+            .order_by('-updated_at')
+        )
+
+    @action(detail=True, methods=['get'])
+    def tasks(self, request, pk=None):
+        project = self.get_object()
+        tasks = ArchivedTask.objects.filter(project=project).select_related('assigned_to__organization')
+        serializer = ArchivedTaskSerializer(tasks, many=True)
+        return Response(serializer.data)
+
+
+class ExportView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, dataset, file_format):
+        organization = request.user.organization
+        if organization is None:
+            return Response(
+                {"error": "Пользователь не принадлежит к организации"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        if not organization.admins.filter(id=request.user.id).exists():
+            return Response(
+                {"error": "Только администратор организации может выгружать данные"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        if dataset not in EXPORT_DATASETS or file_format not in EXPORT_FORMATS:
+            return Response(
+                {"error": "Неизвестный набор данных или формат"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        try:
+            since = parse_bound(request.query_params.get('since'))
+            until = parse_bound(request.query_params.get('until'))
+        except ValueError:
+            return Response(
+                {"error": "Некорректная дата в параметрах since/until"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        columns, rows = export_rows(dataset, organization, since, until)
+        stream, content_type = EXPORT_FORMATS[file_format]
+        response = StreamingHttpResponse(stream(columns, rows), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{dataset}.{file_format}"'
+        return response
+
+
+@require_GET
+@async_jwt_required
+async def project_list_async(request):
+    """
+    Асинхронный список проектов: те же поля и форматы, что у ProjectSerializer.
+    is_admin одинаков для всех проектов организации, поэтому считается один раз.
+    """
+    user = request.user
+    if user.organization_id is None:
+        return JsonResponse([], safe=False)
+
+    is_admin = await user.organization.admins.filter(id=user.id).aexists()
+    projects = Project.objects.filter(organization_id=user.organization_id)
+    if not is_admin:
+        projects = projects.filter(members=user)
+    status_filter = request.GET.get('status')
+    if status_filter:
+        projects = projects.filter(status=status_filter)
+
+    # Serializer fields format plain values without touching the database
+    fields = ProjectSerializer().fields
+    columns = [name for name in ProjectSerializer.Meta.fields if name != 'is_admin']
+    data = [
+        {
+            name: is_admin if name == 'is_admin' else (
+                None if project[name] is None else fields[name].to_representation(project[name])
+            )
+            for name in ProjectSerializer.Meta.fields
+        }
+        async for project in projects.order_by('-created_at').values(*columns)
+    ]
+    return JsonResponse(data, safe=False)
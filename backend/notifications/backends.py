@@ -0,0 +1,29 @@
+from django.utils import timezone
+
+from core.reminders import ReminderBackend
+from .models import Notification
+from .notify import store
+
+
+class InAppDigestBackend(ReminderBackend):
+    """Дайджест дедлайнов как уведомление в приложении: одно на получателя"""
+
+    def send_digests(self, digests):
+        store([
+            Notification(
+                recipient_id=recipient.id,
+                kind='deadline',
+                title=f"Дедлайны: {len(reminders)}",
+                body='\n'.join(
+                    f"{reminder.title} — до {timezone.localtime(reminder.deadline):%d.%m.%Y %H:%M}"
+                    for reminder in sorted(reminders, key=lambda reminder: reminder.deadline)
+                ),
+                payload={'items': [
+                    {'kind': reminder.kind, 'id': reminder.object_id, 'window': reminder.window,
+                     'deadline': reminder.deadline}
+                    for reminder in reminders
+                ]},
+            )
+            for recipient, reminders in digests
+        ])
+
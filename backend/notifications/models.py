@@ -0,0 +1,36 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class Notification(models.Model):
+    """
+    Уведомление пользователю. Счётчик непрочитанных хранится в
+    CustomUser.unread_notifications и меняется вместе с уведомлениями,
+    чтобы не считать COUNT(*) на каждый запрос.
+    """
+    KIND_CHOICES = [
+        ('project_member', 'Добавление в проект'),
+        ('task_assigned', 'Назначена задача'),
+        ('org_admin', 'Новый администратор'),
+        ('deadline', 'Дедлайн'),
+    ]
+
+    recipient = models.ForeignKey('users.CustomUser', on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    payload = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination: WHERE recipient = ? AND id < ? ORDER BY id DESC
+            models.Index(fields=['recipient', '-id'], name='notification_feed_idx'),
+            models.Index(
+                fields=['recipient', '-id'], name='notification_unread_idx', condition=models.Q(is_read=False)
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient_id}: {self.title}"
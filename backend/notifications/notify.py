@@ -0,0 +1,76 @@
+"""
+Рассылка уведомлений.
+
+Любая рассылка — это bulk_create пачками и один UPDATE счётчиков на пачку,
+так что событие на всю организацию не превращается в цикл INSERT'ов.
+"""
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from users.models import CustomUser
+from .models import Notification
+
+NOTIFICATION_BATCH_SIZE = getattr(settings, 'NOTIFICATION_BATCH_SIZE', 1000)
+
+
+def store(notifications):
+    """
+    Сохраняет готовые уведомления одним bulk_create и увеличивает счётчики:
+    по одному UPDATE на каждое различное число новых уведомлений (обычно одно).
+    """
+    per_recipient = Counter(notification.recipient_id for notification in notifications)
+    by_increment = defaultdict(list)
+    for recipient_id, count in per_recipient.items():
+        by_increment[count].append(recipient_id)
+    with transaction.atomic():
+        Notification.objects.bulk_create(notifications)
+        for increment, recipient_ids in by_increment.items():
+            CustomUser.objects.filter(pk__in=recipient_ids).update(
+                unread_notifications=F('unread_notifications') + increment
+            )
+
+
+def notify(recipient_ids, kind, title, body='', payload=None, actor=None):
+    """Уведомляет пользователей recipient_ids; тот, кто совершил действие, сам себя не уведомляет"""
+    recipient_ids = list(dict.fromkeys(
+        recipient_id for recipient_id in recipient_ids
+        if actor is None or recipient_id != actor.id
+    ))
+    for i in range(0, len(recipient_ids), NOTIFICATION_BATCH_SIZE):
+        store([
+            Notification(recipient_id=recipient_id, kind=kind, title=title, body=body, payload=payload or {})
+            for recipient_id in recipient_ids[i:i + NOTIFICATION_BATCH_SIZE]
+        ])
+    return len(recipient_ids)
+
+
+def notify_organization(organization_id, kind, title, body='', payload=None, actor=None, exclude=()):
+    """Уведомление всем сотрудникам организации; id читаются потоком, без загрузки моделей"""
+    recipients = CustomUser.objects.filter(organization_id=organization_id, is_active=True)
+    if exclude:
+        recipients = recipients.exclude(pk__in=exclude)
+    return notify(
+        recipients.values_list('id', flat=True).iterator(chunk_size=NOTIFICATION_BATCH_SIZE),
+        kind, title, body, payload, actor
+    )
+
+
+def mark_read(user, ids=None):
+    """Отмечает прочитанными уведомления ids (или все) и возвращает новый счётчик"""
+    with transaction.atomic():
+        unread = Notification.objects.filter(recipient=user, is_read=False)
+        if ids is not None:
+            unread = unread.filter(pk__in=ids)
+        marked = unread.update(is_read=True)
+        if ids is None:
+            CustomUser.objects.filter(pk=user.pk).update(unread_notifications=0)
+        elif marked:
+            CustomUser.objects.filter(pk=user.pk).update(
+                unread_notifications=Greatest(F('unread_notifications') - marked, 0)
+            )
+        user.refresh_from_db(fields=['unread_notifications'])
+    return user.unread_notifications
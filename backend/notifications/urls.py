@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import NotificationListView, NotificationReadView, UnreadCountView
+
+urlpatterns = [
+    path('', NotificationListView.as_view(), name='notification-list'),
+    path('read/', NotificationReadView.as_view(), name='notification-read'),
+    path('unread-count/', UnreadCountView.as_view(), name='notification-unread-count'),
+]
@@ -0,0 +1,66 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .notify import mark_read
+from .serializers import NotificationSerializer
+
+
+class NotificationListView(APIView):
+    """
+    GET /api/notifications/?before=<id>&limit=<n>&unread=1
+
+    Keyset-пагинация по id (новые первыми): следующая страница — before=next_before.
+    Счётчик непрочитанных приходит из строки пользователя, без COUNT(*).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            before = int(request.query_params['before']) if request.query_params.get('before') else None
+            limit = min(
+                int(request.query_params.get('limit', settings.NOTIFICATIONS_PAGE_SIZE)),
+                settings.NOTIFICATIONS_MAX_PAGE_SIZE
+            )
+        except ValueError:
+            return Response({"error": "before и limit должны быть целыми числами"}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({"error": "limit должен быть положительным"}, status=status.HTTP_400_BAD_REQUEST)
+
+        notifications = request.user.notifications.order_by('-id')
+        if request.query_params.get('unread') in ('1', 'true'):
+            notifications = notifications.filter(is_read=False)
+        if before is not None:
+            notifications = notifications.filter(id__lt=before)
+        page = list(notifications[:limit + 1])
+
+        has_more = len(page) > limit
+        page = page[:limit]
+        return Response({
+            'results': NotificationSerializer(page, many=True).data,
+            'next_before': page[-1].id if has_more else None,
+            'unread_count': request.user.unread_notifications,
+        })
+
+
+class NotificationReadView(APIView):
+    """POST {"ids": [...]} отмечает выбранные уведомления, {"all": true} — все"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if request.data.get('all'):
+            ids = None
+        else:
+            ids = request.data.get('ids')
+            if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+                return Response({"error": "Передайте ids списком или all: true"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'unread_count': mark_read(request.user, ids)})
+
+
+class UnreadCountView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({'unread_count': request.user.unread_notifications})
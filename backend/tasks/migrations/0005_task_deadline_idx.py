@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deadline__isnull', False)), fields=['deadline'], name='task_deadline_idx'),
+        ),
+    ]
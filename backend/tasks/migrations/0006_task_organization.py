@@ -0,0 +1,86 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+BACKFILL = (
+    "UPDATE {table} SET organization_id = "
+    "(SELECT organization_id FROM core_project WHERE core_project.id = {table}.project_id)"
+)
+
+
+def check_backfill(apps, schema_editor):
+    """
+    Проверяет внешние ключи после заполнения сразу, а не в конце транзакции:
+    отложенные проверки от UPDATE не дают следующим ALTER TABLE выполниться
+    ("pending trigger events").
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+def add_composite_fk(apps, schema_editor):
+    """
+    На Postgres task.organization не может разойтись с project.organization:
+    составной FK ссылается на пару (id, organization_id) проекта, а ON UPDATE
+    CASCADE переносит задачи вслед за проектом, если тот сменил организацию.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'ALTER TABLE core_project ADD CONSTRAINT core_project_id_organization_uniq UNIQUE (id, organization_id)'
+    )
+    schema_editor.execute(
+        'ALTER TABLE tasks_task ADD CONSTRAINT tasks_task_project_organization_fk '
+        'FOREIGN KEY (project_id, organization_id) REFERENCES core_project (id, organization_id) '
+        'ON UPDATE CASCADE DEFERRABLE INITIALLY DEFERRED'
+    )
+
+
+def drop_composite_fk(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('ALTER TABLE tasks_task DROP CONSTRAINT tasks_task_project_organization_fk')
+    schema_editor.execute('ALTER TABLE core_project DROP CONSTRAINT core_project_id_organization_uniq')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_reminders_deadline_idx'),
+        ('tasks', '0005_task_deadline_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='organization',
+            field=models.ForeignKey(null=True, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='core.organization'),
+        ),
+        migrations.AddField(
+            model_name='archivedtask',
+            name='organization',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to='core.organization'),
+        ),
+        migrations.RunSQL(BACKFILL.format(table='tasks_task'), migrations.RunSQL.noop),
+        migrations.RunSQL(BACKFILL.format(table='tasks_archivedtask'), migrations.RunSQL.noop),
+        migrations.RunPython(check_backfill, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='task',
+            name='organization',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='core.organization'),
+        ),
+        migrations.AlterField(
+            model_name='archivedtask',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to='core.organization'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['organization', 'updated_at'], name='task_org_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['organization', 'assigned_to', 'deadline'], name='task_org_assignee_idx'),
+        ),
+        migrations.RunPython(add_composite_fk, drop_composite_fk),
+    ]
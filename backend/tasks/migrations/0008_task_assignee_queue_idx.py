@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-19 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_completed_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('completed_at__isnull', True)), fields=['assigned_to', 'priority', 'deadline'], name='task_assignee_queue_idx'),
+        ),
+    ]
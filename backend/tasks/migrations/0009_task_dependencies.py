@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-19 13:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_project_counters'),
+        ('tasks', '0008_task_assignee_queue_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedtask',
+            name='duration_days',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='duration_days',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.CreateModel(
+            name='TaskDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('predecessor', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='successor_links', to='tasks.task')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_dependencies', to='core.project')),
+                ('successor', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='predecessor_links', to='tasks.task')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('predecessor', 'successor'), name='task_dep_unique'), models.CheckConstraint(condition=models.Q(('predecessor', models.F('successor')), _negated=True), name='task_dep_not_self')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskSchedule',
+            fields=[
+                ('task', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='schedule', serialize=False, to='tasks.task')),
+                ('earliest_start', models.PositiveIntegerField(default=0)),
+                ('tail', models.PositiveIntegerField(default=0)),
+                ('project', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='task_schedules', to='core.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', 'tail'], name='task_schedule_tail_idx')],
+            },
+        ),
+    ]
@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models.functions import Now
+
+from core.managers import OrganizationScopedManager
 
 class Task(models.Model):
     PRIORITY_CHOICES = [
@@ -9,10 +12,128 @@ class Task(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     project = models.ForeignKey('core.Project', on_delete=models.CASCADE, related_name='tasks')
+    # Копия project.organization: запросы внутри организации обходятся без JOIN'ов.
+    # Заполняется в save(), на Postgres согласованность держит составной FK (project, organization)
+    organization = models.ForeignKey(
+        'core.Organization', on_delete=models.CASCADE, related_name='tasks', editable=False
+    )
     assigned_to = models.ForeignKey('users.CustomUser', on_delete=models.CASCADE, related_name='tasks')
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium')
     deadline = models.DateTimeField(null=True, blank=True)
+    # Пока не заполнено, задача открыта и входит в Project.open_tasks_count
+    completed_at = models.DateTimeField(null=True, blank=True)
+    # Длительность в днях для расчёта расписания проекта (tasks.schedule)
+    duration_days = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
+    # db_default: rows restored from the archive via INSERT ... SELECT get a fresh value
+    updated_at = models.DateTimeField(auto_now=True, db_default=Now())
+
+    objects = models.Manager()
+    tenant = OrganizationScopedManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'updated_at'], name='task_project_updated_idx'),
+            models.Index(fields=['deadline'], name='task_deadline_idx', condition=models.Q(deadline__isnull=False)),
+            models.Index(fields=['organization', 'updated_at'], name='task_org_updated_idx'),
+            models.Index(fields=['organization', 'assigned_to', 'deadline'], name='task_org_assignee_idx'),
+            # "My tasks" queue (tasks.queue): open tasks only
+            models.Index(
+                fields=['assigned_to', 'priority', 'deadline'], name='task_assignee_queue_idx',
+                condition=models.Q(completed_at__isnull=True)
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.title} (Project: {self.project.name})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Проект и открытость на момент загрузки: по ним сигналы правят счётчики проекта
+        if 'project_id' in instance.__dict__ and 'completed_at' in instance.__dict__:
+            instance.loaded_counted = (instance.project_id, instance.is_open)
+        if 'duration_days' in instance.__dict__:
+            instance.loaded_duration = instance.duration_days
+        return instance
+
+    @property
+    def is_open(self):
+        return self.completed_at is None
+
+    def save(self, *args, **kwargs):
+        if self.project_id is not None:
+            self.organization_id = self.project.organization_id
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'project' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'organization'}
+        super().save(*args, **kwargs)
+
+class ArchivedTask(models.Model):
+    """Холодная копия задачи архивного проекта (id совпадает с исходным)"""
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    project = models.ForeignKey('core.Project', on_delete=models.CASCADE, related_name='archived_tasks')
+    organization = models.ForeignKey('core.Organization', on_delete=models.CASCADE, related_name='archived_tasks')
+    assigned_to = models.ForeignKey('users.CustomUser', on_delete=models.CASCADE, related_name='archived_tasks')
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES, default='medium')
+    deadline = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    duration_days = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(db_default=Now())
+
+    def __str__(self):
+        return f"{self.title} (архив)"
+
+
+class TaskDependency(models.Model):
+    """
+    Ребро графа зависимостей: successor начинается после окончания predecessor.
+    Обе задачи из одного проекта; циклы отсекает tasks.schedule при добавлении.
+    Связи с задачами без ограничений в БД: архивация переносит задачи сырым
+    DELETE, а рёбра остаются и снова действуют после восстановления проекта.
+    """
+    project = models.ForeignKey('core.Project', on_delete=models.CASCADE, related_name='task_dependencies')
+    predecessor = models.ForeignKey(
+        Task, on_delete=models.CASCADE, related_name='successor_links', db_constraint=False,
+        db_index=False,  # task_dep_unique leads with predecessor
+    )
+    successor = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='predecessor_links', db_constraint=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['predecessor', 'successor'], name='task_dep_unique'),
+            models.CheckConstraint(condition=~models.Q(predecessor=models.F('successor')), name='task_dep_not_self'),
+        ]
+
+    def __str__(self):
+        return f"{self.predecessor_id} → {self.successor_id}"
+
+
+class TaskSchedule(models.Model):
+    """
+    Рассчитанное расписание задачи в днях от начала проекта (см. tasks.schedule).
+    earliest_start — самый длинный путь от начала проекта до задачи,
+    tail — самый длинный путь от начала задачи (с её длительностью) до конца.
+    Остальное выводится при чтении: конец проекта — максимум tail, поздний
+    старт — конец минус tail, резерв — поздний старт минус ранний.
+    """
+    task = models.OneToOneField(
+        Task, on_delete=models.CASCADE, primary_key=True, related_name='schedule', db_constraint=False
+    )
+    project = models.ForeignKey('core.Project', on_delete=models.CASCADE, related_name='task_schedules',
+                                db_index=False)
+    earliest_start = models.PositiveIntegerField(default=0)
+    tail = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Project end: the largest tail of the project
+            models.Index(fields=['project', 'tail'], name='task_schedule_tail_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.title} (Project: {self.project.name})"
\ No newline at end of file
+        return f"{self.task_id}: {self.earliest_start} + {self.tail}"
@@ -0,0 +1,95 @@
+"""
+Очередь «мои задачи»: открытые задачи пользователя из всех доступных ему
+проектов, важные первыми, внутри приоритета — по ближайшему дедлайну.
+
+Приоритет хранится строкой, и её алфавитный порядок не совпадает с
+важностью. Поэтому запрос — UNION ALL по одной ветке на приоритет. Каждая
+ветка читает диапазон частичного индекса task_assignee_queue_idx
+(assigned_to, priority, deadline) уже в нужном порядке и останавливается на
+limit + 1 строках. Внешний ORDER BY сортирует не больше 3 * (limit + 1) строк,
+так что весь запрос один и не зависит от числа проектов пользователя.
+
+Курсор страницы — последняя выданная строка: "<ранг>,<дедлайн в мкс от эпохи или пусто>,<id>".
+"""
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db.models import Exists, F, IntegerField, OuterRef, Q, Value
+
+from core.models import Organization, Project
+from .models import Task
+
+MY_TASKS_PAGE_SIZE = getattr(settings, 'MY_TASKS_PAGE_SIZE', 50)
+MY_TASKS_MAX_PAGE_SIZE = getattr(settings, 'MY_TASKS_MAX_PAGE_SIZE', 200)
+
+# Most important first
+PRIORITY_ORDER = [value for value, _ in reversed(Task.PRIORITY_CHOICES)]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+FIELDS = ['id', 'title', 'description', 'priority', 'deadline', 'project_id', 'project__name', 'created_at']
+
+
+def encode_cursor(row):
+    # Microseconds since the epoch: exact and safe in a query string, unlike "+00:00"
+    deadline = (row['deadline'] - EPOCH) // timedelta(microseconds=1) if row['deadline'] else ''
+    return f"{row['rank']},{deadline},{row['id']}"
+
+
+def decode_cursor(value):
+    """(ранг, дедлайн или None, id); ValueError на испорченном курсоре"""
+    rank, deadline, task_id = value.split(',')
+    deadline = EPOCH + timedelta(microseconds=int(deadline)) if deadline else None
+    return int(rank), deadline, int(task_id)
+
+
+def _after(deadline, task_id):
+    """Строки одного приоритета после (deadline, id) в порядке deadline NULLS LAST, id"""
+    if deadline is None:
+        return Q(deadline__isnull=True, id__gt=task_id)
+    return (
+        Q(deadline__gt=deadline)
+        | Q(deadline=deadline, id__gt=task_id)
+        | Q(deadline__isnull=True)
+    )
+
+
+def my_tasks(user, after=None, limit=MY_TASKS_PAGE_SIZE):
+    """
+    Страница очереди пользователя: (строки, курсор следующей страницы или None).
+    after — результат decode_cursor() для продолжения.
+    """
+    # Admins see every project of the organization, others only their own; removing
+    # someone from a project hides its tasks even while they stay assigned
+    accessible = Exists(
+        Project.members.through.objects.filter(project_id=OuterRef('project_id'), customuser_id=user.id)
+    ) | Exists(
+        Organization.admins.through.objects.filter(organization_id=OuterRef('organization_id'), customuser_id=user.id)
+    )
+    tasks = Task.tenant.for_user(user).filter(accessible, assigned_to=user, completed_at__isnull=True)
+
+    branches = []
+    for rank, priority in enumerate(PRIORITY_ORDER):
+        branch = tasks.filter(priority=priority)
+        if after is not None:
+            after_rank, after_deadline, after_id = after
+            if rank < after_rank:
+                continue
+            if rank == after_rank:
+                branch = branch.filter(_after(after_deadline, after_id))
+        branches.append(
+            branch.annotate(rank=Value(rank, output_field=IntegerField()))
+            .order_by(F('deadline').asc(nulls_last=True), 'id')
+            .values(*FIELDS, 'rank')[:limit + 1]
+        )
+    if not branches:
+        return [], None
+
+    if len(branches) == 1:
+        rows = list(branches[0])
+    else:
+        query = branches[0].union(*branches[1:], all=True)
+        rows = list(query.order_by('rank', F('deadline').asc(nulls_last=True), 'id')[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1]) if has_more else None
@@ -0,0 +1,294 @@
+"""
+Расписание проекта по графу зависимостей (метод критического пути).
+
+Для задачи хранятся две величины (TaskSchedule):
+  earliest_start — самый длинный путь от начала проекта до её старта;
+  tail           — самый длинный путь от её старта до конца проекта.
+Первая зависит только от предков задачи, вторая — только от потомков, так
+что правка ребра или длительности меняет ограниченный подграф: потомков
+successor (ранний старт) и предков predecessor (хвост). Этот конус
+находится одним рекурсивным CTE, пересчитывается в топологическом порядке,
+и записываются только изменившиеся строки.
+
+Конец проекта — максимум tail (индекс task_schedule_tail_idx). Поздний
+старт, поздний финиш, резерв и критичность выводятся при чтении, поэтому
+сдвиг конца проекта не переписывает весь граф.
+
+Правки графа одного проекта сериализуются блокировкой строки проекта.
+"""
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Max
+
+from core.models import Project
+from .models import Task, TaskDependency, TaskSchedule
+
+
+TASK_GRAPH_PAGE_SIZE = getattr(settings, 'TASK_GRAPH_PAGE_SIZE', 500)
+TASK_GRAPH_MAX_PAGE_SIZE = getattr(settings, 'TASK_GRAPH_MAX_PAGE_SIZE', 5000)
+
+
+class CycleError(ValueError):
+    pass
+
+
+TASKS = Task._meta.db_table
+EDGES = TaskDependency._meta.db_table
+SCHEDULES = TaskSchedule._meta.db_table
+
+# Each cone row: a task, its current values, and one incoming (forward) or outgoing
+# (backward) edge with the neighbour's current values; no edge gives NULLs
+_CONE_SQL = {
+    'forward': f"""
+        WITH RECURSIVE cone(id) AS (
+            SELECT id FROM {TASKS} WHERE id IN ({{seeds}})
+            UNION
+            SELECT e.successor_id FROM {EDGES} e JOIN cone ON e.predecessor_id = cone.id
+        )
+        SELECT t.id, t.project_id, t.duration_days, s.task_id IS NOT NULL, s.earliest_start,
+               n.id, n.duration_days, ns.task_id IS NOT NULL, ns.earliest_start
+        FROM cone
+        JOIN {TASKS} t ON t.id = cone.id
+        LEFT JOIN {SCHEDULES} s ON s.task_id = t.id
+        LEFT JOIN {EDGES} e ON e.successor_id = t.id
+        LEFT JOIN {TASKS} n ON n.id = e.predecessor_id
+        LEFT JOIN {SCHEDULES} ns ON ns.task_id = n.id
+    """,
+    'backward': f"""
+        WITH RECURSIVE cone(id) AS (
+            SELECT id FROM {TASKS} WHERE id IN ({{seeds}})
+            UNION
+            SELECT e.predecessor_id FROM {EDGES} e JOIN cone ON e.successor_id = cone.id
+        )
+        SELECT t.id, t.project_id, t.duration_days, s.task_id IS NOT NULL, s.tail,
+               n.id, n.duration_days, ns.task_id IS NOT NULL, ns.tail
+        FROM cone
+        JOIN {TASKS} t ON t.id = cone.id
+        LEFT JOIN {SCHEDULES} s ON s.task_id = t.id
+        LEFT JOIN {EDGES} e ON e.predecessor_id = t.id
+        LEFT JOIN {TASKS} n ON n.id = e.successor_id
+        LEFT JOIN {SCHEDULES} ns ON ns.task_id = n.id
+    """,
+}
+
+
+def _topological(nodes, edges):
+    """Порядок Кана для nodes по рёбрам (from, to); CycleError, если обойти всё нельзя"""
+    indegree = dict.fromkeys(nodes, 0)
+    following = defaultdict(list)
+    for source, target in edges:
+        following[source].append(target)
+        indegree[target] += 1
+    queue = deque(node for node, degree in indegree.items() if degree == 0)
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for target in following[node]:
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                queue.append(target)
+    if len(order) < len(indegree):
+        raise CycleError("Граф зависимостей содержит цикл")
+    return order
+
+
+def _save(project_id, rows, field):
+    """rows: {task_id: value} — только изменившиеся значения field"""
+    if rows:
+        TaskSchedule.objects.bulk_create(
+            [TaskSchedule(task_id=task_id, project_id=project_id, **{field: value}) for task_id, value in rows.items()],
+            update_conflicts=True, unique_fields=['task'], update_fields=[field], batch_size=5000,
+        )
+
+
+def _propagate(direction, seeds):
+    """
+    Пересчитывает конус seeds: потомков (forward, earliest_start) или предков
+    (backward, tail). Возвращает число изменившихся задач или None, если у
+    кого-то в конусе или рядом ещё нет строки расписания (задачи из
+    bulk_create) и нужен полный пересчёт.
+    """
+    seeds = list(seeds)
+    if not seeds:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(_CONE_SQL[direction].format(seeds=', '.join(['%s'] * len(seeds))), seeds)
+        rows = cursor.fetchall()
+
+    duration, current, neighbours = {}, {}, defaultdict(list)
+    project_id = None
+    for row in rows:
+        task_id, project_id, task_duration, scheduled, value = row[:5]
+        neighbour, neighbour_duration, neighbour_scheduled, neighbour_value = row[5:]
+        if not scheduled or (neighbour is not None and not neighbour_scheduled):
+            return None
+        duration[task_id] = task_duration
+        current[task_id] = value
+        if neighbour is not None:
+            neighbours[task_id].append((neighbour, neighbour_duration, neighbour_value))
+
+    # Within the cone, neighbours are recomputed first; outside it they are final
+    edges = [
+        (neighbour, task_id) for task_id, links in neighbours.items()
+        for neighbour, _, _ in links if neighbour in duration
+    ]
+    value = {}
+    for task_id in _topological(duration, edges):
+        links = neighbours[task_id]
+        if direction == 'forward':
+            value[task_id] = max(
+                (value.get(n, n_value) + n_duration for n, n_duration, n_value in links), default=0
+            )
+        else:
+            value[task_id] = duration[task_id] + max((value.get(n, n_value) for n, _, n_value in links), default=0)
+
+    changed = {task_id: v for task_id, v in value.items() if v != current[task_id]}
+    _save(project_id, changed, 'earliest_start' if direction == 'forward' else 'tail')
+    return len(changed)
+
+
+def recompute(project_id):
+    """Полный пересчёт расписания проекта; возвращает число изменившихся задач"""
+    tasks = dict(Task.objects.filter(project_id=project_id).values_list('id', 'duration_days'))
+    edges = [
+        (source, target)
+        for source, target in TaskDependency.objects.filter(project_id=project_id).values_list(
+            'predecessor_id', 'successor_id'
+        )
+        if source in tasks and target in tasks
+    ]
+    order = _topological(tasks, edges)
+    preceding, following = defaultdict(list), defaultdict(list)
+    for source, target in edges:
+        preceding[target].append(source)
+        following[source].append(target)
+
+    start, tail = {}, {}
+    for task_id in order:
+        start[task_id] = max((start[p] + tasks[p] for p in preceding[task_id]), default=0)
+    for task_id in reversed(order):
+        tail[task_id] = tasks[task_id] + max((tail[s] for s in following[task_id]), default=0)
+
+    existing = {
+        task_id: (es, t) for task_id, es, t in
+        TaskSchedule.objects.filter(project_id=project_id).values_list('task_id', 'earliest_start', 'tail')
+    }
+    changed = [
+        TaskSchedule(task_id=task_id, project_id=project_id, earliest_start=start[task_id], tail=tail[task_id])
+        for task_id in order if existing.get(task_id) != (start[task_id], tail[task_id])
+    ]
+    TaskSchedule.objects.bulk_create(
+        changed, update_conflicts=True, unique_fields=['task'],
+        update_fields=['earliest_start', 'tail'], batch_size=5000,
+    )
+    return len(changed)
+
+
+def _lock_project(project_id):
+    list(Project.objects.select_for_update().filter(id=project_id).values_list('id'))
+
+
+def rebuild(project_id):
+    """Полный пересчёт под блокировкой проекта (recompute_task_schedules)"""
+    with transaction.atomic():
+        _lock_project(project_id)
+        return recompute(project_id)
+
+
+def _update(project_id, forward_seeds, backward_seeds):
+    """Пересчёт затронутых конусов под блокировкой проекта; без строк расписания — целиком"""
+    with transaction.atomic():
+        _lock_project(project_id)
+        if _propagate('forward', forward_seeds) is None or _propagate('backward', backward_seeds) is None:
+            recompute(project_id)
+
+
+def add_dependency(predecessor, successor):
+    """
+    Добавляет ребро predecessor → successor и пересчитывает расписание.
+    CycleError — ребро замкнуло бы цикл (ничего не сохраняется);
+    IntegrityError — такое ребро уже есть.
+    """
+    if predecessor.project_id != successor.project_id:
+        raise ValueError("Зависимость возможна только между задачами одного проекта")
+    if predecessor.id == successor.id:
+        raise CycleError("Задача не может зависеть от самой себя")
+    with transaction.atomic():
+        _lock_project(predecessor.project_id)
+        edge = TaskDependency.objects.create(
+            project_id=predecessor.project_id, predecessor=predecessor, successor=successor
+        )
+        # A cycle through the new edge runs from successor's cone back into predecessor:
+        # _topological cannot order it, and the CycleError rolls the edge back
+        _update(predecessor.project_id, [successor.id], [predecessor.id])
+    return edge
+
+
+def remove_dependency(edge):
+    with transaction.atomic():
+        project_id, predecessor_id, successor_id = edge.project_id, edge.predecessor_id, edge.successor_id
+        edge.delete()
+        _update(project_id, [successor_id], [predecessor_id])
+
+
+def task_added(task):
+    TaskSchedule.objects.get_or_create(
+        task_id=task.id, defaults={'project_id': task.project_id, 'earliest_start': 0, 'tail': task.duration_days}
+    )
+
+
+def duration_changed(task):
+    # Its own start stays, its successors move; its tail changes and so do its ancestors'
+    _update(task.project_id, [task.id], [task.id])
+
+
+def neighbours_removed(project_id, successor_ids, predecessor_ids):
+    """После удаления задачи: её соседи остались без рёбер к ней"""
+    _update(project_id, successor_ids, predecessor_ids)
+
+
+def project_end(project_id):
+    return TaskSchedule.objects.filter(project_id=project_id).aggregate(end=Max('tail'))['end'] or 0
+
+
+def graph_page(project_id, after=None, limit=TASK_GRAPH_PAGE_SIZE, critical=False):
+    """
+    Страница графа проекта по id задач: задачи с расписанием и входящие рёбра
+    задач страницы. Возвращает (end, tasks, edges, next_after).
+    """
+    end = project_end(project_id)
+    tasks = Task.objects.filter(project_id=project_id).order_by('id')
+    if after is not None:
+        tasks = tasks.filter(id__gt=after)
+    if critical:
+        tasks = tasks.alias(finish=F('schedule__earliest_start') + F('schedule__tail')).filter(finish=end)
+    rows = list(tasks.values_list(
+        'id', 'title', 'duration_days', 'schedule__earliest_start', 'schedule__tail'
+    )[:limit + 1])
+    next_after = rows[limit - 1][0] if len(rows) > limit else None
+    rows = rows[:limit]
+
+    page = []
+    for task_id, title, duration, earliest_start, tail in rows:
+        if earliest_start is None:
+            # Not scheduled yet (bulk-created): a standalone task at the start
+            earliest_start, tail = 0, duration
+        latest_start = end - tail
+        page.append({
+            'id': task_id,
+            'title': title,
+            'duration_days': duration,
+            'earliest_start': earliest_start,
+            'earliest_finish': earliest_start + duration,
+            'latest_start': latest_start,
+            'latest_finish': latest_start + duration,
+            'slack': latest_start - earliest_start,
+            'critical': earliest_start == latest_start,
+        })
+    edges = list(TaskDependency.objects.filter(
+        successor_id__in=[task['id'] for task in page]
+    ).order_by('successor_id', 'predecessor_id').values_list('predecessor_id', 'successor_id'))
+    return end, page, [list(edge) for edge in edges], next_after
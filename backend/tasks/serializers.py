@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Task
+from .models import Task, ArchivedTask
 
 class TaskSerializer(serializers.ModelSerializer):
     class Meta:
@@ -9,4 +9,14 @@ class TaskSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         print("Полученные данные:", data)
-        return data
\ No newline at end of file
+        return data
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    assigned_to = serializers.StringRelatedField()
+
+    class Meta:
+        model = ArchivedTask
+        fields = [
+            'id', 'title', 'description', 'priority',
+            'deadline', 'completed_at', 'assigned_to', 'created_at', 'archived_at'
+        ]
@@ -1,3 +1,148 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import Organization, Project
+from users.models import CustomUser
+from . import schedule
+from .models import Task, TaskDependency, TaskSchedule
+from .queue import PRIORITY_ORDER
+
+
+class ScheduleTests(TestCase):
+    """Инкрементальный пересчёт расписания должен совпадать с полным (schedule.recompute)"""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Org')
+        self.admin = CustomUser.objects.create_user('admin', 'admin@example.com', 'pw', organization=self.organization)
+        self.organization.admins.add(self.admin)
+        self.project = Project.objects.create(name='Project', organization=self.organization, created_by=self.admin)
+
+    def task(self, title, duration):
+        return Task.objects.create(title=title, project=self.project, assigned_to=self.admin, duration_days=duration)
+
+    def snapshot(self):
+        return {
+            task_id: (earliest_start, tail)
+            for task_id, earliest_start, tail in TaskSchedule.objects.filter(project=self.project).values_list(
+                'task_id', 'earliest_start', 'tail'
+            )
+        }
+
+    def assertMatchesRecompute(self):
+        incremental = self.snapshot()
+        self.assertEqual(schedule.recompute(self.project.id), 0)
+        self.assertEqual(self.snapshot(), incremental)
+
+    def diamond(self):
+        # a(2) → b(3) → d(1) → e(2), a → c(5) → d, f(4) → e
+        tasks = {name: self.task(name, duration) for name, duration in
+                 [('a', 2), ('b', 3), ('c', 5), ('d', 1), ('e', 2), ('f', 4)]}
+        for predecessor, successor in ['ab', 'ac', 'bd', 'cd', 'de', 'fe']:
+            schedule.add_dependency(tasks[predecessor], tasks[successor])
+        return tasks
+
+    def test_cycle_is_rejected(self):
+        a, b, c = self.task('a', 1), self.task('b', 1), self.task('c', 1)
+        schedule.add_dependency(a, b)
+        schedule.add_dependency(b, c)
+        with self.assertRaises(schedule.CycleError):
+            schedule.add_dependency(c, a)
+        with self.assertRaises(schedule.CycleError):
+            schedule.add_dependency(a, a)
+        self.assertEqual(TaskDependency.objects.filter(project=self.project).count(), 2)
+        self.assertMatchesRecompute()
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.post('/api/tasks/dependencies/', {'predecessor': c.id, 'successor': a.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_incremental_matches_recompute(self):
+        tasks = self.diamond()
+        self.assertMatchesRecompute()
+        self.assertEqual(schedule.project_end(self.project.id), 2 + 5 + 1 + 2)
+
+        tasks['b'].duration_days = 10
+        tasks['b'].save()
+        self.assertMatchesRecompute()
+        self.assertEqual(schedule.project_end(self.project.id), 2 + 10 + 1 + 2)
+
+        tasks['b'].delete()
+        self.assertMatchesRecompute()
+        self.assertEqual(schedule.project_end(self.project.id), 2 + 5 + 1 + 2)
+
+        schedule.remove_dependency(TaskDependency.objects.get(predecessor=tasks['c'], successor=tasks['d']))
+        self.assertMatchesRecompute()
+
+    def test_critical_filter(self):
+        tasks = self.diamond()
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        response = client.get(f'/api/tasks/graph/?project={self.project.id}&critical=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['project_end'], 10)
+        self.assertEqual(
+            {task['id'] for task in response.data['tasks']},
+            {tasks[name].id for name in 'acde'}
+        )
+        self.assertTrue(all(task['slack'] == 0 for task in response.data['tasks']))
+
+        response = client.get(f'/api/tasks/graph/?project={self.project.id}')
+        slack = {task['id']: task['slack'] for task in response.data['tasks']}
+        self.assertEqual(slack[tasks['b'].id], 2)
+        self.assertEqual(slack[tasks['f'].id], 4)
+
+
+class MyTasksTests(TestCase):
+    """Очередь «мои задачи»: постраничный обход по курсору совпадает с полным порядком"""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Org')
+        self.user = CustomUser.objects.create_user('user', 'user@example.com', 'pw', organization=self.organization)
+        other = CustomUser.objects.create_user('other', 'other@example.com', 'pw', organization=self.organization)
+        self.projects = [
+            Project.objects.create(name=f'Project {i}', organization=self.organization, created_by=other)
+            for i in range(3)
+        ]
+        self.projects[0].members.add(self.user)
+        self.projects[1].members.add(self.user)
+
+    def test_cursor_round_trip(self):
+        now = timezone.now().replace(microsecond=123456)
+        deadlines = [None, now, now, now + timedelta(days=1), now - timedelta(hours=3)]
+        expected = []
+        for i in range(24):
+            task = Task.objects.create(
+                title=f'Task {i}', project=self.projects[i % 2], assigned_to=self.user,
+                priority=PRIORITY_ORDER[i % 3], deadline=deadlines[i % len(deadlines)],
+            )
+            expected.append(task)
+        # Not in the queue: completed, or in a project the user is not a member of
+        Task.objects.create(title='Done', project=self.projects[0], assigned_to=self.user, completed_at=now)
+        Task.objects.create(title='Hidden', project=self.projects[2], assigned_to=self.user)
+        expected.sort(key=lambda task: (
+            PRIORITY_ORDER.index(task.priority), task.deadline is None, task.deadline or now, task.id
+        ))
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        seen, after = [], None
+        while True:
+            params = {'limit': 5, **({'after': after} if after else {})}
+            response = client.get('/api/tasks/mine/', params)
+            self.assertEqual(response.status_code, 200)
+            seen += [task['id'] for task in response.data['results']]
+            after = response.data['next_after']
+            if after is None:
+                break
+        self.assertEqual(seen, [task.id for task in expected])
 
-# Create your tests here.
+    def test_invalid_cursor(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get('/api/tasks/mine/', {'after': 'x'}).status_code, 400)
+        self.assertEqual(client.get('/api/tasks/mine/', {'limit': 0}).status_code, 400)
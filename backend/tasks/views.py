@@ -1,10 +1,17 @@
+from django.db import IntegrityError
+from django.db.models import Q
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from .models import Task
+from core.models import Project, Tombstone
+from core.sync import DeltaSyncMixin
+from . import schedule
+from .models import Task, TaskDependency
+from .queue import MY_TASKS_MAX_PAGE_SIZE, MY_TASKS_PAGE_SIZE, decode_cursor, my_tasks
 from .serializers import TaskSerializer
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(DeltaSyncMixin, viewsets.ModelViewSet):
     queryset = Task.objects.none()
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -12,14 +19,140 @@ class TaskViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         project_id = self.request.query_params.get('project')
         if project_id:
-            if self.request.user in self.request.user.organization.admins.all():
-                return Task.objects.filter(project_id=project_id)
-            return Task.objects.filter(
-                project_id=project_id,
-                project__members=self.request.user
-            )
+            user = self.request.user
+            tasks = Task.tenant.for_user(user).filter(project_id=project_id)
+            if user.organization_id is not None and user.organization.admins.filter(id=user.id).exists():
+                return tasks
+            return tasks.filter(project__members=user)
         return Task.objects.none()
 
+    def get_tombstones(self):
+        project_id = self.request.query_params.get('project')
+        user = self.request.user
+        if not project_id or user.organization is None:
+            return Tombstone.objects.none()
+        if user not in user.organization.admins.all() and not Project.objects.filter(
+            id=project_id, members=user
+        ).exists():
+            return Tombstone.objects.none()
+        return Tombstone.objects.filter(
+            kind='task', project_id=project_id, organization_id=user.organization_id
+        )
+
+    def get_project(self, project_id):
+        """Проект, доступный пользователю: участник или администратор организации"""
+        user = self.request.user
+        if user.organization_id is None:
+            return None
+        return Project.objects.filter(id=project_id, organization_id=user.organization_id).filter(
+            Q(members=user) | Q(organization_id__in=user.administered_organization_ids)
+        ).distinct().first()
+
+    @action(detail=False, methods=['get'])
+    def graph(self, request):
+        """
+        GET /api/tasks/graph/?project=<id>&after=<id>&limit=<n>&critical=1
+
+        Граф зависимостей проекта с расписанием по методу критического пути (в днях
+        от начала проекта): ранние и поздние старт и финиш, резерв, критичность.
+        Страница — задачи по id, edges — [predecessor, successor] для задач страницы.
+        critical=1 — только задачи критического пути.
+        """
+        try:
+            project_id = int(request.query_params.get('project', ''))
+            after = int(request.query_params['after']) if request.query_params.get('after') else None
+            limit = min(
+                int(request.query_params.get('limit', schedule.TASK_GRAPH_PAGE_SIZE)),
+                schedule.TASK_GRAPH_MAX_PAGE_SIZE
+            )
+        except ValueError:
+            return Response({"error": "Некорректные project, after или limit"}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({"error": "limit должен быть положительным"}, status=status.HTTP_400_BAD_REQUEST)
+        project = self.get_project(project_id)
+        if project is None:
+            return Response({"error": "Проект не найден"}, status=status.HTTP_404_NOT_FOUND)
+
+        end, tasks, edges, next_after = schedule.graph_page(
+            project.id, after=after, limit=limit, critical=request.query_params.get('critical') == '1'
+        )
+        return Response({'project_end': end, 'tasks': tasks, 'edges': edges, 'next_after': next_after})
+
+    @action(detail=False, methods=['post', 'delete'])
+    def dependencies(self, request):
+        """
+        POST   /api/tasks/dependencies/ {"predecessor": <id>, "successor": <id>} — добавить зависимость
+        DELETE /api/tasks/dependencies/ {"predecessor": <id>, "successor": <id>} — убрать
+
+        successor начинается после окончания predecessor. Ребро, замыкающее цикл,
+        отклоняется; расписание пересчитывается только для затронутых задач.
+        """
+        try:
+            predecessor_id = int(request.data.get('predecessor'))
+            successor_id = int(request.data.get('successor'))
+        except (TypeError, ValueError):
+            return Response({"error": "Укажите predecessor и successor"}, status=status.HTTP_400_BAD_REQUEST)
+        tasks = {
+            task.id: task
+            for task in Task.tenant.for_user(request.user).filter(id__in=[predecessor_id, successor_id])
+        }
+        predecessor, successor = tasks.get(predecessor_id), tasks.get(successor_id)
+        if predecessor is None or successor is None or self.get_project(predecessor.project_id) is None:
+            return Response({"error": "Задача не найдена"}, status=status.HTTP_404_NOT_FOUND)
+
+        if request.method == 'DELETE':
+            edge = TaskDependency.objects.filter(predecessor=predecessor, successor=successor).first()
+            if edge is None:
+                return Response({"error": "Такой зависимости нет"}, status=status.HTTP_404_NOT_FOUND)
+            schedule.remove_dependency(edge)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        try:
+            schedule.add_dependency(predecessor, successor)
+        except schedule.CycleError:
+            return Response({"error": "Зависимость замкнула бы цикл"}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
+            return Response({"error": "Такая зависимость уже есть"}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {'predecessor': predecessor.id, 'successor': successor.id, 'project_end': schedule.project_end(predecessor.project_id)},
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=False, methods=['get'])
+    def mine(self, request):
+        """
+        GET /api/tasks/mine/?after=<курсор>&limit=<n>
+
+        Открытые задачи пользователя из всех доступных проектов одним запросом:
+        high → medium → low, внутри — по дедлайну. Следующая страница — after=next_after.
+        """
+        try:
+            after = decode_cursor(request.query_params['after']) if request.query_params.get('after') else None
+            limit = min(int(request.query_params.get('limit', MY_TASKS_PAGE_SIZE)), MY_TASKS_MAX_PAGE_SIZE)
+        except (ValueError, OverflowError):
+            return Response({"error": "Некорректные after или limit"}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({"error": "limit должен быть положительным"}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows, next_after = my_tasks(request.user, after=after, limit=limit)
+        return Response({
+            'results': [
+                {
+                    'id': row['id'],
+                    'title': row['title'],
+                    'description': row['description'],
+                    'priority': row['priority'],
+                    'deadline': row['deadline'],
+                    'project': {'id': row['project_id'], 'name': row['project__name']},
+                    'created_at': row['created_at'],
+                }
+                for row in rows
+            ],
+            'next_after': next_after,
+        })
+
     def perform_create(self, serializer):
         if self.request.user not in self.request.user.organization.admins.all():
             return Response(
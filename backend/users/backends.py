@@ -0,0 +1,23 @@
+from django.contrib.auth.backends import ModelBackend
+
+from .hashing import hash_password, verify_password
+from .models import CustomUser
+
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend, проверяющий пароль в ограниченном пуле users.hashing"""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(CustomUser.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = CustomUser._default_manager.get_by_natural_key(username)
+        except CustomUser.DoesNotExist:
+            # Hash anyway so a missing user costs the same time as a wrong password
+            hash_password(password)
+            return None
+        if verify_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,13 @@
+from django.core.mail import EmailMessage
+
+
+def welcome_email(user):
+    """Письмо сотруднику, заведённому импортом: войти можно с паролем из файла импорта"""
+    organization = user.organization.name if user.organization_id else ''
+    return EmailMessage(
+        'Добро пожаловать!',
+        f"Вы были добавлены в организацию {organization}. "
+        f"Войдите с email {user.email} и паролем, который выдал администратор.",
+        'admin@statusapp.com',
+        [user.email],
+    )
@@ -0,0 +1,17 @@
+"""
+Функции процессов пула хеширования импорта. Отдельный модуль без моделей:
+процесс, запущенный через spawn, импортирует его до django.setup().
+"""
+import os
+
+import django
+from django.contrib.auth.hashers import make_password
+
+
+def init_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+def hash_passwords(passwords):
+    return [make_password(password) for password in passwords]
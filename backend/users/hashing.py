@@ -0,0 +1,133 @@
+"""
+Ограниченный пул для хеширования и проверки паролей.
+
+PBKDF2 в hashlib отпускает GIL, поэтому потоки пула действительно занимают
+отдельные ядра, а их число ограничивает, сколько CPU уходит на пароли
+одновременно. Очередь тоже ограничена: если она заполнена, запрос сразу
+получает 503 с Retry-After, вместо того чтобы занимать поток воркера и
+отнимать процессор у дешёвых эндпоинтов.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import CustomUser
+
+
+class PasswordPoolBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Сервер перегружен входами, повторите попытку через секунду"
+    default_code = 'password_pool_busy'
+    wait = 1  # DRF turns this into a Retry-After header
+
+
+class PasswordPool:
+    def __init__(self, workers, max_pending, timeout, window=2048):
+        self.workers = workers
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password') if workers else None
+        self._slots = threading.BoundedSemaphore(max_pending) if workers else None
+        self._lock = threading.Lock()
+        self._queue_wait = deque(maxlen=window)
+        self._hash_time = deque(maxlen=window)
+        self._counters = {'completed': 0, 'rejected': 0, 'timed_out': 0}
+
+    def run(self, func, *args):
+        """Выполняет func(*args) в пуле и ждёт результат в текущем потоке"""
+        if self._executor is None:
+            return func(*args)
+
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise PasswordPoolBusy()
+
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished = time.perf_counter()
+                self._slots.release()
+                with self._lock:
+                    self._queue_wait.append(started - submitted)
+                    self._hash_time.append(finished - started)
+                    self._counters['completed'] += 1
+
+        future = self._executor.submit(job)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            if future.cancel():
+                # The job never started, so its finally block will not free the slot
+                self._slots.release()
+            self._count('timed_out')
+            raise PasswordPoolBusy()
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self):
+        with self._lock:
+            queue_wait = sorted(self._queue_wait)
+            hash_time = sorted(self._hash_time)
+            counters = dict(self._counters)
+
+        def pct(values, p):
+            if not values:
+                return None
+            return round(values[min(len(values) - 1, int(p / 100 * len(values)))] * 1000, 2)
+
+        return {
+            'workers': self.workers,
+            **counters,
+            'queue_wait_ms': {'p50': pct(queue_wait, 50), 'p99': pct(queue_wait, 99)},
+            'hash_time_ms': {'p50': pct(hash_time, 50), 'p99': pct(hash_time, 99)},
+        }
+
+
+pool = PasswordPool(
+    workers=settings.PASSWORD_POOL_WORKERS,
+    max_pending=settings.PASSWORD_POOL_MAX_PENDING,
+    timeout=settings.PASSWORD_POOL_TIMEOUT,
+)
+
+
+def hash_password(raw_password):
+    return pool.run(make_password, raw_password)
+
+
+def verify_password(user, raw_password):
+    """
+    Проверка пароля в пуле. Как и AbstractBaseUser.check_password, обновляет
+    хеш при смене алгоритма или числа итераций, но сохраняет его в потоке запроса.
+    """
+    if not pool.run(check_password, raw_password, user.password):
+        return False
+    try:
+        current = identify_hasher(user.password)
+    except ValueError:
+        return True
+    preferred = get_hasher('default')
+    if current.algorithm != preferred.algorithm or preferred.must_update(user.password):
+        user.password = hash_password(raw_password)
+        user.save(update_fields=['password'])
+    return True
+
+
+def create_user(password, **fields):
+    """CustomUser.objects.create_user, но хеш считается в пуле"""
+    fields['email'] = CustomUser.objects.normalize_email(fields.get('email'))
+    fields['username'] = CustomUser.normalize_username(fields['username'])
+    user = CustomUser(**fields)
+    user.password = hash_password(password)
+    user.save()
+    return user
@@ -0,0 +1,231 @@
+import csv
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.mail import get_connection
+from django.core.validators import validate_email
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from changes.feed import record_many, user_payload
+from changes.models import ChangeEvent
+from . import hash_workers
+from .emails import welcome_email
+from .models import CustomUser, UserImportJob
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = getattr(settings, 'USER_IMPORT_CHUNK_SIZE', 500)
+IMPORT_WORKERS = getattr(settings, 'USER_IMPORT_WORKERS', None) or os.cpu_count() or 1
+IMPORT_STALE_AFTER = getattr(settings, 'USER_IMPORT_STALE_AFTER', 3600)
+# Below this many passwords a process pool costs more than it saves
+PARALLEL_THRESHOLD = 50
+
+
+def hash_passwords(passwords, workers=IMPORT_WORKERS, chunk_size=IMPORT_CHUNK_SIZE):
+    """Хеширует пароли пачками в пуле процессов; порядок сохраняется"""
+    if workers <= 1 or len(passwords) < PARALLEL_THRESHOLD:
+        return hash_workers.hash_passwords(passwords)
+
+    # Small chunks keep every worker busy; larger ones save on IPC
+    per_chunk = max(1, min(chunk_size, len(passwords) // (workers * 4) or 1))
+    chunks = [passwords[i:i + per_chunk] for i in range(0, len(passwords), per_chunk)]
+    # spawn, not fork: the caller may be a multi-threaded server whose locks a fork would copy mid-use
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=hash_workers.init_worker,
+        initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'backend.settings'),)
+    ) as executor:
+        return [hashed for chunk in executor.map(hash_workers.hash_passwords, chunks) for hashed in chunk]
+
+
+def read_csv(file):
+    """Принимает текстовый или бинарный файл с колонками email, username, password"""
+    content = file.read()
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+def _existing(field, values):
+    found = set()
+    values = list(values)
+    for i in range(0, len(values), IMPORT_CHUNK_SIZE):
+        found.update(
+            CustomUser.objects.filter(**{f'{field}__in': values[i:i + IMPORT_CHUNK_SIZE]})
+            .values_list(field, flat=True)
+        )
+    return found
+
+
+def validate_rows(rows):
+    """Возвращает (валидные строки, ошибки). Номера строк считаются с заголовком"""
+    valid, errors = [], []
+    emails = {(row.get('email') or '').strip() for row in rows}
+    usernames = {
+        (row.get('username') or '').strip() or (row.get('email') or '').split('@')[0].strip()
+        for row in rows
+    }
+    taken_emails = _existing('email', emails)
+    taken_usernames = _existing('username', usernames)
+
+    for line, row in enumerate(rows, start=2):
+        email = (row.get('email') or '').strip()
+        username = (row.get('username') or '').strip() or email.split('@')[0]
+        password = row.get('password') or ''
+        problems = []
+
+        try:
+            validate_email(email)
+        except ValidationError:
+            problems.append("Некорректный email")
+        if email in taken_emails:
+            problems.append("Пользователь с таким email уже существует")
+        if not username:
+            problems.append("Не указан username")
+        elif username in taken_usernames:
+            problems.append("Пользователь с таким username уже существует")
+        if not password:
+            # Nothing else would let an imported user sign in
+            problems.append("Не указан пароль")
+        else:
+            try:
+                validate_password(password, CustomUser(username=username, email=email))
+            except ValidationError as e:
+                problems.extend(e.messages)
+
+        if problems:
+            errors.append({'row': line, 'email': email, 'errors': problems})
+            continue
+        # Later duplicates inside the same file are reported against the first one
+        taken_emails.add(email)
+        taken_usernames.add(username)
+        valid.append({'row': line, 'email': email, 'username': username, 'password': password})
+    return valid, errors
+
+
+def _insert_chunk(users, rows, errors):
+    try:
+        with transaction.atomic():
+            return CustomUser.objects.bulk_create(users)
+    except IntegrityError:
+        pass
+    # Someone registered a clashing user meanwhile: insert one by one to pin the row
+    created = []
+    for user, row in zip(users, rows):
+        try:
+            with transaction.atomic():
+                CustomUser.objects.bulk_create([user])
+            created.append(user)
+        except IntegrityError:
+            errors.append({'row': row['row'], 'email': row['email'], 'errors': ["Конфликт при сохранении"]})
+    return created
+
+
+def _send_welcome(users):
+    """Приветственные письма пачки одним SMTP-соединением; возвращает число неотправленных"""
+    messages = [welcome_email(user) for user in users]
+    try:
+        get_connection().send_messages(messages)
+    except Exception:
+        # The users exist already: a mail outage must not fail the import
+        logger.exception("Не удалось отправить приветственные письма (%s)", len(messages))
+        return len(messages)
+    return 0
+
+
+def import_users(rows, organization, workers=IMPORT_WORKERS, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Импорт пользователей в организацию: валидация, параллельное хеширование,
+    bulk_create пачками. bulk_create не шлёт post_save, поэтому приветственные
+    письма уходят пачкой на каждую порцию, а события журнала пишутся пачкой.
+    """
+    valid, errors = validate_rows(rows)
+    hashed = iter(hash_passwords([row['password'] for row in valid], workers, chunk_size))
+
+    created = welcome_failed = 0
+    for i in range(0, len(valid), chunk_size):
+        chunk = valid[i:i + chunk_size]
+        users = [
+            CustomUser(
+                username=row['username'],
+                email=row['email'],
+                password=next(hashed),
+                organization=organization,
+                is_active=True,
+            )
+            for row in chunk
+        ]
+        saved = _insert_chunk(users, chunk, errors)
+        created += len(saved)
+        record_many([
+            ChangeEvent(
+                organization_id=organization.id, kind='status', action='created',
+                object_id=user.id, actor_id=user.id, payload=user_payload(user)
+            )
+            for user in saved if user.id is not None
+        ])
+        welcome_failed += _send_welcome(saved)
+
+    errors.sort(key=lambda error: error['row'])
+    return {'created': created, 'errors': errors, 'welcome_failed': welcome_failed}
+
+
+_jobs_lock = threading.Lock()
+_jobs = None
+_jobs_pid = None
+
+
+def _executor():
+    # One import at a time per process (each already uses every CPU); recreated after fork
+    global _jobs, _jobs_pid
+    if _jobs_pid != os.getpid():
+        with _jobs_lock:
+            if _jobs_pid != os.getpid():
+                _jobs = ThreadPoolExecutor(max_workers=1, thread_name_prefix='user-import')
+                _jobs_pid = os.getpid()
+    return _jobs
+
+
+def _run_job(job_id, rows):
+    try:
+        job = UserImportJob.objects.select_related('organization').get(pk=job_id)
+        UserImportJob.objects.filter(pk=job_id).update(status='running')
+        try:
+            report = import_users(rows, job.organization)
+        except Exception:
+            logger.exception("Импорт сотрудников %s завершился ошибкой", job_id)
+            UserImportJob.objects.filter(pk=job_id).update(status='failed', finished_at=timezone.now())
+            return
+        UserImportJob.objects.filter(pk=job_id).update(status='done', report=report, finished_at=timezone.now())
+    finally:
+        connection.close()
+
+
+def start_import(rows, organization, user):
+    """Ставит импорт в фоновую очередь процесса; возвращает UserImportJob для опроса статуса"""
+    job = UserImportJob.objects.create(organization=organization, created_by=user, rows=len(rows))
+    # After commit: the worker thread must see the job row
+    transaction.on_commit(lambda: _executor().submit(_run_job, job.id, rows))
+    return job
+
+
+def fail_stale_jobs(stale_after=IMPORT_STALE_AFTER):
+    """
+    Очередь импорта живёт в памяти процесса: после рестарта или деплоя задача
+    остаётся pending/running навсегда. Помечает такие задачи старше stale_after
+    секунд как failed; строки файла не сохраняются, поэтому импорт нужно повторить.
+    """
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    return UserImportJob.objects.filter(status__in=['pending', 'running'], created_at__lt=cutoff).update(
+        status='failed', finished_at=timezone.now()
+    )
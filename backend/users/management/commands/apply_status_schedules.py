@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from users.schedules import SCHEDULE_BATCH_SIZE, apply_due
+
+
+class Command(BaseCommand):
+    help = "Применяет созревшие запланированные статусы (запускать раз в минуту)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=SCHEDULE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Обработано записей расписания: {apply_due(batch_size=options['batch_size'])}")
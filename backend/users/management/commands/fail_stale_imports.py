@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from users.importer import IMPORT_STALE_AFTER, fail_stale_jobs
+
+
+class Command(BaseCommand):
+    help = "Помечает как failed задачи импорта, потерянные при рестарте (запускать раз в несколько минут)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-after', type=int, default=IMPORT_STALE_AFTER, metavar='SECONDS')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Помечено как failed: {fail_stale_jobs(options['stale_after'])}")
@@ -0,0 +1,40 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Organization
+from users.importer import IMPORT_CHUNK_SIZE, IMPORT_WORKERS, import_users, read_csv
+
+
+class Command(BaseCommand):
+    help = "Импорт сотрудников из CSV (email, username, password) в организацию"
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--organization', type=int, required=True, metavar='ORG_ID')
+        parser.add_argument('--workers', type=int, default=IMPORT_WORKERS)
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument('--report', metavar='PATH', help="CSV с ошибками по строкам")
+
+    def handle(self, *args, **options):
+        try:
+            organization = Organization.objects.get(pk=options['organization'])
+        except Organization.DoesNotExist:
+            raise CommandError(f"Организация {options['organization']} не найдена")
+
+        with open(options['csv_path'], encoding='utf-8-sig') as file:
+            rows = read_csv(file)
+
+        report = import_users(rows, organization, options['workers'], options['chunk_size'])
+
+        if options['report']:
+            with open(options['report'], 'w', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                writer.writerow(['row', 'email', 'errors'])
+                for error in report['errors']:
+                    writer.writerow([error['row'], error['email'], '; '.join(error['errors'])])
+        else:
+            for error in report['errors']:
+                self.stderr.write(f"Строка {error['row']} ({error['email']}): {'; '.join(error['errors'])}")
+
+        self.stdout.write(f"Создано: {report['created']}, ошибок: {len(report['errors'])}")
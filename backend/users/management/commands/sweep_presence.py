@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from users.presence import sweep
+
+
+class Command(BaseCommand):
+    help = "Переводит в offline пользователей без heartbeat дольше PRESENCE_TIMEOUT (запускать раз в минуту)"
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Переведено в offline: {sweep()}")
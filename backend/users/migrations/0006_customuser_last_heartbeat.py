@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_alter_invitation_expires_at_alter_invitation_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='last_heartbeat',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        # Users who are online now get a last heartbeat, so the first sweep can take them offline too
+        migrations.RunSQL(
+            "UPDATE users_customuser SET last_heartbeat = last_status_change WHERE status <> 'offline'",
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['status', 'last_heartbeat'], name='users_status_heartbeat_idx'),
+        ),
+    ]
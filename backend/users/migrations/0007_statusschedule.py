@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_customuser_last_heartbeat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('online', 'Online'), ('offline', 'Offline'), ('lunch', 'Обед'), ('meeting', 'На встрече'), ('vacation', 'Отпуск')], max_length=10)),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+                ('recurrence', models.CharField(blank=True, choices=[('', 'Однократно'), ('daily', 'Каждый день'), ('weekdays', 'По будням'), ('weekly', 'Каждую неделю')], default='', max_length=10)),
+                ('recur_until', models.DateField(blank=True, null=True)),
+                ('time_zone', models.CharField(default='UTC', max_length=64)),
+                ('in_progress', models.BooleanField(default=False)),
+                ('previous_status', models.CharField(blank=True, default='', max_length=10)),
+                ('next_run_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_schedules', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('next_run_at__isnull', False)), fields=['next_run_at'], name='users_schedule_due_idx')],
+            },
+        ),
+    ]
@@ -1,8 +1,12 @@
 import secrets
+from datetime import timedelta
+from zoneinfo import ZoneInfo
 
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
+from django.utils.functional import cached_property
 
 
 class CustomUser(AbstractUser):
@@ -19,6 +23,10 @@ class CustomUser(AbstractUser):
         default='offline'
     )
     last_status_change = models.DateTimeField(auto_now_add=True)
+    # Последний сигнал жизни от клиента; по нему presence.sweep переводит ушедших в offline
+    last_heartbeat = models.DateTimeField(null=True, blank=True)
+    # Счётчик непрочитанных уведомлений; ведёт notifications.notify
+    unread_notifications = models.PositiveIntegerField(default=0)
 
     organization = models.ForeignKey(
         'core.Organization',  # Строковая ссылка!
@@ -49,8 +57,26 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return f"{self.username} ({self.organization})"
 
+    @cached_property
+    def administered_organization_ids(self):
+        """
+        Id организаций, где пользователь администратор. Кэшируется на объекте,
+        то есть на время запроса — и всего пакета /api/batch/, где объект общий.
+        """
+        return frozenset(self.admin_of_organizations.values_list('id', flat=True))
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Статус на момент загрузки: по нему сигналы понимают, что статус сменился
+        instance.loaded_status = instance.__dict__.get('status')
+        return instance
+
     class Meta:
         db_table = 'users_customuser'
+        indexes = [
+            models.Index(fields=['status', 'last_heartbeat'], name='users_status_heartbeat_idx'),
+        ]
 class Invitation(models.Model):
     email = models.EmailField()
     token = models.CharField(max_length=64, unique=True, default=secrets.token_urlsafe(32))
@@ -65,4 +91,82 @@ class Invitation(models.Model):
     is_used = models.BooleanField(default=False)
 
     def __str__(self):
-        return f"Приглашение для {self.email} в {self.organization.name}"
\ No newline at end of file
+        return f"Приглашение для {self.email} в {self.organization.name}"
+
+class StatusSchedule(models.Model):
+    """
+    Запланированный статус: разовый интервал (отпуск) или повторяющийся
+    (ежедневная планёрка). starts_at/ends_at — ближайшее или текущее вхождение;
+    next_run_at — момент следующего перехода, по нему планировщик находит
+    созревшие записи через частичный индекс.
+    """
+    RECURRENCE_CHOICES = [
+        ('', 'Однократно'),
+        ('daily', 'Каждый день'),
+        ('weekdays', 'По будням'),
+        ('weekly', 'Каждую неделю'),
+    ]
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='status_schedules')
+    status = models.CharField(max_length=10, choices=CustomUser.STATUS_CHOICES)
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+    recurrence = models.CharField(max_length=10, choices=RECURRENCE_CHOICES, blank=True, default='')
+    recur_until = models.DateField(null=True, blank=True)
+    # Повторения считаются по местному времени, чтобы встреча в 10:00 не съезжала при переходе на летнее время
+    time_zone = models.CharField(max_length=64, default='UTC')
+    in_progress = models.BooleanField(default=False)
+    previous_status = models.CharField(max_length=10, blank=True, default='')
+    next_run_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['next_run_at'], name='users_schedule_due_idx', condition=Q(next_run_at__isnull=False)
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.status} {self.starts_at:%Y-%m-%d %H:%M}"
+
+    def reschedule(self):
+        self.next_run_at = self.ends_at if self.in_progress else self.starts_at
+
+    def advance(self):
+        """Переходит к следующему вхождению; False, если повторений больше нет"""
+        if not self.recurrence:
+            return False
+        zone = ZoneInfo(self.time_zone)
+        starts, ends = self.starts_at.astimezone(zone), self.ends_at.astimezone(zone)
+        step = 7 if self.recurrence == 'weekly' else 1
+        while True:
+            # Aware arithmetic in a ZoneInfo keeps the wall-clock time across DST changes
+            starts, ends = starts + timedelta(days=step), ends + timedelta(days=step)
+            if self.recurrence != 'weekdays' or starts.weekday() < 5:
+                break
+        if self.recur_until and starts.date() > self.recur_until:
+            return False
+        self.starts_at, self.ends_at = starts, ends
+        return True
+
+
+class UserImportJob(models.Model):
+    """
+    Импорт сотрудников из CSV через API: выполняется в фоне (users.importer),
+    клиент опрашивает статус. Сами строки файла (с паролями) в базу не пишутся.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'В очереди'),
+        ('running', 'Выполняется'),
+        ('done', 'Готово'),
+        ('failed', 'Ошибка'),
+    ]
+
+    organization = models.ForeignKey('core.Organization', on_delete=models.CASCADE, related_name='user_imports')
+    created_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, related_name='+')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    rows = models.PositiveIntegerField(default=0)
+    # {'created': n, 'errors': [...], 'welcome_failed': n}, как у import_users
+    report = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
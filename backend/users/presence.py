@@ -0,0 +1,69 @@
+"""
+Присутствие по heartbeat.
+
+Клиент раз в PRESENCE_HEARTBEAT_INTERVAL секунд вызывает heartbeat/, а
+периодический sweep() одним UPDATE переводит в offline тех, от кого сигнала
+не было дольше PRESENCE_TIMEOUT. Кто ещё ни разу не присылал heartbeat,
+отсчитывается от last_status_change. Условие (status, last_heartbeat) покрыто
+индексом users_status_heartbeat_idx, поэтому sweep читает только просроченные
+строки, а не всю таблицу.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from changes.feed import record_many
+from changes.models import ChangeEvent
+from .models import CustomUser, StatusSchedule
+
+PRESENCE_HEARTBEAT_INTERVAL = getattr(settings, 'PRESENCE_HEARTBEAT_INTERVAL', 60)
+PRESENCE_TIMEOUT = getattr(settings, 'PRESENCE_TIMEOUT', 180)
+# Vacation is set deliberately and does not depend on an open tab
+PRESENCE_EXPIRING_STATUSES = getattr(settings, 'PRESENCE_EXPIRING_STATUSES', ('online', 'lunch', 'meeting'))
+
+
+def heartbeat(user, now=None):
+    """
+    Отмечает пользователя живым. Пишет в базу не чаще раза в половину интервала:
+    last_heartbeat уже загружен вместе с пользователем при аутентификации.
+    """
+    now = now or timezone.now()
+    if user.last_heartbeat and now - user.last_heartbeat < timedelta(seconds=PRESENCE_HEARTBEAT_INTERVAL / 2):
+        return False
+    CustomUser.objects.filter(pk=user.pk).update(last_heartbeat=now)
+    user.last_heartbeat = now
+    return True
+
+
+def sweep(now=None):
+    """Переводит в offline всех, чей heartbeat истёк; возвращает их число"""
+    now = now or timezone.now()
+    statuses = list(PRESENCE_EXPIRING_STATUSES)
+    placeholders = ', '.join(['%s'] * len(statuses))
+    deadline = now - timedelta(seconds=PRESENCE_TIMEOUT)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {CustomUser._meta.db_table} SET status = %s, last_status_change = %s "
+            f"WHERE status IN ({placeholders}) "
+            # No heartbeat yet (status set by PATCH or a schedule): the status change counts as one.
+            # Two branches rather than COALESCE leave last_heartbeat usable in users_status_heartbeat_idx
+            f"AND (last_heartbeat < %s OR (last_heartbeat IS NULL AND last_status_change < %s)) "
+            # A scheduled meeting holds even with the tab closed
+            f"AND NOT EXISTS (SELECT 1 FROM {StatusSchedule._meta.db_table} s "
+            f"WHERE s.user_id = {CustomUser._meta.db_table}.id AND s.in_progress) "
+            f"RETURNING id, username, organization_id",
+            ['offline', now, *statuses, deadline, deadline]
+        )
+        expired = cursor.fetchall()
+        # Bulk UPDATE skips post_save, so the change feed gets its events here
+        record_many([
+            ChangeEvent(
+                organization_id=organization_id, kind='status', action='updated', object_id=user_id,
+                actor_id=user_id,
+                payload={'id': user_id, 'username': username, 'status': 'offline', 'last_status_change': now},
+            )
+            for user_id, username, organization_id in expired
+        ])
+    return len(expired)
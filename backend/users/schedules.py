@@ -0,0 +1,91 @@
+"""
+Применение запланированных статусов.
+
+apply_due() берёт созревшие записи пачками по индексу next_run_at, один раз
+читает текущие статусы их пользователей и записывает итог одним UPDATE на
+каждый целевой статус. По окончании интервала статус возвращается к прежнему,
+только если пользователь не сменил его сам.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from changes.feed import record_many
+from changes.models import ChangeEvent
+from .models import CustomUser, StatusSchedule
+
+SCHEDULE_BATCH_SIZE = getattr(settings, 'STATUS_SCHEDULE_BATCH_SIZE', 500)
+
+
+def _transition(schedule, statuses, now):
+    """Один переход записи: меняет statuses[user_id] и саму запись"""
+    user_id = schedule.user_id
+    if not schedule.in_progress:
+        # A start that is already over (the scheduler was down) does not flip anything
+        if schedule.ends_at > now:
+            schedule.previous_status = statuses[user_id]
+            statuses[user_id] = schedule.status
+            schedule.in_progress = True
+            schedule.next_run_at = schedule.ends_at
+            return
+    elif statuses[user_id] == schedule.status:
+        statuses[user_id] = schedule.previous_status or 'offline'
+
+    schedule.in_progress = False
+    schedule.previous_status = ''
+    schedule.next_run_at = schedule.starts_at if schedule.advance() else None
+
+
+def _apply_batch(now, batch_size):
+    with transaction.atomic():
+        due = list(
+            StatusSchedule.objects.filter(next_run_at__lte=now)
+            .order_by('next_run_at')
+            .select_for_update(skip_locked=True)[:batch_size]
+        )
+        if not due:
+            return 0
+
+        users = {
+            user_id: (status, organization_id, username)
+            for user_id, status, organization_id, username in
+            CustomUser.objects.select_for_update()
+            .filter(pk__in={schedule.user_id for schedule in due})
+            .values_list('id', 'status', 'organization_id', 'username')
+        }
+        statuses = {user_id: values[0] for user_id, values in users.items()}
+        for schedule in due:
+            # A missed recurring rule may owe several transitions: catch up to now
+            while schedule.next_run_at is not None and schedule.next_run_at <= now:
+                _transition(schedule, statuses, now)
+
+        changed = defaultdict(list)
+        for user_id, status in statuses.items():
+            if status != users[user_id][0]:
+                changed[status].append(user_id)
+        for status, user_ids in changed.items():
+            CustomUser.objects.filter(pk__in=user_ids).update(status=status, last_status_change=now)
+
+        StatusSchedule.objects.bulk_update(due, ['starts_at', 'ends_at', 'in_progress', 'previous_status', 'next_run_at'])
+        record_many([
+            ChangeEvent(
+                organization_id=users[user_id][1], kind='status', action='updated', object_id=user_id,
+                actor_id=user_id,
+                payload={'id': user_id, 'username': users[user_id][2], 'status': status, 'last_status_change': now},
+            )
+            for status, user_ids in changed.items() for user_id in user_ids
+        ])
+    return len(due)
+
+
+def apply_due(now=None, batch_size=SCHEDULE_BATCH_SIZE):
+    """Применяет все созревшие переходы; возвращает число обработанных записей"""
+    now = now or timezone.now()
+    processed = 0
+    while True:
+        count = _apply_batch(now, batch_size)
+        processed += count
+        if count < batch_size:
+            return processed
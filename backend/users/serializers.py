@@ -1,9 +1,14 @@
+from datetime import timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.utils import timezone
 from rest_framework import serializers
-from .models import CustomUser, Invitation
+from .models import CustomUser, Invitation, StatusSchedule
 from core.models import Organization
+from core.sparse import SparseFieldsMixin
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     organization_name = serializers.CharField(source='organization.name', read_only=True)
 
     class Meta:
@@ -36,6 +41,15 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
+class CurrentUserSerializer(UserSerializer):
+    """Пользователь из запроса, а не атрибут сериализуемого объекта"""
+    detached = True
+
+    def get_attribute(self, instance):
+        request = self.context.get('request')
+        return request.user if request else None
+
+
 class InviteUserSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
@@ -67,4 +81,37 @@ class StatusSerializer(serializers.ModelSerializer):
 class UserStatusSerializer(serializers.ModelSerializer):
     class Meta:
         model = CustomUser
-        fields = ['id', 'username', 'email', 'status', 'last_status_change']
\ No newline at end of file
+        fields = ['id', 'username', 'email', 'status', 'last_status_change']
+
+class StatusScheduleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StatusSchedule
+        fields = [
+            'id', 'status', 'starts_at', 'ends_at', 'recurrence', 'recur_until', 'time_zone',
+            'in_progress', 'next_run_at', 'created_at'
+        ]
+        read_only_fields = ['in_progress', 'next_run_at', 'created_at']
+
+    def validate_time_zone(self, value):
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise serializers.ValidationError("Неизвестный часовой пояс")
+        return value
+
+    def validate(self, data):
+        starts_at = data.get('starts_at', getattr(self.instance, 'starts_at', None))
+        ends_at = data.get('ends_at', getattr(self.instance, 'ends_at', None))
+        recurrence = data.get('recurrence', getattr(self.instance, 'recurrence', ''))
+        if starts_at and ends_at and ends_at <= starts_at:
+            raise serializers.ValidationError({"ends_at": "Окончание должно быть позже начала"})
+        # An occurrence longer than its period would overlap the next one
+        if recurrence and ends_at - starts_at > timedelta(days=7 if recurrence == 'weekly' else 1):
+            raise serializers.ValidationError({"ends_at": "Повторяющийся интервал длиннее периода повторения"})
+        return data
+
+    def save(self, **kwargs):
+        schedule = super().save(**kwargs)
+        schedule.reschedule()
+        schedule.save(update_fields=['next_run_at'])
+        return schedule
@@ -0,0 +1,69 @@
+"""
+Обновление статуса с ограничением частоты.
+
+Если ведро 'status_update' пусто, обновление не отклоняется: последнее
+значение откладывается в памяти процесса и записывается таймером, как только
+появится токен. Все промежуточные значения при этом схлопываются в одно.
+"""
+import threading
+
+from django.db import connection
+from django.utils import timezone
+
+from core.throttling import acquire
+from .models import CustomUser
+
+_lock = threading.Lock()
+_pending = {}  # user_id -> (status, changed_at)
+
+
+def _apply(user, new_status, changed_at):
+    user.status = new_status
+    user.last_status_change = changed_at
+    user.last_heartbeat = changed_at
+    # Only these columns: a full-row save would write back a stale unread_notifications
+    user.save(update_fields=['status', 'last_status_change', 'last_heartbeat'])
+
+
+def update_status(user, new_status):
+    """Возвращает 0, если статус записан сразу, иначе через сколько секунд он будет записан"""
+    changed_at = timezone.now()
+    wait = acquire(user, 'status_update')
+    with _lock:
+        if not wait:
+            # A fresh write supersedes whatever was waiting
+            _pending.pop(user.id, None)
+        else:
+            scheduled = user.id in _pending
+            _pending[user.id] = (new_status, changed_at)
+    if not wait:
+        _apply(user, new_status, changed_at)
+    elif not scheduled:
+        _schedule(user.id, wait)
+    return wait
+
+
+def _schedule(user_id, delay):
+    timer = threading.Timer(delay, _flush, args=(user_id,))
+    timer.daemon = True
+    timer.start()
+
+
+def _flush(user_id):
+    try:
+        user = CustomUser.objects.filter(pk=user_id).first()
+        if user is None:
+            with _lock:
+                _pending.pop(user_id, None)
+            return
+        wait = acquire(user, 'status_update')
+        if wait:
+            # Another process may share the bucket and have taken the token
+            _schedule(user_id, wait)
+            return
+        with _lock:
+            pending = _pending.pop(user_id, None)
+        if pending is not None:
+            _apply(user, *pending)
+    finally:
+        connection.close()
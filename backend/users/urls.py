@@ -5,28 +5,42 @@ from .views import (
     UserViewSet,
     RegisterView,
     InviteEmployeeView,
+    UserImportView,
+    UserImportStatusView,
+    PasswordPoolMetricsView,
     ValidateInviteView,
     RegisterByInviteView,
     ChangeStatusView,
     StatusUpdateView,
+    HeartbeatView,
+    StatusScheduleViewSet,
     TeamStatusView,
-    UserProfileView
+    UserProfileView,
+    team_status_async,
+    user_profile_async,
 )
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet, basename='users')
+router.register(r'status-schedules', StatusScheduleViewSet, basename='status-schedules')
 
 urlpatterns = [
     path('auth/register/', RegisterView.as_view(), name='register'),
     path('auth/login/', TokenObtainPairView.as_view(), name='login'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/password-pool/', PasswordPoolMetricsView.as_view(), name='password-pool-metrics'),
     path('profile/', UserProfileView.as_view(), name='profile'),
+    path('profile/async/', user_profile_async, name='profile-async'),
     path('status/', ChangeStatusView.as_view(), name='change_status'),
     path('invite/', InviteEmployeeView.as_view(), name='invite'),
+    path('import/', UserImportView.as_view(), name='user-import'),
+    path('import/<int:pk>/', UserImportStatusView.as_view(), name='user-import-status'),
     path('validate-invite/', ValidateInviteView.as_view(), name='validate-invite'),
     path('register-by-invite/', RegisterByInviteView.as_view(), name='register-by-invite'),
     path('team-status/', TeamStatusView.as_view(), name='team-status'),
+    path('team-status/async/', team_status_async, name='team-status-async'),
     path('update-status/', StatusUpdateView.as_view(), name='update-status'),
+    path('heartbeat/', HeartbeatView.as_view(), name='heartbeat'),
     path('organization/<int:org_id>/',
          UserViewSet.as_view({'get': 'organization_users'}),
          name='organization-users'),
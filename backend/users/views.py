@@ -1,11 +1,15 @@
+from django.http import JsonResponse
 from django.utils import timezone
+from django.views.decorators.http import require_GET
 from rest_framework import generics, permissions, status, viewsets
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.exceptions import ValidationError
 from django.core.mail import send_mail
 from django.conf import settings
+import csv
 import secrets
 import string
 from urllib.parse import quote, unquote
@@ -14,9 +18,16 @@ import logging
 
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import CustomUser, Invitation
-from .serializers import UserSerializer, StatusSerializer
+from audit import log as audit
+from .authentication import async_jwt_required
+from .hashing import PasswordPoolBusy, create_user, pool as password_pool
+from .importer import read_csv, start_import
+from .models import CustomUser, Invitation, UserImportJob
+from .serializers import UserSerializer, StatusSerializer, StatusScheduleSerializer
+from .presence import PRESENCE_HEARTBEAT_INTERVAL, heartbeat
+from .status import update_status
 from core.models import Organization
+from core.sparse import SparseFieldsetMixin
 
 logger = logging.getLogger(__name__)
 
@@ -25,16 +36,17 @@ def generate_invite_token():
     alphabet = string.ascii_letters + string.digits
     return ''.join(secrets.choice(alphabet) for _ in range(40))
 
-class UserViewSet(viewsets.ModelViewSet):
-    queryset = CustomUser.objects.all()
+class UserViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = CustomUser.objects.select_related('organization')
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    sparse_actions = ('list', 'retrieve', 'organization_users')
 
     @action(detail=False, methods=['get'], url_path='organization/(?P<org_id>\d+)')
     def organization_users(self, request, org_id=None):
         if not org_id:
             return Response({"error": "Organization ID is required"}, status=status.HTTP_400_BAD_REQUEST)
-        users = CustomUser.objects.filter(organization_id=org_id)
+        users = self.shrink_queryset(self.get_queryset().filter(organization_id=org_id))
         if not users.exists():
             return Response({"error": "No users found in this organization"}, status=status.HTTP_404_NOT_FOUND)
         serializer = self.get_serializer(users, many=True)
@@ -50,7 +62,7 @@ class RegisterView(generics.CreateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        user = CustomUser.objects.create_user(
+        user = create_user(
             username=request.data['username'],
             email=request.data['email'],
             password=request.data['password'],
@@ -137,6 +149,10 @@ class InviteEmployeeView(APIView):
                 </a>
                 <p><small>Ссылка действительна 7 дней</small></p>"""
             )
+            # Only now: a failed send deletes the invitation, and the log must not keep what never happened
+            audit.record(
+                request, invitation.organization_id, 'invitation_created', 'invitation', invitation.id, email=email
+            )
 
             return Response(
                 {"status": "Приглашение отправлено"},
@@ -151,6 +167,67 @@ class InviteEmployeeView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+class UserImportView(APIView):
+    """
+    POST /api/users/import/ — CSV (email, username, password) в поле file.
+    Импорт идёт в фоне: ответ 202 с id, статус и отчёт — GET /api/users/import/<id>/.
+    Очередь в памяти процесса: задачу, прерванную рестартом, команда
+    fail_stale_imports через USER_IMPORT_STALE_AFTER помечает как failed — файл
+    нужно загрузить снова (уже созданные сотрудники попадут в отчёт как дубликаты).
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        organization = request.user.organization
+        if organization is None or not organization.admins.filter(id=request.user.id).exists():
+            return Response(
+                {"error": "Только администратор организации может импортировать сотрудников"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response(
+                {"error": "Прикрепите CSV-файл в поле file"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            rows = read_csv(upload)
+        except (UnicodeDecodeError, csv.Error):
+            return Response(
+                {"error": "Не удалось прочитать CSV (ожидается UTF-8)"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        job = start_import(rows, organization, request.user)
+        return Response(_import_job_data(job), status=status.HTTP_202_ACCEPTED)
+
+
+def _import_job_data(job):
+    return {
+        'id': job.id,
+        'status': job.status,
+        'rows': job.rows,
+        'report': job.report,
+        'created_at': job.created_at,
+        'finished_at': job.finished_at,
+    }
+
+
+class UserImportStatusView(APIView):
+    """GET /api/users/import/<id>/ — статус фонового импорта и отчёт по строкам"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        job = UserImportJob.objects.filter(
+            pk=pk, organization_id__in=request.user.administered_organization_ids
+        ).first()
+        if job is None:
+            return Response({"error": "Импорт не найден"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(_import_job_data(job))
+
 class ValidateInviteView(APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -232,7 +309,7 @@ class RegisterByInviteView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            user = CustomUser.objects.create_user(
+            user = create_user(
                 username=invite.email.split('@')[0],
                 email=invite.email,
                 password=password,
@@ -242,6 +319,10 @@ class RegisterByInviteView(APIView):
 
             invite.is_used = True
             invite.save()
+            audit.record(
+                request, invite.organization_id, 'invitation_accepted', 'invitation', invite.id,
+                actor=user, email=user.email
+            )
 
             return Response(
                 {
@@ -252,6 +333,8 @@ class RegisterByInviteView(APIView):
                 status=status.HTTP_201_CREATED
             )
 
+        except PasswordPoolBusy:
+            raise
         except Exception as e:
             logger.error(f"Registration error: {str(e)}")
             return Response(
@@ -259,6 +342,12 @@ class RegisterByInviteView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+class PasswordPoolMetricsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(password_pool.stats())
+
 class ChangeStatusView(generics.UpdateAPIView):
     queryset = CustomUser.objects.all()
     serializer_class = StatusSerializer
@@ -267,19 +356,61 @@ class ChangeStatusView(generics.UpdateAPIView):
     def get_object(self):
         return self.request.user
 
+    def perform_update(self, serializer):
+        user = serializer.instance
+        # Same bookkeeping as users.status: the presence sweep counts from here
+        user.status = serializer.validated_data['status']
+        user.last_status_change = user.last_heartbeat = timezone.now()
+        # Not serializer.save(): a full-row save would write back a stale unread_notifications
+        user.save(update_fields=['status', 'last_status_change', 'last_heartbeat'])
+
 class StatusUpdateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        request.user.status = request.data.get('status')
-        request.user.last_status_change = timezone.now()
-        request.user.save()
+        new_status = request.data.get('status')
+        wait = update_status(request.user, new_status)
+        if wait:
+            # Слишком часто: значение схлопнется с последующими и запишется позже
+            return Response({
+                'status': 'coalesced',
+                'new_status': new_status,
+                'apply_in': round(wait, 3)
+            }, status=status.HTTP_202_ACCEPTED)
         return Response({
             'status': 'updated',
             'new_status': request.user.status,
             'last_status_change': request.user.last_status_change.isoformat()
         })
 
+class StatusScheduleViewSet(viewsets.ModelViewSet):
+    """Запланированные статусы текущего пользователя"""
+    serializer_class = StatusScheduleSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return self.request.user.status_schedules.order_by('starts_at')
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    def perform_destroy(self, instance):
+        # Удаление идущего интервала сразу возвращает прежний статус
+        if instance.in_progress and self.request.user.status == instance.status:
+            update_status(self.request.user, instance.previous_status or 'offline')
+        instance.delete()
+
+class HeartbeatView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        heartbeat(request.user)
+        # Клиент видит, если его успели перевести в offline, и может вернуть статус сам
+        return Response({
+            'status': request.user.status,
+            'next_heartbeat_in': PRESENCE_HEARTBEAT_INTERVAL
+        })
+
 class TeamStatusView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -313,4 +444,39 @@ class UserProfileView(APIView):
             'status': request.user.status,
             'last_status_change': request.user.last_status_change.isoformat() if request.user.last_status_change else None,
             'organization': request.user.organization.name if request.user.organization else None
-        })
\ No newline at end of file
+        })
+
+
+@require_GET
+@async_jwt_required
+async def team_status_async(request):
+    """Асинхронная версия TeamStatusView на async ORM"""
+    if request.user.organization_id is None:
+        return JsonResponse({"error": "User has no organization assigned"}, status=400)
+
+    teammates = CustomUser.objects.filter(
+        organization_id=request.user.organization_id
+    ).exclude(id=request.user.id).only('id', 'username', 'status', 'last_status_change')
+
+    data = [{
+        'id': user.id,
+        'username': user.username,
+        'status': user.status,
+        'last_status_change': user.last_status_change.isoformat() if user.last_status_change else None
+    } async for user in teammates]
+
+    return JsonResponse(data, safe=False)
+
+
+@require_GET
+@async_jwt_required
+async def user_profile_async(request):
+    """Асинхронная версия UserProfileView; организация уже загружена при аутентификации"""
+    user = request.user
+    return JsonResponse({
+        'username': user.username,
+        'email': user.email,
+        'status': user.status,
+        'last_status_change': user.last_status_change.isoformat() if user.last_status_change else None,
+        'organization': user.organization.name if user.organization else None
+    })
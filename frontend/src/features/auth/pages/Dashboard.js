@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { Container, Typography, Box, Paper, List, ListItem, ListItemText, Divider } from '@mui/material';
 import StatusSelector from '../../projects/components/StatusSelector';
-import { api } from '../../../services/api';
+import { batchGet } from '../../../services/api';
 import { format, parseISO } from 'date-fns';
 import { ru } from 'date-fns/locale';
 import CircleIcon from '@mui/icons-material/Circle';
@@ -15,13 +15,11 @@ export default function Dashboard() {
   useEffect(() => {
     const loadUserData = async () => {
       try {
-        // Загружаем данные текущего пользователя
-        const userResponse = await api.get('/api/users/profile/');
-        setCurrentUser(userResponse.data);
-        setUserStatus(userResponse.data.status);
-
-        // Загружаем статусы команды
-        await loadTeamStatus();
+        // Профиль и статусы команды одним запросом
+        const [profile, team] = await batchGet(['/api/users/profile/', '/api/users/team-status/']);
+        setCurrentUser(profile);
+        setUserStatus(profile.status);
+        setTeamStatus(team);
       } catch (error) {
         console.error('Ошибка загрузки данных:', error);
       }
@@ -30,15 +28,6 @@ export default function Dashboard() {
     loadUserData();
   }, []);
 
-  const loadTeamStatus = async () => {
-    try {
-      const response = await api.get('/api/users/team-status/');
-      setTeamStatus(response.data);
-    } catch (error) {
-      console.error('Ошибка загрузки статусов команды:', error);
-    }
-  };
-
   const handleStatusChange = (newStatus) => {
     setUserStatus(newStatus);
     // Оптимистичное обновление списка команды
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { Outlet, Link, useNavigate, useLocation } from 'react-router-dom';
 import axios from 'axios';
+import { api } from '../../../services/api';
 import {
   AppBar,
   Toolbar,
@@ -138,6 +139,33 @@ export const MainLayout = () => {
     checkAuth();
   }, [isAuthenticated, navigate, location]);
 
+  // Heartbeat, пока открыто приложение: иначе sweep_presence переведёт пользователя в offline.
+  // Интервал задаёт сервер (PRESENCE_HEARTBEAT_INTERVAL) в ответе
+  useEffect(() => {
+    if (!isAuthenticated) return undefined;
+    let timer;
+    let cancelled = false;
+
+    const beat = async () => {
+      let delay = 60;
+      try {
+        const response = await api.post('/api/users/heartbeat/');
+        delay = response.data.next_heartbeat_in || delay;
+      } catch (error) {
+        console.error('Ошибка heartbeat:', error);
+      }
+      if (!cancelled) {
+        timer = setTimeout(beat, delay * 1000);
+      }
+    };
+
+    beat();
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [isAuthenticated]);
+
   const drawer = (
     <Box
       sx={{
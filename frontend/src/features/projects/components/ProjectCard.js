@@ -26,7 +26,7 @@ export const ProjectCard = ({ project }) => {
           Открыть
         </Button>
         <Typography variant="caption" sx={{ ml: 'auto' }}>
-          Участников: {project.members?.length || 0}
+          Участников: {project.members_count ?? 0} · Задач: {project.open_tasks_count ?? 0}/{project.tasks_count ?? 0}
         </Typography>
       </CardActions>
     </Card>
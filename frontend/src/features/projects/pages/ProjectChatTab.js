@@ -0,0 +1,112 @@
+import React, { useEffect, useState } from 'react';
+import { useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import {
+  Box,
+  List,
+  ListItem,
+  ListItemText,
+  TextField,
+  Button,
+  CircularProgress,
+  Typography,
+  Alert
+} from '@mui/material';
+import { api } from '../../../services/api';
+
+export const ProjectChatTab = ({ projectId }) => {
+  const [text, setText] = useState('');
+  const [error, setError] = useState(null);
+  const queryClient = useQueryClient();
+
+  const {
+    data,
+    isLoading,
+    error: fetchError,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
+    queryKey: ['channel', projectId],
+    // Pages come newest first; older pages follow next_before
+    queryFn: ({ pageParam }) => api.get(`/api/chat/channels/${projectId}/messages/`, {
+      params: pageParam ? { before: pageParam } : {},
+    }).then((res) => res.data),
+    initialPageParam: null,
+    getNextPageParam: (lastPage) => lastPage.next_before,
+    refetchInterval: 15000,
+  });
+
+  const latestId = data?.pages[0]?.results[0]?.id;
+  const lastReadId = data?.pages[0]?.last_read_message_id || 0;
+
+  // Move the read cursor once the newest message is on screen
+  useEffect(() => {
+    if (latestId && latestId > lastReadId) {
+      api.post(`/api/chat/channels/${projectId}/read/`, { message_id: latestId });
+    }
+  }, [projectId, latestId, lastReadId]);
+
+  const sendMutation = useMutation({
+    mutationFn: (text) => api.post(`/api/chat/channels/${projectId}/messages/`, { text }),
+    onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: ['channel', projectId] });
+      setText('');
+      setError(null);
+    },
+    onError: (error) => {
+      setError(error.response?.data?.error || 'Ошибка при отправке сообщения');
+    },
+  });
+
+  const handleSend = () => {
+    if (!text.trim()) return;
+    sendMutation.mutate(text);
+  };
+
+  if (isLoading) return <CircularProgress />;
+  if (fetchError) return <Alert severity="error">Ошибка: {fetchError.message}</Alert>;
+
+  const messages = data.pages.flatMap((page) => page.results).reverse();
+
+  return (
+    <Box>
+      {hasNextPage && (
+        <Button onClick={() => fetchNextPage()} disabled={isFetchingNextPage} sx={{ mb: 1 }}>
+          {isFetchingNextPage ? 'Загрузка...' : 'Показать предыдущие'}
+        </Button>
+      )}
+
+      <List>
+        {messages.length === 0 ? (
+          <Typography>Сообщений пока нет.</Typography>
+        ) : (
+          messages.map((message) => (
+            <ListItem key={message.id} divider>
+              <ListItemText
+                primary={message.text}
+                secondary={`${message.sender_username} · ${new Date(message.timestamp).toLocaleString()}`}
+                primaryTypographyProps={{ fontWeight: message.id > lastReadId ? 'bold' : 'normal' }}
+              />
+            </ListItem>
+          ))
+        )}
+      </List>
+
+      {error && <Alert severity="error" sx={{ mb: 2 }}>{error}</Alert>}
+
+      <Box sx={{ display: 'flex', gap: 1, mt: 2 }}>
+        <TextField
+          fullWidth
+          size="small"
+          placeholder="Сообщение"
+          value={text}
+          onChange={(e) => setText(e.target.value)}
+          onKeyDown={(e) => e.key === 'Enter' && handleSend()}
+        />
+        <Button variant="contained" onClick={handleSend} disabled={sendMutation.isPending}>
+          Отправить
+        </Button>
+      </Box>
+    </Box>
+  );
+};
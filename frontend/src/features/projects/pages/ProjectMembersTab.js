@@ -22,8 +22,11 @@ export const ProjectMembersTab = ({ projectId }) => {
   const queryClient = useQueryClient();
 
   const { data: organizations, isLoading: isOrgLoading, error: orgError } = useQuery({
-    queryKey: ['organizations'],
-    queryFn: () => api.get('/api/core/organizations/').then((res) => res.data),
+    queryKey: ['organizations', 'admin-check'],
+    // Only what isAdmin needs: no full admin list and user copies
+    queryFn: () => api.get('/api/core/organizations/', {
+      params: { fields: 'id,admins.id,current_user.id' },
+    }).then((res) => res.data),
     staleTime: 5 * 60 * 1000,
   });
 
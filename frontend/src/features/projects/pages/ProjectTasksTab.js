@@ -18,8 +18,11 @@ export const ProjectTasksTab = ({ projectId }) => {
   const [isTaskModalOpen, setIsTaskModalOpen] = useState(false);
 
   const { data: organizations, isLoading: isOrgLoading, error: orgError } = useQuery({
-    queryKey: ['organizations'],
-    queryFn: () => api.get('/api/core/organizations/').then((res) => res.data),
+    queryKey: ['organizations', 'admin-check'],
+    // Only what isAdmin needs: no full admin list and user copies
+    queryFn: () => api.get('/api/core/organizations/', {
+      params: { fields: 'id,admins.id,current_user.id' },
+    }).then((res) => res.data),
     staleTime: 5 * 60 * 1000,
   });
 
@@ -17,8 +17,11 @@ export const ProjectsPage = () => {
   const [filters, setFilters] = useState({ status: 'active' });
 
   const { data: organizations, isLoading: isOrgLoading, error: orgError } = useQuery({
-    queryKey: ['organizations'],
-    queryFn: () => api.get('/api/core/organizations/').then((res) => res.data),
+    queryKey: ['organizations', 'admin-check'],
+    // Only what isAdmin needs: no full admin list and user copies
+    queryFn: () => api.get('/api/core/organizations/', {
+      params: { fields: 'id,admins.id,current_user.id' },
+    }).then((res) => res.data),
   });
 
   const { data: projects, isLoading, error } = useQuery({
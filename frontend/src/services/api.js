@@ -1,7 +1,13 @@
 import axios from 'axios';
 
+// Cookie закрепления за primary после записи (см. backend core/db_routing.py):
+// без credentials браузер не сохраняет её для другого origin.
+// Ставится и глобально — часть страниц вызывает axios напрямую
+axios.defaults.withCredentials = true;
+
 export const api = axios.create({
   baseURL: 'http://localhost:8000/',
+  withCredentials: true,
 });
 
 api.interceptors.request.use((config) => {
@@ -12,6 +18,19 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// Несколько GET за один запрос: ответы в том же порядке, что и пути
+export const batchGet = async (paths) => {
+  const response = await api.post('/api/batch/', {
+    requests: paths.map((path, index) => ({ id: index, path })),
+  });
+  return response.data.responses.map(({ status, body }) => {
+    if (status >= 400) {
+      throw Object.assign(new Error(`Batch request failed: ${status}`), { response: { status, data: body } });
+    }
+    return body;
+  });
+};
+
 export const projectApi = {
   getAll: () => api.get('/projects/'),
   create: (data) => api.post('/projects/', data),